@@ -0,0 +1,53 @@
+"""
+Cache throughput with tens of thousands of entries (PID/hwnd metadata sized).
+
+Usage: python -m benchmarks.bench_cache [entries]
+"""
+
+import sys
+import time
+
+from src.lib.cache import Cache
+
+
+def timed(label, fn, ops):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed / ops * 1e6:8.3f} µs/op")
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    cache = Cache(ttl=300, maxsize=entries)
+    keys = [f"hwnd:{i:08d}" for i in range(entries)]
+
+    timed("set", lambda: [cache.set(k, i) for i, k in enumerate(keys)], entries)
+    timed("get (hit)", lambda: [cache.get(k) for k in keys], entries)
+    timed(
+        "set (evicting)",
+        lambda: [cache.set(f"pid:{i}", i) for i in range(entries)],
+        entries,
+    )
+    timed(
+        "find(startswith)",
+        lambda: [cache.find(startswith="pid:4999") for _ in range(1000)],
+        1000,
+    )
+
+    # chaves com prefixo longo em comum: find só percorre a subárvore do prefixo
+    shared = Cache(maxsize=entries)
+    for i in range(entries):
+        shared.set(f"roblox:window:hwnd:{i:08d}", i)
+    timed(
+        "find(long shared prefix)",
+        lambda: [
+            shared.find(startswith="roblox:window:hwnd:0000499") for _ in range(1000)
+        ],
+        1000,
+    )
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
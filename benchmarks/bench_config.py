@@ -0,0 +1,65 @@
+"""
+Compares per-tick config access: string parsing vs the typed settings snapshot.
+
+Usage: python -m benchmarks.bench_config [ticks]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from src.lib.config import ConfigManager
+
+
+def parse_every_tick(config):
+    # o que run/keep_alive/tile/get_target_windows faziam a cada tick
+    get = config.get
+    int(get("APPLICATION", "action_delay", fallback="250"))
+    int(get("APPLICATION", "action_key_hold_duration", fallback="0"))
+    get("APPLICATION", "action_key", fallback="space")
+    get("APPLICATION", "preserve_focus", fallback="true").lower() == "true"
+    get("APPLICATION", "tiler_enabled", fallback="false").lower() == "true"
+    int(get("APPLICATION", "tiler_gapx", fallback="10"))
+    int(get("APPLICATION", "tiler_gapy", fallback="10"))
+    [
+        int(pid.strip())
+        for pid in get("APPLICATION", "ignored_pids", fallback="").split(",")
+        if pid.strip().isdigit()
+    ]
+
+
+def read_snapshot(config):
+    settings = config.settings
+    settings.action_delay
+    settings.action_key_hold_duration
+    settings.action_key
+    settings.preserve_focus
+    settings.tiler_enabled
+    settings.tiler_gapx
+    settings.tiler_gapy
+    settings.ignored_pids
+
+
+def bench(label, fn, config, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        fn(config)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed / ticks * 1e6:8.2f} µs/tick")
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        config = object.__new__(ConfigManager)
+        config._initialize(config_file=os.path.join(tmp, "config.ini"))
+        config.set("APPLICATION", "ignored_pids", "101, 202, 303")
+        config.set("APPLICATION", "tiler_enabled", "True")
+
+        bench("parse", parse_every_tick, config, ticks)
+        bench("snapshot", read_snapshot, config, ticks)
+
+
+if __name__ == "__main__":
+    main()
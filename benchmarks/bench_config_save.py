@@ -0,0 +1,64 @@
+"""
+Times 10k set/save calls, as the settings page issues on every keystroke/toggle.
+
+The legacy column reproduces the old save(): deepcopy + full ConfigParser compare.
+
+Usage: python -m benchmarks.bench_config_save [calls]
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import time
+
+from src.lib.config import ConfigManager
+
+
+def legacy_save(state, config):
+    if state.get("cached") is not None and state["cached"] == config.config:
+        return
+    with open(config.config_file, "w") as configfile:
+        config.config.write(configfile)
+    state["cached"] = copy.deepcopy(config.config)
+
+
+def bench(label, calls, set_value, save):
+    start = time.perf_counter()
+    for i in range(calls):
+        set_value(i)
+        save()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<28} {elapsed * 1e3:9.1f} ms total, {elapsed / calls * 1e6:7.1f} µs/call"
+    )
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as tmp:
+        config = object.__new__(ConfigManager)
+        config._initialize(config_file=os.path.join(tmp, "config.ini"))
+        for i in range(20):
+            config.set("APPLICATION", f"key_{i}", str(i))
+        config.save()
+
+        def unchanged(i):
+            config.set("APPLICATION", "action_key", "space")
+
+        state = {}
+        bench("legacy, unchanged", calls, unchanged, lambda: legacy_save(state, config))
+        bench("dirty tracking, unchanged", calls, unchanged, config.save)
+
+        def changed(i):
+            config.set("APPLICATION", "action_delay", str(i))
+
+        state = {}
+        bench(
+            "legacy, changed", calls // 10, changed, lambda: legacy_save(state, config)
+        )
+        bench("dirty tracking, changed", calls // 10, changed, config.save)
+
+
+if __name__ == "__main__":
+    main()
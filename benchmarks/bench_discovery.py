@@ -0,0 +1,68 @@
+"""
+Compares per-tick target discovery against the old per-window lookup.
+
+Process lookups are simulated at ~20 µs each (roughly a psutil.Process(pid).name()
+call on Windows).
+
+Usage: python -m benchmarks.bench_discovery [windows] [ticks]
+"""
+
+import sys
+import time
+
+from src.lib.discovery import SyntheticWindowProvider, WindowDiscovery, WindowInfo
+
+
+def build_provider(count):
+    windows = []
+    names = {}
+    for i in range(count):
+        pid = 1000 + i
+        if i % 4 == 0:
+            windows.append(WindowInfo(i, "Roblox", pid))
+            names[pid] = "RobloxPlayerBeta.exe"
+        else:
+            windows.append(WindowInfo(i, f"Window {i}", pid))
+            names[pid] = "other.exe"
+    return SyntheticWindowProvider(windows, names, lookup_cost=20e-6)
+
+
+def naive_find(provider, ignored_pids):
+    # o que get_target_windows fazia: filtra título e consulta o processo sempre
+    result = []
+    for info in provider.enum_windows():
+        if "Roblox" not in info.title or info.pid in ignored_pids:
+            continue
+        if "roblox" in provider.process_name(info.pid).lower():
+            result.append(info)
+    return result
+
+
+def bench(label, fn, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed / ticks * 1e3:8.3f} ms/tick")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    ignored = frozenset()
+
+    naive_provider = build_provider(count)
+    bench("naive", lambda: naive_find(naive_provider, ignored), ticks)
+
+    provider = build_provider(count)
+    discovery = WindowDiscovery(provider)
+    bench("discovery", lambda: discovery.find(ignored), ticks)
+
+    print(
+        f"process lookups: naive={naive_provider.process_name_calls} "
+        f"discovery={provider.process_name_calls}"
+    )
+
+
+if __name__ == "__main__":
+    main()
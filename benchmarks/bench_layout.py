@@ -0,0 +1,30 @@
+"""
+Times the pure grid computation used by the tiler.
+
+Usage: python -m benchmarks.bench_layout [windows] [iterations]
+"""
+
+import sys
+import time
+
+from src.lib.layout import Rect, compute_grid
+
+MONITORS = [Rect(0, 0, 1920, 1040), Rect(1920, 0, 2560, 1400)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        compute_grid(count, MONITORS, cell=(800, 600), gap=(10, 10))
+    elapsed = time.perf_counter() - start
+
+    print(f"{count} windows: {elapsed / iterations * 1e6:8.1f} µs/layout")
+    # antes: restore + activate + resizeTo + moveTo por janela; agora um lote
+    print(f"window calls per tick: before={count * 3} after=1 batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cost of fetching a method's child logger and logging a disabled DEBUG line, as
+keep_alive_windows / _update_window_info / the autosave callbacks do per call.
+
+Usage: python -m benchmarks.bench_loggers [calls]
+"""
+
+import logging
+import sys
+import time
+
+
+class Legacy:
+    def __init__(self, logger):
+        self.logger = logger
+
+    def get_logger(self, name):
+        return logging.getLogger(self.logger.name + "." + name)
+
+
+class Cached:
+    def __init__(self, logger):
+        self.logger = logger
+        self._loggers = {}
+
+    def get_logger(self, name):
+        logger = self._loggers.get(name)
+        if logger is None:
+            logger = self._loggers[name] = self.logger.getChild(name)
+        return logger
+
+
+def bench(label, calls, fn):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<38} {elapsed * 1e3:9.1f} ms total, {elapsed / calls * 1e9:7.0f} ns/call"
+    )
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    root = logging.getLogger("bench.app")
+    root.setLevel(logging.INFO)  # DEBUG desligado, como em produção
+    legacy, cached = Legacy(root), Cached(root)
+    window = ("Win32Window(hWnd=1234)", 5678)
+
+    bench("lookup, getLogger(name + name)", calls, lambda i: legacy.get_logger("run"))
+    bench("lookup, per-instance cache", calls, lambda i: cached.get_logger("run"))
+
+    def legacy_call(i):
+        legacy.get_logger("keep_alive").debug(f"Janela {window}: {i}")
+
+    def cached_call(i):
+        cached.get_logger("keep_alive").debug("Janela %s: %s", window, i)
+
+    def guarded_call(i):
+        logger = cached.get_logger("keep_alive")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Janela %s: %s", window, i)
+
+    bench("lookup + disabled debug, f-string", calls, legacy_call)
+    bench("cached + disabled debug, %-style", calls, cached_call)
+    bench("cached + isEnabledFor guard", calls, guarded_call)
+
+
+if __name__ == "__main__":
+    main()
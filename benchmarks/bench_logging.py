@@ -0,0 +1,94 @@
+"""
+Per-call logging cost on the calling thread for one keep-alive cycle's worth of
+per-window DEBUG lines, at high window counts.
+
+Compares eager f-strings against lazy %-style arguments with DEBUG disabled, and
+a synchronous file handler against the QueueHandler/QueueListener pipeline with
+DEBUG enabled.
+
+Usage: python -m benchmarks.bench_logging [windows] [cycles]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from src.app.utils.logging import (
+    file_formatter,
+    setup_queue_logging,
+    stop_queue_logging,
+)
+from src.lib.keepalive import WindowTiming
+
+
+def bench(label, calls, log_window):
+    timing = WindowTiming(1234, 0.001, 0.0, 0.0, 0.002, 0.1, 0.25, True)
+    start = time.perf_counter()
+    for i in range(calls):
+        log_window(i, timing)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<34} {elapsed * 1e3:9.1f} ms total, {elapsed / calls * 1e6:7.2f} µs/call"
+    )
+
+
+def make_logger(name, level):
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def main():
+    windows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    calls = windows * cycles
+    print(f"{windows} windows x {cycles} cycles = {calls} calls\n")
+
+    # DEBUG desligado: só o custo de montar (ou não) a mensagem
+    logger = make_logger("bench.disabled", logging.INFO)
+    bench(
+        "disabled, f-string",
+        calls,
+        lambda pid, t: logger.debug(f"Janela PID {pid}: {t}"),
+    )
+    bench(
+        "disabled, %-style",
+        calls,
+        lambda pid, t: logger.debug("Janela PID %s: %s", pid, t),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # DEBUG ligado, escrita síncrona no arquivo
+        handler = logging.FileHandler(os.path.join(tmp, "sync.log"))
+        handler.setFormatter(file_formatter)
+        logger = make_logger("bench.sync", logging.DEBUG)
+        logger.addHandler(handler)
+        bench(
+            "enabled, sync file handler",
+            calls,
+            lambda pid, t: logger.debug("Janela PID %s: %s", pid, t),
+        )
+        handler.close()
+
+        # DEBUG ligado, fila: a thread chamadora só enfileira
+        handler = logging.FileHandler(os.path.join(tmp, "queue.log"))
+        handler.setFormatter(file_formatter)
+        logger = make_logger("bench.queue", logging.DEBUG)
+        setup_queue_logging(logger, handler)
+        bench(
+            "enabled, queue pipeline",
+            calls,
+            lambda pid, t: logger.debug("Janela PID %s: %s", pid, t),
+        )
+        start = time.perf_counter()
+        stop_queue_logging()
+        drain = time.perf_counter() - start
+        print(f"{'(listener drain after the run)':<34} {drain * 1e3:9.1f} ms")
+        handler.close()
+
+
+if __name__ == "__main__":
+    main()
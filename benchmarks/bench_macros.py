@@ -0,0 +1,93 @@
+"""
+Per-window dispatch cost of the action: press() as it was (key table rebuilt and
+autoit strings formatted on every call, one send per key event) against a
+precompiled macro replayed as one batch per SendInput call. Input calls are
+no-ops, so this measures the Python overhead and the number of OS calls; holds
+are 0 so no time is spent sleeping.
+
+Usage: python -m benchmarks.bench_macros [windows]
+"""
+
+import sys
+import time
+
+from src.lib.macros import MacroPlayer, RecordingInputBackend, _parse, compile_macro
+
+
+class CountingSend:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+
+
+def legacy_press(send, key, hold=0):
+    special_keys = {
+        "space": "SPACE",
+        "enter": "ENTER",
+        "ctrl": "CTRL",
+        "shift": "SHIFT",
+        "alt": "ALT",
+        "tab": "TAB",
+        "esc": "ESCAPE",
+        "delete": "DELETE",
+        "backspace": "BACKSPACE",
+        "up": "UP",
+        "down": "DOWN",
+        "left": "LEFT",
+        "right": "RIGHT",
+    }
+    autoit_key = special_keys.get(key.lower(), key.upper())
+    if hold > 0:
+        send(f"{{{autoit_key} down}}")
+        time.sleep(hold / 1000)
+        send(f"{{{autoit_key} up}}")
+    else:
+        send(f"{{{autoit_key}}}")
+
+
+def bench(label, windows, fn, calls):
+    start = time.perf_counter()
+    for _ in range(windows):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<34} {elapsed / windows * 1e6:7.2f} us/window, "
+        f"{calls() / windows:4.1f} input calls/window"
+    )
+
+
+def main(windows=100_000):
+    keys = ["space", "w", "left"]  # ação de exemplo: pular, andar, girar a câmera
+
+    send = CountingSend()
+    bench(
+        "press() x3 (legacy)",
+        windows,
+        lambda: [legacy_press(send, key) for key in keys],
+        lambda: send.calls,
+    )
+
+    backend = RecordingInputBackend(clock=lambda: 0)
+    player = MacroPlayer(backend)
+    macro = compile_macro(" ".join(keys))
+
+    sent = [0]
+
+    def replay():
+        player.play(macro)
+        sent[0] += len(backend.batches)
+        backend.batches.clear()  # não deixa a lista crescer
+
+    bench("compiled macro (1 batch)", windows, replay, lambda: sent[0])
+
+    start = time.perf_counter()
+    for _ in range(windows):
+        _parse(" ".join(keys))
+    elapsed = time.perf_counter() - start
+    print(f"{'parse (done once per config)':<34} {elapsed / windows * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
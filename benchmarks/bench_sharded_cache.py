@@ -0,0 +1,54 @@
+"""
+Multithreaded throughput of ShardedCache against a single lock around Cache.
+
+Usage: python -m benchmarks.bench_sharded_cache [threads] [ops_per_thread]
+"""
+
+import sys
+import threading
+import time
+
+from src.lib.cache import Cache, ShardedCache
+
+
+class LockedCache:
+    def __init__(self):
+        self.cache = Cache(maxsize=50000)
+        self.lock = threading.Lock()
+
+    def get(self, key, fallback=None):
+        with self.lock:
+            return self.cache.get(key, fallback)
+
+    def set(self, key, data, ttl=None):
+        with self.lock:
+            self.cache.set(key, data, ttl)
+
+
+def run(cache, threads, ops):
+    def worker(n):
+        for i in range(ops):
+            key = f"pid:{(n * 7919 + i) % 20000}"
+            if cache.get(key) is None:
+                cache.set(key, i)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    print(f"single lock   {run(LockedCache(), threads, ops):12,.0f} ops/s")
+    print(
+        f"sharded (16)  {run(ShardedCache(maxsize=50000), threads, ops):12,.0f} ops/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Mantém a raiz do repositório no sys.path para que `pytest` encontre o pacote `src`.
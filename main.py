@@ -1,18 +1,79 @@
+import argparse
+import cProfile
 import logging
+import pstats
+
+from src.app.utils.profiling import PhaseTimer
+
+# o relógio começa antes dos imports pesados da aplicação
+startup_timer = PhaseTimer()
+
+with startup_timer.phase("imports"):
+    from src.app.Application import Application
+    from src.app.utils.logging import (
+        console_handler,
+        create_file_handler,
+        setup_queue_logging,
+    )
+    from src.lib.config import Config
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Roblox Window Manager")
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="startup.prof",
+        metavar="FILE",
+        help="profile startup with cProfile until the first paint and dump the "
+        "stats to FILE (default: startup.prof)",
+    )
+    return parser.parse_args()
+
+
+def dump_profile(profiler, path, logger):
+    profiler.disable()
+    profiler.dump_stats(path)
+    logger.info(f"Startup profile saved to {path}")
+    stats = pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(20)
 
-from src.app.Application import Application
-from src.app.utils.logging import console_handler
 
 if __name__ == "__main__":
+    args = parse_args()
     logger = logging.getLogger("app")
     logger.setLevel(logging.TEST)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
+    # primeira leitura do config.ini; conta na mesma fase que o Application usa
+    with startup_timer.phase("config_load"):
+        settings = Config.settings
+    if settings.log_file_enabled:
+        handlers.append(
+            create_file_handler(
+                structured=settings.log_format == "json",
+                compress=settings.log_compress,
+            )
+        )
+    # formatação e escrita (console/arquivo) ficam numa thread própria
+    setup_queue_logging(logger, *handlers)
+
+    profiler = None
+    if args.profile_startup:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
     app = Application(
         title="Roblox Window Manager",
         width=400,
-        height=450,
+        height=500,
         resizeable=False,
         exceptionHandler=lambda *args: None,
         logger=logger,
+        startup_timer=startup_timer,
     )
+
+    if profiler is not None:
+        # agendado depois do _after_first_paint, que já está na fila
+        app.root.after_idle(dump_profile, profiler, args.profile_startup, logger)
+
     app.root.mainloop()
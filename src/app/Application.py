@@ -1,19 +1,55 @@
 import logging
+import math
 import time
 import tkinter as tk
 from collections import defaultdict
 from tkinter import ttk
 
-import autoit
-import keyboard
-import psutil
-import pyautogui
-import pygetwindow as gw
-import win32gui
-import win32process
-
+from src.app.utils.lazy import lazy_import, preload
+from src.app.utils.logging import log_cycle
+from src.app.utils.profiling import PhaseTimer
 from src.app.utils.styling import root_disable_notebook_page_focus
+from src.app.utils.timers import PageTimer
 from src.lib.config import Config as config
+from src.lib.deadlines import DeadlineScheduler
+from src.lib.discovery import Win32WindowProvider, WindowDiscovery
+from src.lib.keepalive import (
+    FOCUS,
+    MESSAGE,
+    AdaptiveSettle,
+    KeepAliveScheduler,
+    Win32KeepAliveBackend,
+)
+from src.lib.layout import Win32LayoutBackend, WindowTiler
+from src.lib.macros import MacroError, MacroPlayer, Win32InputBackend, compile_macro
+from src.lib.messages import MessageInputSender, Win32MessageSink
+from src.lib.metrics import Metrics, NullMetrics
+from src.lib.registry import WindowRegistry, create_window_source
+from src.lib.worker import TaskWorker
+
+# módulos de automação pesados só carregam no primeiro uso (ou no preload em
+# segundo plano), para a janela aparecer antes
+autoit = lazy_import("autoit")
+keyboard = lazy_import("keyboard")
+gw = lazy_import("pygetwindow")
+
+
+# nomes de tecla (como no config) -> nome no autoit; o resto vai em maiúsculas
+AUTOIT_KEYS = {
+    "space": "SPACE",
+    "enter": "ENTER",
+    "ctrl": "CTRL",
+    "shift": "SHIFT",
+    "alt": "ALT",
+    "tab": "TAB",
+    "esc": "ESCAPE",
+    "delete": "DELETE",
+    "backspace": "BACKSPACE",
+    "up": "UP",
+    "down": "DOWN",
+    "left": "LEFT",
+    "right": "RIGHT",
+}
 
 
 def press(key: str, hold: int = 0):
@@ -23,23 +59,7 @@ def press(key: str, hold: int = 0):
     :param key: Nome da tecla (ex: 'space', 'enter', 'a', etc).
     :param hold: Tempo em milissegundos para manter a tecla pressionada.
     """
-    special_keys = {
-        "space": "SPACE",
-        "enter": "ENTER",
-        "ctrl": "CTRL",
-        "shift": "SHIFT",
-        "alt": "ALT",
-        "tab": "TAB",
-        "esc": "ESCAPE",
-        "delete": "DELETE",
-        "backspace": "BACKSPACE",
-        "up": "UP",
-        "down": "DOWN",
-        "left": "LEFT",
-        "right": "RIGHT",
-    }
-
-    autoit_key = special_keys.get(key.lower(), key.upper())
+    autoit_key = AUTOIT_KEYS.get(key.lower(), key.upper())
 
     if hold > 0:
         autoit.send(f"{{{autoit_key} down}}")
@@ -49,6 +69,35 @@ def press(key: str, hold: int = 0):
         autoit.send(f"{{{autoit_key}}}")
 
 
+AUTORUN_DEFAULT_DELAY_MINUTES = 15
+AUTORUN_JITTER = 0.05  # fração do intervalo
+AUTORUN_RETRY_SECONDS = 5  # sem janelas ainda, ou worker ocupado
+RUN_ONCE_RETRY_MS = 100  # worker terminando o ciclo cancelado anterior
+
+
+def create_metrics(enabled):
+    """Metrics registry, or the no-op one when metrics are disabled."""
+    return Metrics() if enabled else NullMetrics()
+
+
+def format_metrics(metrics):
+    """Compact multi-line summary for the Development page."""
+    if not metrics.enabled:
+        return "Metrics disabled."
+
+    lines = []
+    for name, value in metrics.snapshot().items():
+        if not isinstance(value, dict):
+            lines.append(f"{name}: {value}")
+        elif value["count"]:
+            p50, p95, p99 = (value[p] * 1000 for p in ("p50", "p95", "p99"))
+            lines.append(
+                f"{name.removesuffix('_seconds')}: {p50:.0f}/{p95:.0f}/{p99:.0f} ms"
+                f" (n={value['count']})"
+            )
+    return "\n".join(lines) or "No cycles yet."
+
+
 class Application:
     def __init__(
         self,
@@ -58,6 +107,7 @@ class Application:
         resizeable: bool = False,
         exceptionHandler: callable = lambda *args: None,
         logger: callable = logging.getLogger(__name__),
+        startup_timer: PhaseTimer = None,
     ):
         # --- APP VARIABLES
         self.APPLICATION_NAME = title
@@ -65,32 +115,202 @@ class Application:
         self.APPLICATION_HEIGHT = height
         self.APPLICATION_RESIZEABLE = resizeable
         self.APPLICATION_EXCEPTION_HANDLER = exceptionHandler
+        self._init_core(logger, startup_timer)
+        timer = self.startup_timer
+
+        # --- TK STUFF
+        with timer.phase("tk_init"):
+            self.root = tk.Tk()
+            self.root.title(self.APPLICATION_NAME)
+            self.root.geometry(f"{self.APPLICATION_WIDTH}x{self.APPLICATION_HEIGHT}")
+            self.root.resizable(
+                self.APPLICATION_RESIZEABLE, self.APPLICATION_RESIZEABLE
+            )
+            self.root.report_callback_exception = self.APPLICATION_EXCEPTION_HANDLER
+            self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        with timer.phase("styling"):
+            root_disable_notebook_page_focus(self.root)
+
+        self.var_app_keybind = tk.StringVar(value=self._app_keybind)
+        with timer.phase("variables"):
+            self._create_variables()
+
+        # --- WIDGETS
+        with timer.phase("notebook"):
+            self._create_notebook()
+        self._create_notebook_pages()
+
+        # --- WORKER
+        with timer.phase("worker_start"):
+            # escrita do config.ini fora da thread do Tk, agrupando rajadas de edição
+            config.start_write_behind(coalesce_window=0.5)
+            self.worker.start()
+            self._poll_worker()
+
+        # --- CONFIG HOT RELOAD
+        config.subscribe(self._on_config_changed)
+
+        # o resto só depois da janela aparecer
+        self.root.after_idle(self._after_first_paint)
+
+    def _init_core(
+        self,
+        logger,
+        startup_timer=None,
+        provider=None,
+        keepalive_backend=None,
+        message_sink=None,
+        settle=None,
+        input_backend=None,
+        layout_backend=None,
+    ):
+        """State and services that don't need Tk; backends default to Win32."""
         self.APPLICATION_LOGGER = logger
+        self._loggers = {}  # nome: logger filho (ver __getLogger)
         self.APPLICATION_CONFIG_SECTION = "APPLICATION"
+        self.startup_timer = startup_timer or PhaseTimer()
         self._running = False
         self._autorun_job = None
+        self._deadlines = None  # DeadlineScheduler do autorun, por hwnd
         self._hotkey_handle = None
+        provider = provider or Win32WindowProvider()
+        self.discovery = WindowDiscovery(
+            provider,
+            title="Roblox",
+            process="roblox",
+            logger=self.__getLogger("discovery"),
+        )
+        self.registry = WindowRegistry(
+            provider,
+            title="Roblox",
+            process="roblox",
+            logger=self.__getLogger("registry"),
+        )
+        self.window_source = create_window_source(
+            self.registry, provider, logger=self.__getLogger("window_source")
+        )
+        self.macro_player = MacroPlayer(input_backend or Win32InputBackend())
+        self._invalid_macro = None  # última macro inválida já avisada no log
+        self.keepalive = KeepAliveScheduler(
+            keepalive_backend or Win32KeepAliveBackend(send=self._send_action),
+            message_sender=MessageInputSender(message_sink or Win32MessageSink()),
+            settle=settle or AdaptiveSettle(),
+            logger=self.__getLogger("keep_alive"),
+        )
+        self.tiler = WindowTiler(
+            layout_backend or Win32LayoutBackend(),
+            logger=self.__getLogger("tile_windows"),
+        )
+        self.worker = TaskWorker(name="main-task", logger=self.__getLogger("worker"))
+        self._run_once = False
+        self._run_once_pending = False  # execução única esperando o worker
+        self.metrics_server = None
+        self._page_timers = {}  # página: [PageTimer], só rodam com a página visível
+        self.btn_capture_key = None  # widgets da Settings só existem depois de abrir
+        self._tiler_entries = []
+        self._autorun_entries = []
+
+        # primeiro acesso ao config lê o arquivo
+        with self.startup_timer.phase("config_load"):
+            self._app_keybind = config.get("APPLICATION", "app_keybind", fallback="f1")
+            self.metrics = create_metrics(config.settings.metrics_enabled)
+
+    @classmethod
+    def headless(cls, logger=None, **backends):
+        """
+        Application without Tk: no window, worker not started, hotkeys and
+        window source off. Only run() and the cycle methods are usable; for tests
+        and tools. `backends` are the _init_core() backend overrides.
+        """
+        app = cls.__new__(cls)
+        app._init_core(logger or logging.getLogger(__name__), **backends)
+        return app
+
+    def _after_first_paint(self):
+        logger = self.__getLogger("after_first_paint")
+        logger.debug("Window painted, loading automation modules...")
+        timer = self.startup_timer
+        first_paint = timer.elapsed
+
+        preload(
+            autoit,
+            gw,
+            "psutil",
+            "win32api",
+            "win32con",
+            "win32gui",
+            "win32process",
+            logger=logger,
+        )
+        with timer.phase("hotkey_registration"):
+            self._register_app_hotkey(self.var_app_keybind.get())
+        with timer.phase("window_source"):
+            self._start_window_source()
+        with timer.phase("metrics_server"):
+            self._start_metrics_server()
+        self._watch_config()
+
+        logger.debug(f"First paint after {first_paint * 1000:.1f}ms")
+        timer.log(self.__getLogger("startup"))
+
+    def _create_variables(self):
+        # criadas aqui e não na página Settings: run/start/hot reload usam
+        # estes valores mesmo que a aba nunca seja aberta
+        self.var_action_key = tk.StringVar(
+            value=config.get("APPLICATION", "action_key", fallback="space")
+        )
+        self.var_action_delay = tk.StringVar(
+            value=config.get("APPLICATION", "action_delay", fallback="0")
+        )
+        self.var_action_hold_duration = tk.StringVar(
+            value=config.get("APPLICATION", "action_key_hold_duration", fallback="250")
+        )
+        self.var_ignored_pids = tk.StringVar(
+            value=config.get("APPLICATION", "ignored_pids", fallback="")
+        )
+        self.var_focus_only_pids = tk.StringVar(
+            value=config.get("APPLICATION", "focus_only_pids", fallback="")
+        )
+        self.var_preserve_focus = tk.BooleanVar(
+            value=config.get("APPLICATION", "preserve_focus", fallback="False")
+            == "True"
+        )
+        self.var_input_mode = tk.StringVar(
+            value=config.get("APPLICATION", "input_mode", fallback=FOCUS)
+        )
 
-        # --- TK STUFF
-        self.root = tk.Tk()
-        root_disable_notebook_page_focus(self.root)
-        self.root.title(self.APPLICATION_NAME)
-        self.root.geometry(f"{self.APPLICATION_WIDTH}x{self.APPLICATION_HEIGHT}")
-        self.root.resizable(self.APPLICATION_RESIZEABLE, self.APPLICATION_RESIZEABLE)
-        self.root.report_callback_exception = self.APPLICATION_EXCEPTION_HANDLER
-
-        self.var_app_keybind = tk.StringVar(
-            value=config.get("APPLICATION", "app_keybind", fallback="f1")
+        self.var_tiler_enabled = tk.BooleanVar(
+            value=config.get("APPLICATION", "tiler_enabled", fallback="False") == "True"
+        )
+        self.var_tiler_gapx = tk.StringVar(
+            value=config.get("APPLICATION", "tiler_gapx", fallback="10")
+        )
+        self.var_tiler_gapy = tk.StringVar(
+            value=config.get("APPLICATION", "tiler_gapy", fallback="10")
+        )
+        self.var_tiler_cell_width = tk.StringVar(
+            value=config.get("APPLICATION", "tiler_cell_width", fallback="800")
+        )
+        self.var_tiler_cell_height = tk.StringVar(
+            value=config.get("APPLICATION", "tiler_cell_height", fallback="600")
         )
 
-        # --- WIDGETS
-        self._create_notebook()
-        self._create_notebook_pages()
+        self.var_autorun_enabled = tk.BooleanVar(
+            value=config.get("APPLICATION", "autorun_enabled", fallback="False")
+            == "True"
+        )
+        self.var_autorun_delay = tk.StringVar(
+            value=config.get("APPLICATION", "autorun_delay_minutes", fallback="5")
+        )
 
-        self._register_app_hotkey(self.var_app_keybind.get())
+        self.var_metrics_enabled = tk.BooleanVar(value=self.metrics.enabled)
 
     def __getLogger(self, name):
-        return logging.getLogger(self.APPLICATION_LOGGER.name + "." + name)
+        # um logger filho por nome, criado na primeira chamada
+        logger = self._loggers.get(name)
+        if logger is None:
+            logger = self._loggers[name] = self.APPLICATION_LOGGER.getChild(name)
+        return logger
 
     def _create_notebook(self):
         logger = self.__getLogger("create_notebook")
@@ -111,22 +331,71 @@ class Application:
         logger = self.__getLogger("create_notebook_pages")
         logger.debug("Creating notebook pages...")
 
-        pages = {
+        self._page_builders = {
             "Main": self.page_main,
             "Settings": self.page_settings,
             "Development": self.page_development,
         }
 
         self.page_frames = defaultdict()
+        self._page_names = {}  # caminho do frame no Tk: nome da página
+        self._built_pages = set()
 
-        for name, callback in pages.items():
+        # abas vazias; o conteúdo é montado na primeira vez que a aba é aberta
+        for name in self._page_builders:
             frame = ttk.Frame(self.notebook)
-            callback(frame)
             self.notebook.add(frame, text=f"   {name}   ")
             self.page_frames[name] = frame
+            self._page_names[str(frame)] = name
+
+        with self.startup_timer.phase("page_main"):
+            self._build_page("Main")
+
+        # minimizar pausa os timers de página, restaurar retoma
+        self.root.bind("<Map>", self._on_root_visibility, add="+")
+        self.root.bind("<Unmap>", self._on_root_visibility, add="+")
 
         logger.debug("Notebook pages created.")
 
+    def _build_page(self, name):
+        if name in self._built_pages:
+            return
+        logger = self.__getLogger("create_notebook_pages")
+        start = time.perf_counter()
+        self._built_pages.add(name)
+        self._page_builders[name](self.page_frames[name])
+        logger.debug(
+            f"Page '{name}' built in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    def _current_page(self):
+        return self._page_names.get(self.notebook.select())
+
+    # --- page-scoped timers
+
+    def _add_page_timer(self, page, interval_ms, callback):
+        timer = PageTimer(self.root, interval_ms, callback)
+        self._page_timers.setdefault(page, []).append(timer)
+        self._update_page_timers()
+        return timer
+
+    def _update_page_timers(self):
+        # só a página visível, e com a janela não minimizada, atualiza
+        visible = None
+        if self.root.state() not in ("iconic", "withdrawn"):
+            visible = self._current_page()
+        for page, timers in self._page_timers.items():
+            for timer in timers:
+                if page == visible:
+                    timer.start()
+                else:
+                    timer.stop()
+
+    def _on_root_visibility(self, event):
+        # o bind do root também recebe eventos dos widgets filhos
+        if event.widget is self.root:
+            self._update_page_timers()
+
     # --- keybind stuff
 
     def _on_app_keybind_change(self, *args):
@@ -142,6 +411,65 @@ class Application:
         except Exception as e:
             self._show_message(f"Erro ao registrar hotkey '{key}': {e}")
 
+    # --- config hot reload
+
+    def _watch_config(self, interval_ms=2000):
+        # só um stat() enquanto o arquivo não muda
+        try:
+            config.reload_if_changed()
+        except Exception as e:
+            self.__getLogger("watch_config").warning(f"Erro ao recarregar config: {e}")
+        self._config_watch_job = self.root.after(interval_ms, self._watch_config)
+
+    def _on_config_changed(self, changes):
+        logger = self.__getLogger("config_changed")
+        config_vars = {
+            "action_key": self.var_action_key,
+            "action_delay": self.var_action_delay,
+            "action_key_hold_duration": self.var_action_hold_duration,
+            "ignored_pids": self.var_ignored_pids,
+            "preserve_focus": self.var_preserve_focus,
+            "input_mode": self.var_input_mode,
+            "focus_only_pids": self.var_focus_only_pids,
+            "tiler_enabled": self.var_tiler_enabled,
+            "tiler_gapx": self.var_tiler_gapx,
+            "tiler_gapy": self.var_tiler_gapy,
+            "tiler_cell_width": self.var_tiler_cell_width,
+            "tiler_cell_height": self.var_tiler_cell_height,
+            "autorun_enabled": self.var_autorun_enabled,
+            "autorun_delay_minutes": self.var_autorun_delay,
+            "metrics_enabled": self.var_metrics_enabled,
+        }
+
+        for section, key, old, new in changes:
+            if section != self.APPLICATION_CONFIG_SECTION:
+                continue
+            logger.info(f"'{key}' alterado externamente: {old!r} -> {new!r}")
+
+            if key == "app_keybind":
+                if new and new != self.var_app_keybind.get():
+                    self.var_app_keybind.set(new)
+                    self._register_app_hotkey(new)
+                    state = "Stop" if self._running else "Start"
+                    self.start_button.config(
+                        text=f"{state} Application - [{new.upper()}]"
+                    )
+                    if self.btn_capture_key is not None:
+                        self.btn_capture_key.config(text=f"Current key: {new.upper()}")
+                continue
+
+            var = config_vars.get(key)
+            if isinstance(var, tk.BooleanVar):
+                var.set((new or "").strip().lower() == "true")
+            elif var is not None:
+                var.set(new or "")
+
+        self._set_metrics_enabled(self.var_metrics_enabled.get())
+
+        # campos habilitados/desabilitados acompanham os checkboxes
+        self._toggle_fields(None, self.var_tiler_enabled, self._tiler_entries)
+        self._toggle_fields(None, self.var_autorun_enabled, self._autorun_entries)
+
     def _on_tab_changed(self, event):
         if self._running:
             # se estiver rodando, volta para aba anterior (cancela troca)
@@ -150,6 +478,11 @@ class Application:
             # atualiza aba atual para nova aba selecionada
             self._notebook_current_tab = self.notebook.index(self.notebook.select())
 
+        page = self._current_page()
+        if page is not None:
+            self._build_page(page)
+        self._update_page_timers()
+
     # --- PAGES
 
     def page_main(self, frame):
@@ -211,50 +544,166 @@ class Application:
         autorun_enabled = self.var_autorun_enabled.get()  # pega do settings
 
         if autorun_enabled:
+            self._run_once = False
+            # cada janela tem o próprio prazo, espalhados ao longo do intervalo
+            self._deadlines = DeadlineScheduler(
+                self._autorun_interval(), jitter=AUTORUN_JITTER
+            )
             self._autorun_loop()
         else:
-            # roda uma vez só
-            self._run_main_task()
-            self._stop_application()  # para logo em seguida
+            # roda uma vez só; _on_task_result para a aplicação ao terminar
+            self._run_once = True
+            self._submit_run_once()
+
+    def _submit_run_once(self):
+        self._autorun_job = None
+        if not self._running:
+            return
+        # worker ainda ocupado com o ciclo anterior (parado no meio): tenta de
+        # novo; o resultado velho que chegar antes não para a aplicação
+        self._run_once_pending = not self._run_main_task()
+        if self._run_once_pending:
+            self._autorun_job = self.root.after(
+                RUN_ONCE_RETRY_MS, self._submit_run_once
+            )
+
+    def _autorun_interval(self):
+        try:
+            delay_minutes = int(self.var_autorun_delay.get())
+        except ValueError:
+            delay_minutes = AUTORUN_DEFAULT_DELAY_MINUTES
+        return max(delay_minutes, 1) * 60
 
     def _autorun_loop(self):
-        DEFAULT_DELAY_MINUTES = 15
+        self._autorun_job = None
         if not self._running:
             self._autorun_next_tick_time = None  # limpa próximo tick
-            self._update_next_tick_label()  # limpa label
+            self.next_tick_label.config(text="")  # limpa label
             return
 
-        self._run_main_task()
+        # mudança no Settings vale a partir do próximo reagendamento de cada janela
+        self._deadlines.interval = self._autorun_interval()
 
-        delay_minutes = int(self.var_autorun_delay.get() or DEFAULT_DELAY_MINUTES)
-        delay_seconds = delay_minutes * 60
+        # só as janelas vencidas são atendidas; o próximo tick é agendado
+        # em _on_task_result, pelo prazo mais próximo
+        if not self._run_main_task(deadlines=self._deadlines):
+            self._schedule_autorun(AUTORUN_RETRY_SECONDS)
 
+    def _schedule_autorun(self, delay_seconds):
         # Calcula timestamp do próximo tick
-        self._autorun_next_tick_time = time.time() + delay_seconds
+        # monotônico: ajuste do relógio do sistema não mexe na contagem
+        self._autorun_next_tick_time = time.monotonic() + delay_seconds
 
-        # Agenda próximo tick
-        delay_ms = delay_seconds * 1000
-        self._autorun_job = self.root.after(int(delay_ms), self._autorun_loop)
+        # Agenda próximo tick; arredonda para cima para não acordar antes do prazo
+        # (pop_due não acharia ninguém e o ciclo rodaria à toa)
+        delay_ms = math.ceil(delay_seconds * 1000)
+        self._autorun_job = self.root.after(delay_ms, self._autorun_loop)
 
         # Começa atualizar a label do próximo tick
         self._start_next_tick_updater()
 
-    def _run_main_task(self):
+    def _schedule_next_deadline(self):
+        deadline = self._deadlines.next_deadline()
+        if deadline is None:
+            # nenhuma janela conhecida ainda
+            self._schedule_autorun(AUTORUN_RETRY_SECONDS)
+        else:
+            self._schedule_autorun(max(0.0, deadline - self._deadlines.clock()))
+
+    def _start_window_source(self):
+        logger = self.__getLogger("window_source")
+        try:
+            self.window_source.start()
+        except Exception as e:
+            # sem registry, get_target_windows volta a enumerar a cada ciclo
+            logger.warning(f"Não foi possível iniciar o rastreio de janelas: {e}")
+
+    def _start_metrics_server(self):
+        settings = config.settings
+        if not settings.metrics_server_enabled:
+            return
+        logger = self.__getLogger("metrics_server")
+        # http.server e cia só carregam com o endpoint ligado (desligado por padrão)
+        from src.lib.exporter import MetricsServer
+
+        # lê self.metrics a cada requisição: o toggle da aba Development troca a instância
+        self.metrics_server = MetricsServer(
+            lambda: self.metrics,
+            host=settings.metrics_server_host,
+            port=settings.metrics_server_port,
+            logger=logger,
+        )
+        try:
+            self.metrics_server.start()
+        except OSError as e:
+            logger.warning(f"Não foi possível iniciar o servidor de métricas: {e}")
+
+    def _run_main_task(self, **kwargs):
         # Aqui vai a lógica principal da sua aplicação
         logger = self.__getLogger("main_task")
+
+        if self.worker.busy:
+            logger.warning("Ciclo anterior ainda em execução, pulando este tick.")
+            return False
+
         logger.info("Running main task...")
+        self.worker.submit(self.run, **kwargs)
+        return True
 
-        try:
-            self.run()
-        except Exception as e:
-            logger.exception(e)
+    def _poll_worker(self, interval_ms=50):
+        # Resultados do worker são tratados aqui, sempre na thread do Tk
+        for result in self.worker.poll():
+            self._on_task_result(result)
+        self._worker_poll_job = self.root.after(interval_ms, self._poll_worker)
+
+    def _on_task_result(self, result):
+        logger = self.__getLogger("main_task")
+
+        if self._run_once_pending:
+            # resultado do ciclo anterior; a execução pedida ainda vai rodar
+            if result.error is not None:
+                logger.exception(result.error, exc_info=result.error)
+                self.metrics.counter("cycle_errors_total").inc()
+            return
+
+        if result.error is not None:
+            logger.exception(result.error, exc_info=result.error)
+            self.metrics.counter("cycle_errors_total").inc()
             # stop app
-            self._stop_application()
+            if self._running:
+                self._stop_application()
+            return
+
+        if result.cancelled:
+            logger.info("Main task cancelled.")
+        else:
+            logger.debug("Main task finished.")
+
+        if self._run_once and self._running:
+            self._stop_application()  # para logo em seguida
+        elif self._running and self._deadlines is not None and not self._autorun_job:
+            self._schedule_next_deadline()
+
+    def _on_close(self):
+        logger = self.__getLogger("close")
+        logger.debug("Closing application...")
+        self._running = False
+        self.worker.stop(timeout=2)
+        self.window_source.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        config.close()  # garante que edições pendentes cheguem ao disco
+        self.root.destroy()
 
     def _stop_application(self):
         logger = self.__getLogger("stop_application")
         logger.info("Application stopped.")
         self._running = False
+        self._run_once = False
+        self._run_once_pending = False
+
+        # interrompe o ciclo em andamento entre uma janela e outra
+        self.worker.cancel()
 
         keybind = self.var_app_keybind.get().upper()  # <<<<<<<<<<<<<<<<<<<<<<
         self.start_button.config(
@@ -265,6 +714,7 @@ class Application:
         if self._autorun_job:
             self.root.after_cancel(self._autorun_job)
             self._autorun_job = None
+        self._deadlines = None
 
         # stopping keep-alive countdown
         if (
@@ -293,13 +743,15 @@ class Application:
                 self.next_tick_label.config(text="")
                 return
 
-            seconds_left = int(self._autorun_next_tick_time - time.time())
+            seconds_left = int(self._autorun_next_tick_time - time.monotonic())
             if seconds_left < 0:
                 seconds_left = 0
 
-            self.next_tick_label.config(
-                text=f"Next run in {seconds_left} seconds", foreground="blue"
-            )
+            text = f"Next run in {seconds_left} seconds"
+            deadlines = self._deadlines
+            if deadlines is not None and (deadlines.late or deadlines.missed):
+                text += f" (late: {deadlines.late}, missed: {deadlines.missed})"
+            self.next_tick_label.config(text=text, foreground="blue")
 
             if seconds_left > 0:
                 self._autorun_update_job = self.root.after(1000, update_label)
@@ -318,23 +770,6 @@ class Application:
         action_frame = ttk.LabelFrame(frame, text="General")
         action_frame.pack(fill="x", padx=10, pady=10)
 
-        self.var_action_key = tk.StringVar(
-            value=config.get("APPLICATION", "action_key", fallback="space")
-        )
-        self.var_action_delay = tk.StringVar(
-            value=config.get("APPLICATION", "action_delay", fallback="0")
-        )
-        self.var_action_hold_duration = tk.StringVar(
-            value=config.get("APPLICATION", "action_key_hold_duration", fallback="250")
-        )
-        self.var_ignored_pids = tk.StringVar(
-            value=config.get("APPLICATION", "ignored_pids", fallback="")
-        )
-        self.var_preserve_focus = tk.BooleanVar(
-            value=config.get("APPLICATION", "preserve_focus", fallback="False")
-            == "True"
-        )
-
         chk_preserve_focus = ttk.Checkbutton(
             action_frame,
             text="Preserve pre-keep-alive focus (unreliable)",
@@ -344,6 +779,26 @@ class Application:
         )
         chk_preserve_focus.pack(anchor="w", padx=10, pady=5)
 
+        # focus: ativa cada janela; message: envia direto, sem roubar o foco
+        # (janelas que recusarem a mensagem voltam para o modo focus; as que
+        # aceitam mas ignoram precisam estar em Focus-only Pids)
+        input_row = ttk.Frame(action_frame)
+        input_row.pack(fill="x", padx=20, pady=2)
+        ttk.Label(input_row, text="Input Mode:").pack(side="left")
+        cmb_input_mode = ttk.Combobox(
+            input_row,
+            textvariable=self.var_input_mode,
+            values=(FOCUS, MESSAGE),
+            state="readonly",
+            width=17,
+            takefocus=False,
+        )
+        cmb_input_mode.pack(side="right", padx=(10, 0))
+        cmb_input_mode.bind(
+            "<<ComboboxSelected>>",
+            lambda e: self._on_save_entry("input_mode", self.var_input_mode),
+        )
+
         # Cria as entries normais com autosave
         entry_action_key = self._create_labeled_entry(  # noqa
             action_frame, "Action Key:", self.var_action_key, "action_key"
@@ -360,6 +815,12 @@ class Application:
         entry_ignored_pids = self._create_labeled_entry(  # noqa
             action_frame, "Ignored Pids:", self.var_ignored_pids, "ignored_pids"
         )
+        entry_focus_only_pids = self._create_labeled_entry(  # noqa
+            action_frame,
+            "Focus-only Pids:",
+            self.var_focus_only_pids,
+            "focus_only_pids",
+        )
 
         # Application Keybind com botão para capturar tecla
         container = ttk.Frame(action_frame)
@@ -381,16 +842,6 @@ class Application:
         tiler_frame = ttk.LabelFrame(frame, text="Window Tiler")
         tiler_frame.pack(fill="x", padx=10, pady=10)
 
-        self.var_tiler_enabled = tk.BooleanVar(
-            value=config.get("APPLICATION", "tiler_enabled", fallback="False") == "True"
-        )
-        self.var_tiler_gapx = tk.StringVar(
-            value=config.get("APPLICATION", "tiler_gapx", fallback="10")
-        )
-        self.var_tiler_gapy = tk.StringVar(
-            value=config.get("APPLICATION", "tiler_gapy", fallback="10")
-        )
-
         ttk.Checkbutton(
             tiler_frame,
             text="Enable Tiler",
@@ -408,24 +859,36 @@ class Application:
             tiler_frame, "Gap Y:", self.var_tiler_gapy, "tiler_gapy", takefocus=False
         )
 
+        entry_cell_width = self._create_labeled_entry(
+            tiler_frame,
+            "Window Width:",
+            self.var_tiler_cell_width,
+            "tiler_cell_width",
+            takefocus=False,
+        )
+        entry_cell_height = self._create_labeled_entry(
+            tiler_frame,
+            "Window Height:",
+            self.var_tiler_cell_height,
+            "tiler_cell_height",
+            takefocus=False,
+        )
+
         self._setup_autosave_entry(entry_gapx, self.var_tiler_gapx, "tiler_gapx")
         self._setup_autosave_entry(entry_gapy, self.var_tiler_gapy, "tiler_gapy")
 
-        self._tiler_entries = [entry_gapx, entry_gapy]
+        self._tiler_entries = [
+            entry_gapx,
+            entry_gapy,
+            entry_cell_width,
+            entry_cell_height,
+        ]
         self._toggle_fields(None, self.var_tiler_enabled, self._tiler_entries)
 
         # --- AUTO RUN ---
         autorun_frame = ttk.LabelFrame(frame, text="Auto Run")
         autorun_frame.pack(fill="x", padx=10, pady=10)
 
-        self.var_autorun_enabled = tk.BooleanVar(
-            value=config.get("APPLICATION", "autorun_enabled", fallback="False")
-            == "True"
-        )
-        self.var_autorun_delay = tk.StringVar(
-            value=config.get("APPLICATION", "autorun_delay_minutes", fallback="5")
-        )
-
         ttk.Checkbutton(
             autorun_frame,
             text="Enable Auto Run",
@@ -558,7 +1021,7 @@ class Application:
 
     def _on_save_entry(self, key: str, var: tk.StringVar):
         logger = self.__getLogger("on_save_entry")
-        logger.debug(f"Saving entry for key: {key}")
+        logger.debug("Saving entry for key: %s", key)
         config.set("APPLICATION", key, var.get())
         config.save()
 
@@ -575,9 +1038,12 @@ class Application:
 
             def save_action():
                 logger = self.__getLogger("_setup_autosave_entry")
-                logger.debug(
-                    f"Auto-saving config key '{config_key}' with value '{var.get()}'"
-                )
+                if logger.isEnabledFor(logging.DEBUG):  # var.get() vai até o Tk
+                    logger.debug(
+                        "Auto-saving config key '%s' with value '%s'",
+                        config_key,
+                        var.get(),
+                    )
                 self._on_save_entry(config_key, var)
 
             self._autosave_after_ids[entry] = self.root.after(delay_ms, save_action)
@@ -588,9 +1054,12 @@ class Application:
             if after_id:
                 self.root.after_cancel(after_id)
             logger = self.__getLogger("_setup_autosave_entry")
-            logger.debug(
-                f"Enter pressed, saving config key '{config_key}' with value '{var.get()}'"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Enter pressed, saving config key '%s' with value '%s'",
+                    config_key,
+                    var.get(),
+                )
             self._on_save_entry(config_key, var)
             self.root.focus()  # tira o foco do entry
 
@@ -603,7 +1072,9 @@ class Application:
             var.set(saved_val)
             logger = self.__getLogger("_setup_autosave_entry")
             logger.debug(
-                f"Escape pressed, reverted config key '{config_key}' to '{saved_val}'"
+                "Escape pressed, reverted config key '%s' to '%s'",
+                config_key,
+                saved_val,
             )
             self.root.focus()  # tira o foco do entry
 
@@ -671,8 +1142,29 @@ class Application:
 
         lbl_title.bind("<Button-1>", on_title_click)
 
-        # Inicia atualização automática
-        self._start_auto_update_window_info()
+        # --- METRICS ---
+        metrics_frame = ttk.LabelFrame(container, text="Metrics")
+        metrics_frame.pack(fill="x", padx=10, pady=(15, 0))
+
+        ttk.Checkbutton(
+            metrics_frame,
+            text="Collect metrics",
+            variable=self.var_metrics_enabled,
+            command=self._on_metrics_enabled_changed,
+            takefocus=False,
+        ).pack(anchor="w", padx=10, pady=5)
+
+        self.var_metrics_summary = tk.StringVar(value="")
+        ttk.Label(
+            metrics_frame,
+            textvariable=self.var_metrics_summary,
+            font=("Consolas", 8),
+            justify="left",
+        ).pack(anchor="w", padx=10, pady=(0, 5))
+
+        # atualiza a cada 1 s, só enquanto a aba estiver visível
+        self._add_page_timer("Development", 1000, self._update_window_info)
+        self._add_page_timer("Development", 1000, self._update_metrics_panel)
 
     # --- utils for development page
 
@@ -681,18 +1173,13 @@ class Application:
         self.root.clipboard_append(text)
         self.root.update()  # Necessário para manter no clipboard mesmo após fechar janela
 
-    def _start_auto_update_window_info(self):
-        # Atualiza uma vez, depois agenda próxima atualização em 1 segundo
-        self._update_window_info()
-        self.root.after(1000, self._start_auto_update_window_info)
-
     def _update_window_info(self):
         try:
-            active_win = gw.getActiveWindow()
+            # lido do registry em memória, sem consultar o sistema
+            active_win = self.registry.foreground()
             if active_win:
                 title = active_win.title
-                hwnd = active_win._hWnd
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+                pid = active_win.pid
             else:
                 title = "N/A"
                 pid = "N/A"
@@ -705,141 +1192,218 @@ class Application:
         self.var_window_title.set(title)
         self.var_window_pid.set(str(pid))
 
+    def _on_metrics_enabled_changed(self):
+        enabled = self.var_metrics_enabled.get()
+        config.set("APPLICATION", "metrics_enabled", str(enabled))
+        config.save()
+        self._set_metrics_enabled(enabled)
+
+    def _set_metrics_enabled(self, enabled):
+        if enabled != self.metrics.enabled:
+            # o worker pega a nova instância no próximo ciclo
+            self.metrics = create_metrics(enabled)
+
+    def _update_metrics_panel(self):
+        self.var_metrics_summary.set(format_metrics(self.metrics))
+
     # --- utils for development page (end)
 
     # --- CORE (the real deal) ---
 
-    def run(self):
+    def run(self, cancel=None, deadlines=None):
+        """
+        Runs one full cycle (discovery, tiling and keep-alive); called on the worker.
+
+        :param cancel: optional threading.Event; when set the cycle stops between windows
+        :param deadlines: optional DeadlineScheduler; only the windows due right now
+            get the keep-alive (all of them are still tiled)
+        """
         logger = self.__getLogger("run")
         logger.info("Tarefa principal rodando")
+        metrics = self.metrics
+        metrics.counter("cycles_total", "Main task cycles started").inc()
+
+        # cycle_id em todos os registros do ciclo (logs estruturados)
+        with log_cycle() as cycle_id:
+            start = time.perf_counter()
+            try:
+                with metrics.timer("run_seconds"):
+                    return self._run_cycle(cancel, deadlines)
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+                logger.info(
+                    "Ciclo %s finalizado em %.1f ms",
+                    cycle_id,
+                    duration_ms,
+                    extra={"cycle_id": cycle_id, "duration_ms": round(duration_ms, 1)},
+                )
 
+    def _run_cycle(self, cancel, deadlines):
+        logger = self.__getLogger("run")
         target_windows = self.get_target_windows()
-        logger.debug(f"Target windows: {target_windows}")
+        logger.debug("Target windows: %s", target_windows)
 
         if not target_windows:
             logger.warning("Nenhuma janela válida encontrada.")
+            if deadlines is not None:
+                deadlines.sync(())  # esquece as janelas fechadas
             return
 
-        tiler_enabled = (
-            config.get("APPLICATION", "tiler_enabled", fallback="false").lower()
-            == "true"
-        )
-        if tiler_enabled:
+        if config.settings.tiler_enabled:
             self.tile_windows(target_windows)
 
-        self.keep_alive_windows(target_windows)
-
-    def get_target_windows(self):
-        logger = self.__getLogger("get_target_windows")
+        if deadlines is not None:
+            target_windows = self._due_windows(target_windows, deadlines)
+            if not target_windows:
+                return
 
-        # Ignorar PIDs definidos no config
-        ignored_pids = config.get("APPLICATION", "ignored_pids", fallback="")
-        ignored_pids = [
-            int(pid.strip()) for pid in ignored_pids.split(",") if pid.strip().isdigit()
-        ]
+        if cancel is not None and cancel.is_set():
+            return
 
-        affected_windows = []
+        return self.keep_alive_windows(target_windows, cancel=cancel)
 
-        for window in gw.getWindowsWithTitle("Roblox"):
-            try:
-                hwnd = window._hWnd  # pygetwindow window handle
-                if not win32gui.IsWindowVisible(hwnd):
-                    continue
+    def _due_windows(self, windows, deadlines):
+        logger = self.__getLogger("run")
 
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        # janelas novas entram na fila sem mexer no prazo das outras
+        deadlines.sync(window._hWnd for window, pid in windows)
+        late, missed = deadlines.late, deadlines.missed
+        due = set(deadlines.pop_due())
+        due_windows = [w for w in windows if w[0]._hWnd in due]
+        logger.debug("%d de %d janelas vencidas", len(due_windows), len(windows))
+
+        late, missed = deadlines.late - late, deadlines.missed - missed
+        if late or missed:
+            logger.warning(
+                "Autorun atrasado: %d janelas fora do prazo, %d ticks pulados",
+                late,
+                missed,
+            )
+        self.metrics.counter("autorun_late_total", "Windows serviced late").inc(late)
+        self.metrics.counter("autorun_missed_total", "Periods skipped").inc(missed)
+        return due_windows
 
-                if pid in ignored_pids:
-                    continue
+    def get_target_windows(self):
+        logger = self.__getLogger("get_target_windows")
 
-                proc = psutil.Process(pid)
-                if "roblox" not in proc.name().lower():
-                    continue
+        # Ignorar PIDs definidos no config (já vem como frozenset)
+        ignored_pids = config.settings.ignored_pids
+        affected_windows = []
 
-                affected_windows.append((window, pid))
+        with self.metrics.timer("get_target_windows_seconds"):
+            if self.registry.ready:
+                # índice mantido por eventos, nada é enumerado aqui
+                targets = [
+                    i for i in self.registry.targets() if i.pid not in ignored_pids
+                ]
+            else:
+                # uma única enumeração; nome do processo vem do cache por pid
+                targets = self.discovery.find(ignored_pids=ignored_pids)
 
-            except Exception as e:
-                logger.debug(f"Erro ao processar janela: {e}")
+            for info in targets:
+                try:
+                    affected_windows.append((gw.Win32Window(info.hwnd), info.pid))
+                except Exception as e:
+                    logger.debug("Erro ao processar janela: %s", e)
 
+        self.metrics.gauge("target_windows", "Windows found in the last cycle").set(
+            len(affected_windows)
+        )
         return affected_windows
 
-    def keep_alive_windows(self, windows: list[tuple]):
+    def keep_alive_windows(self, windows: list[tuple], cancel=None):
         """
         Mantém as janelas vivas: foca e envia a tecla de ação.
         """
         logger = self.__getLogger("keep_alive")
 
-        action_key = config.get("APPLICATION", "action_key", fallback="space")
-        action_delay = int(config.get("APPLICATION", "action_delay", fallback="250"))
-        action_key_hold = int(
-            config.get("APPLICATION", "action_key_hold_duration", fallback="0")
+        settings = config.settings
+        # teto da espera pelo foco; o resto a AdaptiveSettle ajusta sozinha
+        self.keepalive.settle.ceiling_ms = settings.focus_settle_max_ms
+
+        mode = settings.input_mode
+        if settings.action_macro and mode != FOCUS:
+            # macro usa SendInput, que só chega na janela em foco
+            logger.debug("Macro configurada, usando o modo focus")
+            mode = FOCUS
+
+        report = self.keepalive.run(
+            windows,
+            key=settings.action_key,
+            hold=settings.action_key_hold_duration,
+            delay=settings.action_delay,
+            preserve_focus=settings.preserve_focus,
+            cancel=cancel,
+            mode=mode,
+            focus_only_pids=settings.focus_only_pids,
         )
-        preserve_focus = (
-            config.get("APPLICATION", "preserve_focus", fallback="true").lower()
-            == "true"
-        )
-
-        # Salva a janela que está com foco antes das mudanças
-        if preserve_focus:
-            try:
-                original_foreground_hwnd = win32gui.GetForegroundWindow()
-            except Exception as e:
-                logger.warning(f"Não foi possível obter janela em foreground: {e}")
-                original_foreground_hwnd = None
-
-        for i, (window, pid) in enumerate(windows):
-            try:
-                logger.debug(f"Ativando janela PID {pid} com título: {window.title}")
-                window.activate()
-
-                time.sleep(0.1)  # Dá tempo da janela realmente ganhar o foco
-
-                press(action_key, hold=action_key_hold)
-
-                if i < len(windows) - 1:
-                    logger.debug(f"Aguardando {action_delay}ms antes da próxima janela")
-                    time.sleep(action_delay / 1000)
-
-            except Exception as e:
-                logger.warning(f"Erro ao manter janela PID {pid} ativa: {e}")
-
-        # Restaura o foco para a janela que estava ativa antes
-        if original_foreground_hwnd and win32gui.IsWindow(original_foreground_hwnd):
+        logger.debug("Keep-alive finalizado: %s", report)
+
+        metrics = self.metrics
+        if metrics.enabled:
+            histogram = metrics.histogram("keepalive_window_seconds")
+            settle = metrics.histogram("keepalive_settle_seconds")
+            for t in report.timings:
+                histogram.observe(t.wait + t.lock + t.activate + t.settle + t.action)
+                if t.activate:
+                    settle.observe(t.settle)
+            metrics.counter("focus_settle_timeouts_total").inc(report.settle_timeouts)
+            metrics.counter("keepalive_ok_total").inc(report.ok)
+            # modo message: entregue na fila da janela, sem confirmação do cliente
+            metrics.counter("keepalive_posted_total").inc(report.posted)
+            metrics.counter("keepalive_failed_total").inc(report.failed)
+        return report
+
+    def _send_action(self, key, hold=0):
+        """
+        Envia a ação na janela em foco: a macro configurada (action_macro) ou,
+        sem macro, a tecla de ação.
+        """
+        source = config.settings.action_macro
+        if source:
             try:
-                win32gui.SetForegroundWindow(original_foreground_hwnd)
-            except Exception as e:
-                logger.warning(
-                    f"Não foi possível restaurar o foco para a janela original: {e}"
-                )
-        else:
-            logger.debug(
-                "Não havia janela com foco anteriormente ou janela inválida, não restaura foco"
-            )
+                # compilada uma vez por texto (cache em compile_macro)
+                macro = compile_macro(source)
+            except MacroError as e:
+                # um aviso por texto de macro, não um por janela
+                if source != self._invalid_macro:
+                    self._invalid_macro = source
+                    self.__getLogger("keep_alive").warning(
+                        "Macro inválida (%s), enviando a tecla de ação", e
+                    )
+            else:
+                self.macro_player.play(macro)
+                return
+        press(key, hold)
 
     def tile_windows(self, windows):
         logger = self.__getLogger("tile_windows")
 
-        gap_x = int(config.get("APPLICATION", "gap_x", fallback="100"))
-        gap_y = int(config.get("APPLICATION", "gap_y", fallback="100"))
-        screen_width, _ = pyautogui.size()
-
-        x, y = 20, 20
-        for window, pid in windows:
-            try:
-                if window.isMinimized:
-                    window.restore()
-
-                # Garantir que a janela tenha foco
-                window.activate()
+        settings = config.settings
+        cell = (settings.tiler_cell_width, settings.tiler_cell_height)
+        gap = (settings.tiler_gapx, settings.tiler_gapy)
 
-                window.resizeTo(800, 600)
-                window.moveTo(x, y)
-
-                logger.debug(f"Janela '{window.title}' movida para ({x}, {y})")
+        hwnds = [window._hWnd for window, pid in windows]
+        try:
+            # grade calculada de uma vez e aplicada num único lote, sem ativar janelas
+            with self.metrics.timer("tile_windows_seconds"):
+                result = self.tiler.tile(hwnds, cell=cell, gap=gap)
+        except Exception as e:
+            logger.error(f"Erro ao organizar janelas: {e}")
+            return None
 
-                x += gap_x
-                if x > screen_width:
-                    x = 20
-                    y += gap_y
+        self.metrics.counter("tile_moves_total").inc(len(result.moves))
 
-            except Exception as e:
-                logger.error(f"Erro ao mover janela '{window.title}': {e}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for hwnd, rect in result.moves:
+                logger.debug(
+                    "Janela %s movida para (%s, %s)",
+                    hwnd,
+                    rect.x,
+                    rect.y,
+                    extra={"hwnd": hwnd},
+                )
+        logger.info(
+            f"Tiler: {len(result.moves)} movidas, {result.skipped} sem alteração"
+        )
+        return result
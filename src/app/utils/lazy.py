@@ -0,0 +1,60 @@
+import importlib
+import logging
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that only imports the real module on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def loaded(self):
+        return self.__dict__["_lazy_module"] is not None
+
+
+def lazy_import(name):
+    """Returns a LazyModule for `name`; the import happens on first use."""
+    return LazyModule(name)
+
+
+def preload(*modules, logger=None):
+    """
+    Imports modules (names or LazyModules) on a background daemon thread.
+
+    Meant to run right after the first paint, so the first real use doesn't pay
+    for the import. Failures are only logged; the first use will raise them again.
+    """
+    logger = logger or logging.getLogger(__name__ + ".preload")
+
+    def run():
+        for module in modules:
+            name = module if isinstance(module, str) else module.__name__
+            try:
+                if isinstance(module, LazyModule):
+                    module._load()
+                else:
+                    importlib.import_module(name)
+                logger.debug(f"Módulo '{name}' pré-carregado")
+            except Exception as e:
+                logger.debug(f"Não foi possível pré-carregar '{name}': {e}")
+
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    return thread
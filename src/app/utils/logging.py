@@ -1,7 +1,16 @@
+import atexit
+import contextvars
+import gzip
+import itertools
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import shutil
 import sys
+import threading
+from contextlib import contextmanager
 from functools import partial, partialmethod  # for custom log levels
 
 import colorlog
@@ -39,11 +48,13 @@ else:
 
 logging.LOG_FILE_PATH = log_file_path
 
+# delay: o arquivo (e a pasta logs/) só é criado no primeiro registro
 file_handler = logging.handlers.RotatingFileHandler(
     filename=log_file_path,
     encoding="utf-8",
     maxBytes=32 * 1024 * 1024,  # 32 MiB
     backupCount=5,  # Rotate through 5 files
+    delay=True,
 )
 console_handler = logging.StreamHandler()
 
@@ -71,3 +82,184 @@ color_formatter = colorlog.ColoredFormatter(
     reset=True,
 )
 console_handler.setFormatter(color_formatter)
+
+# --- structured (JSON lines) logs
+
+# campos opcionais, passados com extra={...} (cycle_id vem de log_cycle())
+STRUCTURED_FIELDS = ("cycle_id", "pid", "hwnd", "duration_ms", "durations")
+
+current_cycle = contextvars.ContextVar("cycle_id", default=None)
+_cycle_ids = itertools.count(1)
+
+
+@contextmanager
+def log_cycle():
+    """Tags every record logged inside the block (same thread) with a new cycle_id."""
+    token = current_cycle.set(next(_cycle_ids))
+    try:
+        yield current_cycle.get()
+    finally:
+        current_cycle.reset(token)
+
+
+class CycleFilter(logging.Filter):
+    """Copies the current cycle_id into the record; must run on the logging thread."""
+
+    def filter(self, record):
+        if getattr(record, "cycle_id", None) is None:
+            record.cycle_id = current_cycle.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, thread, msg + STRUCTURED_FIELDS."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S")
+            + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class GzipRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler whose rotated segments are gzipped (debug.log.1.gz, ...).
+
+    Rotation itself is just a rename; the compression runs on a background
+    thread. A rollover only waits for the previous segment if it is still being
+    compressed a whole segment later.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._rotate
+        self._compressor = None
+
+    def _rotate(self, source, dest):
+        if not os.path.exists(source):
+            return
+        pending = dest[: -len(".gz")]  # ex: debug.log.1, comprimido em seguida
+        os.replace(source, pending)
+        self._compressor = threading.Thread(
+            target=self._compress, args=(pending, dest), name="log-gzip", daemon=True
+        )
+        self._compressor.start()
+
+    @staticmethod
+    def _compress(source, dest):
+        try:
+            with open(source, "rb") as src, gzip.open(dest + ".tmp", "wb") as out:
+                shutil.copyfileobj(src, out)
+            os.replace(dest + ".tmp", dest)
+            os.remove(source)
+        except OSError as e:
+            # sem handler de log aqui: estamos dentro do próprio logging
+            sys.stderr.write(f"Erro ao comprimir {source}: {e}\n")
+
+    def wait_compression(self, timeout=None):
+        if self._compressor is not None:
+            self._compressor.join(timeout)
+            self._compressor = None
+
+    def doRollover(self):
+        # o .1 ainda em compressão seria renomeado para .2 no meio da escrita
+        self.wait_compression()
+        super().doRollover()
+
+    def close(self):
+        self.wait_compression()
+        super().close()
+
+
+def create_file_handler(
+    path=None, structured=False, compress=False, max_bytes=32 * 1024 * 1024
+):
+    """
+    File handler for `path` (defaults to LOG_FILE_PATH).
+
+    :param structured: JSON lines (JsonFormatter) instead of plain text
+    :param compress: gzip rotated segments on a background thread
+    """
+    cls = GzipRotatingFileHandler if compress else logging.handlers.RotatingFileHandler
+    handler = cls(
+        filename=path or log_file_path,
+        encoding="utf-8",
+        maxBytes=max_bytes,
+        backupCount=5,
+        delay=True,
+    )
+    handler.setFormatter(JsonFormatter() if structured else file_formatter)
+    return handler
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves the record untouched.
+
+    The stock prepare() formats the message on the calling thread so the record
+    can be pickled; our queue never leaves the process, so formatting (and the
+    %-style argument merge) is left to the listener thread too. Arguments are
+    therefore rendered a moment later, so pass values, not objects that are
+    about to change.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_listener = None
+_queue_handler = None  # (logger, AsyncQueueHandler) instalado por setup_queue_logging
+
+
+def setup_queue_logging(logger, *handlers):
+    """
+    Routes `logger` through a queue: the calling thread only enqueues the record,
+    formatting and I/O for `handlers` happen on a QueueListener thread.
+
+    Returns the listener (already started, stopped at exit).
+    """
+    global _listener, _queue_handler
+    stop_queue_logging()
+
+    for handler in handlers:
+        filename = getattr(handler, "baseFilename", None)
+        if filename:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+    log_queue = queue.SimpleQueue()
+    handler = AsyncQueueHandler(log_queue)
+    handler.addFilter(CycleFilter())  # roda na thread que loga, antes da fila
+    logger.addHandler(handler)
+    _queue_handler = (logger, handler)
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def stop_queue_logging():
+    """Flushes whatever is still queued and stops the listener thread."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logger, handler = _queue_handler
+        logger.removeHandler(handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_queue_logging)
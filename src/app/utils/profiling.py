@@ -0,0 +1,52 @@
+import logging
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """
+    Records how long each named phase takes (e.g. the startup steps).
+
+    Usage:
+        timer = PhaseTimer()
+        with timer.phase("tk_init"):
+            root = tk.Tk()
+        timer.log(logger)
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.phases = []  # (name, seconds), na ordem em que terminaram
+
+    @contextmanager
+    def phase(self, name):
+        """Times the block; entering a phase again adds to its earlier entry."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            seconds = self.clock() - start
+            for i, (existing, total) in enumerate(self.phases):
+                if existing == name:
+                    self.phases[i] = (name, total + seconds)
+                    break
+            else:
+                self.phases.append((name, seconds))
+
+    @property
+    def elapsed(self):
+        return self.clock() - self.started
+
+    def summary(self):
+        phases = ", ".join(f"{name}={sec * 1000:.1f}ms" for name, sec in self.phases)
+        return f"{self.elapsed * 1000:.1f}ms total ({phases})"
+
+    def log(self, logger, title="Startup"):
+        """One TRACE line per phase, then the summary at EVENT level."""
+        trace = getattr(logging, "TRACE", logging.DEBUG)
+        event = getattr(logging, "EVENT", logging.INFO)
+        if logger.isEnabledFor(trace):
+            for name, seconds in self.phases:
+                logger.log(trace, f"{title} phase '{name}': {seconds * 1000:.1f}ms")
+        logger.log(event, f"{title}: {self.summary()}")
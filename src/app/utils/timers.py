@@ -0,0 +1,32 @@
+class PageTimer:
+    """
+    Repeating root.after() callback that can be paused and resumed.
+
+    The callback runs right away on start() and then every `interval_ms` until
+    stop(). Used for page-scoped refreshes that only make sense while the page
+    is on screen.
+    """
+
+    def __init__(self, root, interval_ms, callback):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.callback = callback
+        self._job = None
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def start(self):
+        if self._job is None:
+            self._tick()
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        # reagenda antes, para uma exceção no callback não matar o timer
+        self._job = self.root.after(self.interval_ms, self._tick)
+        self.callback()
@@ -1,27 +1,90 @@
+import functools
+import heapq
+import itertools
+import threading
 import time
+from collections import OrderedDict
+
+_END = None  # marcador de fim de chave na trie; nunca colide com um caractere
 
 
 class Cache:
-    def __init__(self, ttl=None):
-        self.cache = {}  # key: (data, timestamp, ttl)
+    """
+    Bounded LRU cache with per-entry TTL.
+
+    - maxsize: least recently used entries are evicted past this size (None = unbounded)
+    - ttl: default TTL in seconds (None = never expires); set() may override it
+    - expired entries are dropped proactively through a min-heap of deadlines
+    - string keys are indexed in a character trie, so find(startswith=...) only
+      walks the subtree under the prefix, however long the shared prefix is;
+      keeping the index costs O(len(key)) per insert/removal
+    - uses a monotonic clock, so wall-clock changes don't expire/revive entries
+    """
+
+    def __init__(self, ttl=None, maxsize=None, clock=time.monotonic):
+        self.cache = OrderedDict()  # key: (data, expires_at or None)
         self.ttl = ttl  # default TTL (global)
+        self.maxsize = maxsize
+        self.clock = clock
+        self._expiry = []  # heap (expires_at, seq, key); prazos velhos são ignorados
+        self._seq = itertools.count()  # desempate, chaves podem não ser comparáveis
+        self._trie = {}  # trie de chaves str: char -> nó; _END marca fim de chave
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
     def get(self, key, fallback=None):
-        if key in self.cache:
-            data, timestamp, ttl = self.cache[key]
-            ttl = ttl if ttl is not None else self.ttl
-            if ttl is None or time.time() - timestamp < ttl:
-                return data
-            else:
-                del self.cache[key]
-        return fallback
+        self._expire()
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return fallback
+        data, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return fallback
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def peek(self, key, fallback=None):
+        """Like get(), but doesn't count as a hit/miss nor refresh LRU order."""
+        entry = self.cache.get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= self.clock()):
+            return fallback
+        return entry[0]
 
     def set(self, key, data, ttl=None):
-        self.cache[key] = (data, time.time(), ttl)
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = self.clock() + ttl if ttl is not None else None
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        elif isinstance(key, str):
+            node = self._trie
+            for char in key:
+                child = node.get(char)
+                if child is None:
+                    child = node[char] = {}
+                node = child
+            node[_END] = True
+        self.cache[key] = (data, expires_at)
+        if expires_at is not None:
+            heapq.heappush(self._expiry, (expires_at, next(self._seq), key))
+
+        self._expire()
+        if self.maxsize is not None:
+            while len(self.cache) > self.maxsize:
+                oldest = next(iter(self.cache))
+                self._remove(oldest)
+                self.evictions += 1
 
     def delete(self, key):
         if key in self.cache:
-            del self.cache[key]
+            self._remove(key)
 
     def find(self, startswith=None, endswith=None, contains=None):
         """
@@ -30,23 +93,246 @@ class Cache:
             - startswith: string whose key needs to start with
             - endswith: string whose key needs to end with
             - contains: string whose key needs to contain in
-        Only returns valid entries (within TTL).
+        Only returns valid entries (within TTL). Lookups don't count as hits/misses
+        and don't refresh LRU order.
         """
+        self._expire()
+        if not (startswith or endswith or contains):
+            return {k: entry[0] for k, entry in self.cache.items()}
+
+        candidates = self._keys_under(startswith or "")
         result = {}
-        for k in list(
-            self.cache.keys()
-        ):  # list() evita erro de modificação durante iteração
-            data = self.get(k)  # verifica se ainda está válido (TTL)
-            if data is None:
-                continue
-            if startswith and not k.startswith(startswith):
-                continue
+        for k in sorted(candidates):
             if endswith and not k.endswith(endswith):
                 continue
             if contains and contains not in k:
                 continue
-            result[k] = data
+            result[k] = self.cache[k][0]
         return result
 
     def clear(self):
-        self.cache = {}
+        self.cache = OrderedDict()
+        self._expiry = []
+        self._trie = {}
+
+    def stats(self):
+        return {
+            "size": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self):
+        self._expire()
+        return len(self.cache)
+
+    def __contains__(self, key):
+        entry = self.cache.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > self.clock())
+
+    def _remove(self, key):
+        del self.cache[key]
+        if isinstance(key, str):
+            path = [self._trie]
+            for char in key:
+                path.append(path[-1][char])
+            del path[-1][_END]
+            # poda os nós que ficaram vazios, de baixo pra cima
+            for i in range(len(key), 0, -1):
+                if path[i]:
+                    break
+                del path[i - 1][key[i - 1]]
+
+    def _keys_under(self, prefix):
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        keys = []
+        stack = [(node, prefix)]
+        while stack:
+            node, path = stack.pop()
+            for char, child in node.items():
+                if char is _END:
+                    keys.append(path)
+                else:
+                    stack.append((child, path + char))
+        return keys
+
+    def _expire(self):
+        heap = self._expiry
+        if not heap:
+            return
+        now = self.clock()
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            # só remove se a entrada ainda é a que gerou este prazo
+            if entry is not None and entry[1] == expires_at:
+                self._remove(key)
+                self.expirations += 1
+
+        # chaves regravadas deixam prazos velhos no heap; compacta de vez em quando
+        if len(heap) > 2 * len(self.cache) + 64:
+            self._expiry = [
+                (entry[1], next(self._seq), key)
+                for key, entry in self.cache.items()
+                if entry[1] is not None
+            ]
+            heapq.heapify(self._expiry)
+
+
+_MISSING = object()
+
+
+class _Call:
+    # cálculo em andamento de uma chave (single-flight)
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ShardedCache:
+    """
+    Thread-safe Cache split into lock-striped shards.
+
+    Each key hashes to one shard with its own lock, so threads touching different
+    shards never contend. get_or_set() is single-flight: concurrent callers for the
+    same missing key wait for one factory call instead of all computing it.
+    maxsize is split exactly between shards (fewer shards when maxsize is smaller),
+    so the total never exceeds it; LRU order is per shard.
+    """
+
+    def __init__(self, shards=16, ttl=None, maxsize=None, clock=time.monotonic):
+        if maxsize is None:
+            sizes = [None] * shards
+        else:
+            # divide maxsize exatamente: o resto vai para os primeiros shards e
+            # nunca há mais shards do que entradas permitidas
+            shards = max(1, min(shards, maxsize))
+            base, extra = divmod(maxsize, shards)
+            sizes = [base + (i < extra) for i in range(shards)]
+        self._shards = [Cache(ttl, size, clock) for size in sizes]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._inflight = {}  # key: _Call
+        self._inflight_lock = threading.Lock()
+
+    def _shard(self, key):
+        i = hash(key) % len(self._shards)
+        return self._shards[i], self._locks[i]
+
+    def get(self, key, fallback=None):
+        shard, lock = self._shard(key)
+        with lock:
+            return shard.get(key, fallback)
+
+    def set(self, key, data, ttl=None):
+        shard, lock = self._shard(key)
+        with lock:
+            shard.set(key, data, ttl)
+
+    def delete(self, key):
+        shard, lock = self._shard(key)
+        with lock:
+            shard.delete(key)
+
+    def get_or_set(self, key, factory, ttl=None):
+        """Returns the cached value, computing it with factory() at most once per miss."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            # outro líder pode ter acabado de gravar entre o get e o registro;
+            # peek para não contar o mesmo miss duas vezes
+            shard, lock = self._shard(key)
+            with lock:
+                value = shard.peek(key, _MISSING)
+            if value is _MISSING:
+                value = factory()
+                self.set(key, value, ttl)
+            call.value = value
+            return value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            call.event.set()
+
+    def find(self, startswith=None, endswith=None, contains=None):
+        result = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                result.update(shard.find(startswith, endswith, contains))
+        return result
+
+    def clear(self):
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def stats(self):
+        total = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                for name, value in shard.stats().items():
+                    total[name] = total.get(name, 0) + value
+        return total
+
+    def __len__(self):
+        size = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                size += len(shard)
+        return size
+
+    def __contains__(self, key):
+        shard, lock = self._shard(key)
+        with lock:
+            return key in shard
+
+
+def memoize(cache, ttl=None, key=None):
+    """
+    Decorator caching a function's results in a ShardedCache (single-flight).
+
+    :param key: optional callable(*args, **kwargs) -> cache key; defaults to the
+        function name plus its arguments (which must then be hashable)
+
+    Example:
+        @memoize(ShardedCache(maxsize=10000), ttl=60)
+        def process_name(pid):
+            return psutil.Process(pid).name()
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if key is not None:
+                cache_key = key(*args, **kwargs)
+            else:
+                cache_key = (fn.__qualname__, args, frozenset(kwargs.items()))
+            return cache.get_or_set(cache_key, lambda: fn(*args, **kwargs), ttl)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -1,11 +1,24 @@
+import atexit
 import configparser
-import copy
+import hashlib
+import io
 import logging
 import os
+import stat
 import sys
+import tempfile
+import threading
+from dataclasses import dataclass, fields
 from pathlib import Path
 
 
+def _current_umask():
+    # os.umask só lê trocando o valor; devolve o original em seguida
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
 def get_resource_path(filename):
     """Resolve path para o arquivo mesmo dentro do .exe (modo PyInstaller)."""
     if hasattr(sys, "_MEIPASS"):
@@ -13,6 +26,64 @@ def get_resource_path(filename):
     return os.path.abspath(filename)
 
 
+@dataclass(frozen=True)
+class Settings:
+    """Typed, immutable view of the APPLICATION section (see ConfigManager.settings)."""
+
+    app_keybind: str = "f1"
+    action_key: str = "space"
+    action_delay: int = 0
+    action_key_hold_duration: int = 250
+    action_macro: str = ""  # vazio: só a action_key (ver src/lib/macros.py)
+    ignored_pids: frozenset = frozenset()
+    preserve_focus: bool = False
+    # message: PostMessage sem foco. Só detecta janelas que recusam a mensagem;
+    # um cliente que aceita e ignora (lê raw input) fica como "posted", nunca ok.
+    # Esses PIDs vão em focus_only_pids para usar sempre o foco.
+    input_mode: str = "focus"  # focus | message
+    focus_only_pids: frozenset = frozenset()
+    focus_settle_max_ms: int = 500
+    tiler_enabled: bool = False
+    tiler_gapx: int = 10
+    tiler_gapy: int = 10
+    tiler_cell_width: int = 800
+    tiler_cell_height: int = 600
+    autorun_enabled: bool = False
+    autorun_delay_minutes: int = 5
+    metrics_enabled: bool = True
+    metrics_server_enabled: bool = False
+    metrics_server_host: str = "127.0.0.1"
+    metrics_server_port: int = 9464
+    log_file_enabled: bool = False
+    log_format: str = "text"  # text | json
+    log_compress: bool = True
+
+    @classmethod
+    def from_section(cls, section, logger=None):
+        """Parses a config section (or any str -> str mapping) into Settings."""
+        logger = logger or logging.getLogger(__name__ + ".Settings")
+        values = {}
+        for field in fields(cls):
+            raw = section.get(field.name)
+            if raw is None:
+                continue
+            raw = raw.strip()
+            if field.type is bool:
+                values[field.name] = raw.lower() == "true"
+            elif field.type is int:
+                try:
+                    values[field.name] = int(raw)
+                except ValueError:
+                    logger.warning(f"Valor inválido para {field.name}: {raw!r}")
+            elif field.type is frozenset:
+                values[field.name] = frozenset(
+                    int(pid) for pid in raw.split(",") if pid.strip().isdigit()
+                )
+            else:
+                values[field.name] = raw.lower()
+        return cls(**values)
+
+
 class ConfigManager:
     _instance = None
 
@@ -22,75 +93,330 @@ class ConfigManager:
             cls._instance._initialize(logger)
         return cls._instance
 
-    def _initialize(self, logger=None):
+    def _initialize(self, logger=None, config_file=None):
         self.config = configparser.ConfigParser()
-        self.cached_config = None
-        self.config_file = get_resource_path("config.ini")
+        self.config_file = config_file or get_resource_path("config.ini")
+        self.version = 0  # incrementado a cada mudança efetiva de valor
+        self._settings = None
+        self._settings_version = -1
+        self._dirty = set()  # (section, key) alterados desde o último save
+        self._lock = threading.RLock()  # protege self.config e self._dirty
+        self._write_lock = threading.Lock()  # serializa escritas em disco
+        self._writer = None
+        self._write_requested = threading.Event()
+        self._writer_stop = threading.Event()
+        self.coalesce_window = 0.5
+        self._file_state = None  # (mtime_ns, size) do último read/write nosso
+        self._file_digest = None  # sha1 do conteúdo do último read/write nosso
+        self._subscribers = []
         self.logger = logger or logging.getLogger(__name__ + "." + "ConfigManager")
+        self._loggers = {}  # nome: logger filho (ver __getLogger)
+        self._loaded = False  # o disco só é lido no primeiro acesso
 
-        # Create config file if it doesn't exist
-        if not Path(self.config_file).exists():
-            self.logger.info("Config file not found, creating new one")
-            self._create_default_config()
-        else:
-            self.load()
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            # Create config file if it doesn't exist
+            create = not Path(self.config_file).exists()
+            if create:
+                self.logger.info("Config file not found, creating new one")
+                self._create_default_config()
+            else:
+                self.load()
+        # grava fora de _lock: flush() pega _write_lock antes de _lock, como a
+        # thread de write-behind, então segurar _lock aqui inverteria a ordem
+        if create:
+            self.save()
 
     def __getLogger(self, name):
-        return logging.getLogger(self.logger.name + "." + name)
+        # um logger filho por nome, criado na primeira chamada
+        logger = self._loggers.get(name)
+        if logger is None:
+            logger = self._loggers[name] = self.logger.getChild(name)
+        return logger
 
     def _create_default_config(self):
-        """Creates a new config file with default values"""
-        self.config["General"] = {"url_webhook": "", "url_private_server": ""}
-        self.save()
+        """Fills in the default values; _ensure_loaded() writes them to disk"""
+        self.set("General", "url_webhook", "")
+        self.set("General", "url_private_server", "")
 
     def load(self):
         """Loads configuration from file"""
         logger = self.__getLogger("load")
         logger.debug("Loading configuration")
-        self.config.read(self.config_file)
+        with self._lock:
+            self._loaded = True
+            with open(self.config_file, "rb") as f:
+                data = f.read()
+            self.config.read_string(data.decode("utf-8"), source=self.config_file)
+            self._remember_file(data)
+            self.version += 1
+            self._dirty.clear()
         logger.debug("Configuration loaded successfully: %s", self.config.sections())
-        self.cached_config = copy.deepcopy(self.config)
+
+    @property
+    def dirty(self):
+        return bool(self._dirty)
 
     def save(self):
-        """Saves configuration to file if changes detected"""
+        """
+        Saves configuration to file if changes detected.
+
+        With write-behind enabled this only schedules the write; the background
+        thread flushes it once no new save() arrived within `coalesce_window`.
+        """
         logger = self.__getLogger("save")
-        if self.cached_config and self.cached_config == self.config:
+        self._ensure_loaded()
+        if not self._dirty:
             logger.debug("No changes detected in configuration, skipping save")
             return
 
-        logger.info("Saving configuration to file")
-        with open(self.config_file, "w") as configfile:
-            self.config.write(configfile)
-            self.cached_config = copy.deepcopy(self.config)
+        if self._writer is not None:
+            self._write_requested.set()
+            return
+
+        self.flush()
+
+    def flush(self):
+        """Writes pending changes to disk right now, on the calling thread."""
+        logger = self.__getLogger("save")
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                dirty = set(self._dirty)
+                buffer = io.StringIO()
+                self.config.write(buffer)
+                self._dirty.clear()
+
+            logger.info("Saving configuration to file: %s", sorted(dirty, key=str))
+            try:
+                self._write_atomic(buffer.getvalue())
+            except BaseException:
+                with self._lock:
+                    self._dirty |= dirty  # tenta de novo no próximo save
+                raise
+
+    def start_write_behind(self, coalesce_window=None):
+        """Moves disk writes to a background thread (see save())."""
+        if coalesce_window is not None:
+            self.coalesce_window = coalesce_window
+        if self._writer is not None:
+            return
+        self._writer_stop.clear()
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="config-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def close(self):
+        """Stops the write-behind thread, flushing whatever is still pending."""
+        writer = self._writer
+        if writer is not None:
+            self._writer = None
+            self._writer_stop.set()
+            self._write_requested.set()
+            writer.join()
+            atexit.unregister(self.close)
+        self.flush()
+
+    def _writer_loop(self):
+        logger = self.__getLogger("writer")
+        while not self._writer_stop.is_set():
+            self._write_requested.wait()
+            # agrupa rajadas: só escreve depois de um intervalo sem novos saves
+            while self._write_requested.is_set() and not self._writer_stop.is_set():
+                self._write_requested.clear()
+                self._writer_stop.wait(self.coalesce_window)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Erro ao salvar configuração: {e}")
+
+    def _write_atomic(self, text):
+        # escreve num temporário do mesmo diretório e troca de uma vez; um crash no
+        # meio da escrita nunca deixa o config.ini truncado
+        directory = os.path.dirname(os.path.abspath(self.config_file))
+        fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=directory)
+        try:
+            data = text.encode("utf-8")
+            with os.fdopen(fd, "wb") as configfile:
+                configfile.write(data)
+                configfile.flush()
+                os.fsync(configfile.fileno())
+            # mkstemp cria com 0600; mantém as permissões do arquivo que será trocado
+            try:
+                mode = stat.S_IMODE(os.stat(self.config_file).st_mode)
+            except FileNotFoundError:
+                mode = 0o666 & ~_current_umask()
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.config_file)
+            self._remember_file(data)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    # --- hot reload
+
+    def _remember_file(self, data):
+        # o que nós mesmos lemos/escrevemos; não dispara reload
+        self._file_digest = hashlib.sha1(data).digest()
+        try:
+            st = os.stat(self.config_file)
+            self._file_state = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            self._file_state = None
+
+    def subscribe(self, callback):
+        """
+        Registers callback(changes) for external edits picked up by reload_if_changed().
+
+        `changes` is a list of (section, key, old, new); old/new are None when the
+        key was added/removed. Callbacks run on the thread calling reload_if_changed().
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def reload_if_changed(self):
+        """
+        Reloads the keys that changed on disk since our last read/write.
+
+        Cheap enough to poll: a stat() is all it costs while mtime and size are
+        unchanged, and files matching the content we wrote ourselves are ignored.
+        Keys with unsaved local edits keep the local value. Returns the changes.
+        """
+        logger = self.__getLogger("reload")
+        if not self._loaded:
+            self._ensure_loaded()
+            return []
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return []
+        state = (st.st_mtime_ns, st.st_size)
+        if state == self._file_state:
+            return []
+
+        with open(self.config_file, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).digest()
+        if digest == self._file_digest:
+            self._file_state = state
+            return []
+
+        fresh = configparser.ConfigParser()
+        try:
+            fresh.read_string(data.decode("utf-8"), source=self.config_file)
+        except (configparser.Error, UnicodeDecodeError) as e:
+            # provavelmente pego no meio de uma cópia; tenta de novo no próximo poll
+            logger.warning(f"Config file could not be parsed, ignoring: {e}")
+            return []
+
+        changes = []
+        with self._lock:
+            for section in set(self.config.sections()) | set(fresh.sections()):
+                old = self.config[section] if self.config.has_section(section) else {}
+                new = fresh[section] if fresh.has_section(section) else {}
+                for key in set(old) | set(new):
+                    if (section, key) in self._dirty or (section, None) in self._dirty:
+                        continue
+                    old_value = self.config.get(section, key, raw=True, fallback=None)
+                    new_value = fresh.get(section, key, raw=True, fallback=None)
+                    if old_value == new_value:
+                        continue
+                    changes.append((section, key, old_value, new_value))
+                    if new_value is None:
+                        self.config.remove_option(section, key)
+                    else:
+                        if not self.config.has_section(section):
+                            self.config.add_section(section)
+                        self.config.set(section, key, new_value)
+            if changes:
+                self.version += 1
+            self._file_digest = digest
+            self._file_state = state
+
+        if changes:
+            logger.info("Configuration reloaded from disk: %s", changes)
+            for callback in list(self._subscribers):
+                try:
+                    callback(changes)
+                except Exception as e:
+                    logger.exception(e)
+        return changes
 
     def get(self, section, key=None, fallback=None):
         """Gets a value from config or entire section"""
-        if key is None:
-            return self.config[section] if self.has_section(section) else fallback
-        return self.config.get(section, key, fallback=fallback)
+        self._ensure_loaded()
+        with self._lock:
+            if key is None:
+                return self.config[section] if self.has_section(section) else fallback
+            return self.config.get(section, key, fallback=fallback)
 
     def set(self, section, key, value):
         """Sets a value in config"""
+        self._ensure_loaded()
         logger = self.__getLogger("set")
-        if not self.config.has_section(section):
-            logger.debug(f"Creating new section: {section}")
-            self.config.add_section(section)
+        value = str(value)
+        with self._lock:
+            if not self.config.has_section(section):
+                logger.debug(f"Creating new section: {section}")
+                self.config.add_section(section)
 
-        self.config.set(section, key, str(value))
+            if self.config.get(section, key, raw=True, fallback=None) != value:
+                self.config.set(section, key, value)
+                self._dirty.add((section, key))
+                self.version += 1
 
     def remove_section(self, section):
         """Removes a section"""
-        if self.has_section(section):
-            self.config.remove_section(section)
+        self._ensure_loaded()
+        with self._lock:
+            if self.has_section(section):
+                self.config.remove_section(section)
+                self._dirty.add((section, None))
+                self.version += 1
+
+    @property
+    def settings(self):
+        """
+        Typed snapshot of the APPLICATION section.
+
+        Rebuilt only when `version` changed since the last access, so hot paths can
+        read it every tick; consumers may also compare `version` to skip work.
+        """
+        self._ensure_loaded()
+        if self._settings_version != self.version:
+            with self._lock:
+                version = self.version
+                section = dict(self.get("APPLICATION", fallback={}))
+            self._settings = Settings.from_section(
+                section, self.__getLogger("settings")
+            )
+            self._settings_version = version
+        return self._settings
 
     def has_section(self, section):
         """Checks if section exists"""
+        self._ensure_loaded()
         return self.config.has_section(section)
 
     def get_sections(self):
         """Returns list of all sections"""
+        self._ensure_loaded()
         return self.config.sections()
 
 
 # Create singleton instance
-Config = ConfigManager()
+Config = ConfigManager()  # o arquivo só é lido no primeiro acesso
@@ -0,0 +1,144 @@
+import heapq
+import itertools
+import random
+import time
+
+
+class DeadlineScheduler:
+    """
+    Per-key (e.g. per-hwnd) next-due deadlines kept in a min-heap.
+
+    Every key is serviced once per `interval` seconds, but keys are spread over
+    the interval instead of all coming due together: a new key takes the middle
+    of the largest free gap between the existing deadlines, so joining never
+    moves anyone else. Each deadline gets up to +-`jitter` * interval of random
+    offset, which does not accumulate (the unjittered base advances by exactly
+    one interval per service).
+
+    Scheduling is fixed-rate on a monotonic clock: the next base is always the
+    previous base plus one interval, however long servicing took. A key that
+    falls whole intervals behind (long cycle, suspended machine) is serviced once
+    and skips the missed periods, keeping its phase, instead of bursting to catch
+    up. `late` counts services that happened more than `tolerance` seconds after
+    their deadline, `missed` the periods skipped this way.
+
+    Pure bookkeeping, no threads or I/O; `clock` and `rng` are injectable for tests.
+    """
+
+    def __init__(
+        self, interval, jitter=0.0, tolerance=1.0, clock=time.monotonic, rng=None
+    ):
+        self.interval = interval
+        self.jitter = jitter
+        self.tolerance = tolerance
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.late = 0
+        self.missed = 0
+        self._heap = []  # (due, seq, key); entradas velhas são ignoradas
+        self._entries = {}  # key: (base, due, seq)
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def due_at(self, key):
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def _push(self, key, base):
+        offset = 0.0
+        if self.jitter:
+            offset = self.rng.uniform(-self.jitter, self.jitter) * self.interval
+        due = base + offset
+        seq = next(self._seq)
+        self._entries[key] = (base, due, seq)
+        heapq.heappush(self._heap, (due, seq, key))
+
+    def _free_slot(self, now):
+        """Middle of the largest gap between existing bases, inside [now, now + interval)."""
+        interval = self.interval
+        if not self._entries or interval <= 0:
+            return now
+        # posições relativas dentro de um intervalo, tratado como circular
+        positions = sorted(
+            (entry[0] - now) % interval for entry in self._entries.values()
+        )
+        best_start, best_size = positions[-1], positions[0] + interval - positions[-1]
+        for a, b in zip(positions, positions[1:]):
+            if b - a > best_size:
+                best_start, best_size = a, b - a
+        return now + (best_start + best_size / 2) % interval
+
+    def add(self, key, now=None):
+        """Schedules a new key; keys already scheduled keep their deadline."""
+        if key in self._entries:
+            return
+        now = self.clock() if now is None else now
+        self._push(key, self._free_slot(now))
+
+    def remove(self, key):
+        self._entries.pop(key, None)
+        self._maybe_rebuild()
+
+    def sync(self, keys, now=None):
+        """Adds new keys and forgets the ones no longer present."""
+        keys = list(keys)
+        alive = set(keys)
+        for key in list(self._entries):
+            if key not in alive:
+                del self._entries[key]
+        now = self.clock() if now is None else now
+        for key in keys:
+            self.add(key, now)
+        self._maybe_rebuild()
+
+    def _maybe_rebuild(self):
+        # chaves removidas deixam entradas velhas no heap; recria de vez em quando
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [
+                (due, seq, key) for key, (_, due, seq) in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def _compact(self):
+        heap = self._heap
+        while heap:
+            _, seq, key = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] == seq:
+                return
+            heapq.heappop(heap)
+
+    def next_deadline(self):
+        """Earliest deadline (clock time), or None when nothing is scheduled."""
+        self._compact()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now=None):
+        """Returns the keys due at `now` (earliest first) and schedules their next run."""
+        now = self.clock() if now is None else now
+        heap = self._heap
+        due_keys = []
+        while True:
+            self._compact()
+            if not heap or heap[0][0] > now:
+                break
+            due, _, key = heapq.heappop(heap)
+            due_keys.append(key)
+            if now - due > self.tolerance:
+                self.late += 1
+
+        interval = self.interval
+        for key in due_keys:
+            base = self._entries[key][0] + interval
+            if base <= now and interval > 0:
+                # ficou para trás: pula os períodos perdidos, mantendo a fase
+                skipped = int((now - base) // interval) + 1
+                self.missed += skipped
+                base += skipped * interval
+            self._push(key, base)
+        return due_keys
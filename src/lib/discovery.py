@@ -0,0 +1,170 @@
+import logging
+import time
+from typing import NamedTuple
+
+
+class WindowInfo(NamedTuple):
+    hwnd: int
+    title: str
+    pid: int
+
+
+class WindowProvider:
+    """
+    Platform access used by WindowDiscovery.
+
+    Subclasses must implement:
+        - enum_windows(): every visible top-level window as WindowInfo, in one pass
+        - process_name(pid): executable name for a pid (raises if the process is gone)
+
+    Optionally:
+        - foreground_window(): hwnd of the foreground window, None if unknown
+    """
+
+    def enum_windows(self):
+        raise NotImplementedError
+
+    def process_name(self, pid):
+        raise NotImplementedError
+
+    def foreground_window(self):
+        return None
+
+
+class Win32WindowProvider(WindowProvider):
+    """Enumerates windows through a single EnumWindows call (Windows only)."""
+
+    def enum_windows(self):
+        import win32gui
+        import win32process
+
+        windows = []
+
+        def callback(hwnd, _):
+            # visibilidade primeiro, é a checagem mais barata
+            if not win32gui.IsWindowVisible(hwnd):
+                return True
+            title = win32gui.GetWindowText(hwnd)
+            if title:
+                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+                windows.append(WindowInfo(hwnd, title, pid))
+            return True
+
+        win32gui.EnumWindows(callback, None)
+        return windows
+
+    def process_name(self, pid):
+        import psutil
+
+        return psutil.Process(pid).name()
+
+    def foreground_window(self):
+        import win32gui
+
+        return win32gui.GetForegroundWindow() or None
+
+
+class SyntheticWindowProvider(WindowProvider):
+    """
+    In-memory provider for tests and benchmarks.
+
+    :param windows: iterable of WindowInfo
+    :param process_names: dict pid -> executable name
+    :param lookup_cost: seconds busy-waited per process_name call (simulates psutil)
+    """
+
+    def __init__(self, windows=(), process_names=None, lookup_cost=0.0):
+        self.windows = list(windows)
+        self.process_names = dict(process_names or {})
+        self.lookup_cost = lookup_cost
+        self.foreground = None
+        self.enum_calls = 0
+        self.process_name_calls = 0
+
+    def enum_windows(self):
+        self.enum_calls += 1
+        return list(self.windows)
+
+    def process_name(self, pid):
+        self.process_name_calls += 1
+        if self.lookup_cost:
+            deadline = time.perf_counter() + self.lookup_cost
+            while time.perf_counter() < deadline:
+                pass
+        try:
+            return self.process_names[pid]
+        except KeyError:
+            raise ProcessLookupError(pid)
+
+    def foreground_window(self):
+        return self.foreground
+
+
+class WindowDiscovery:
+    """
+    Finds target windows with one enumeration per call.
+
+    Windows are filtered by title, ignored pids and process name in a single pass.
+    Process names are memoized per pid and only reused for windows that already
+    belonged to that pid on the previous pass; pids that disappear from the
+    enumeration are dropped, so a recycled pid is always looked up again.
+    """
+
+    def __init__(
+        self,
+        provider: WindowProvider = None,
+        title: str = "Roblox",
+        process: str = "roblox",
+        logger=None,
+    ):
+        self.provider = provider or Win32WindowProvider()
+        self.title = title
+        self.process = process.lower()
+        self.logger = logger or logging.getLogger(__name__ + ".WindowDiscovery")
+        self._process_names = {}  # pid: nome do executável (lowercase)
+        self._hwnd_pids = {}  # hwnd: pid, da última varredura
+
+    def find(self, ignored_pids=()):
+        """Returns a list of WindowInfo matching the title and process filters."""
+        title = self.title
+        process = self.process
+        known = self._process_names
+        previous = self._hwnd_pids
+        names = {}
+        hwnd_pids = {}
+        result = []
+
+        for info in self.provider.enum_windows():
+            if title not in info.title:
+                continue
+            pid = info.pid
+            if pid in ignored_pids:
+                continue
+            hwnd_pids[info.hwnd] = pid
+
+            name = names.get(pid)
+            if name is None:
+                # um hwnd só pertence a um processo durante a vida dele, então se a
+                # janela já era desse pid o nome em cache continua válido
+                if previous.get(info.hwnd) == pid:
+                    name = known.get(pid)
+                if name is None:
+                    try:
+                        name = self.provider.process_name(pid).lower()
+                    except Exception as e:
+                        self.logger.debug("Erro ao obter processo %s: %s", pid, e)
+                        continue
+                names[pid] = name
+
+            if process in name:
+                result.append(info)
+
+        # só sobrevivem os pids vistos nesta varredura
+        self._process_names = names
+        self._hwnd_pids = hwnd_pids
+
+        return result
+
+    def clear(self):
+        self._process_names = {}
+        self._hwnd_pids = {}
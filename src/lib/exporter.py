@@ -0,0 +1,81 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.lib.metrics import render_prometheus
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """
+    Serves GET /metrics in Prometheus text format from a background thread.
+
+    :param source: callable returning the current Metrics (the application may
+        swap instances when metrics are toggled)
+    :param host: bind address; localhost by default so nothing is exposed to
+        the network unless asked for
+    :param port: TCP port, 0 picks a free one (see `address`)
+    """
+
+    def __init__(self, source, host="127.0.0.1", port=9464, logger=None):
+        self.source = source
+        self.host = host
+        self.port = port
+        self.logger = logger or logging.getLogger(__name__ + ".MetricsServer")
+        self._server = None
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address if self._server else None
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    def start(self):
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        host, port = self.address[:2]
+        self.logger.info(f"Métricas em http://{host}:{port}/metrics")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(2)
+        self._server = None
+        self._thread = None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = render_prometheus(server.source()).encode("utf-8")
+                except Exception as e:
+                    server.logger.warning(f"Erro ao gerar métricas: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                server.logger.debug(format % args)
+
+        return Handler
@@ -0,0 +1,502 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+# Só uma janela pode estar em foreground por vez; quem precisa de foco usa este lock
+FOCUS_LOCK = threading.Lock()
+
+# modos de entrada (setting input_mode)
+FOCUS = "focus"  # ativa cada janela e pressiona a tecla nela
+MESSAGE = "message"  # mensagens direto para a janela, sem ativar (ver messages.py)
+
+
+class WindowTiming(NamedTuple):
+    """Per-window latency breakdown, all values in seconds."""
+
+    pid: int
+    prepare: float  # restore/validação (feito em paralelo com a janela anterior)
+    wait: float  # tempo esperando o preparo ficar pronto
+    lock: float  # tempo esperando o FOCUS_LOCK
+    activate: float
+    settle: float
+    action: float
+    ok: bool
+    # só postada (modo message): a janela aceitou a mensagem, mas não há como
+    # saber se o cliente a processou; não conta como ok
+    posted: bool = False
+
+
+class KeepAliveReport:
+    def __init__(self):
+        self.timings = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.cancelled = False
+        self.settle_timeouts = 0  # janelas que não chegaram ao foreground
+
+    @property
+    def ok(self):
+        return sum(1 for t in self.timings if t.ok)
+
+    @property
+    def posted(self):
+        return sum(1 for t in self.timings if t.posted)
+
+    @property
+    def failed(self):
+        return sum(1 for t in self.timings if not (t.ok or t.posted))
+
+    def __repr__(self):
+        return (
+            f"<KeepAliveReport windows={len(self.timings)} ok={self.ok} "
+            f"posted={self.posted} failed={self.failed} "
+            f"elapsed={self.elapsed * 1000:.1f}ms>"
+        )
+
+
+class KeepAliveBackend:
+    """
+    Window/input access used by KeepAliveScheduler.
+
+    Subclasses must implement:
+        - prepare(window): restore/validate without taking focus, False to skip it
+        - activate(window): bring the window to the foreground
+        - send(key, hold): press the key on the foreground window (hold in ms)
+        - get_foreground() / set_foreground(handle)
+    handle(window) maps a window to the hwnd used by the message input path and
+    by is_foreground().
+    """
+
+    def handle(self, window):
+        return window
+
+    def is_foreground(self, window):
+        return self.get_foreground() == self.handle(window)
+
+    def prepare(self, window):
+        raise NotImplementedError
+
+    def activate(self, window):
+        raise NotImplementedError
+
+    def send(self, key, hold=0):
+        raise NotImplementedError
+
+    def get_foreground(self):
+        raise NotImplementedError
+
+    def set_foreground(self, handle):
+        raise NotImplementedError
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class Win32KeepAliveBackend(KeepAliveBackend):
+    """
+    Backend for pygetwindow windows (Windows only).
+
+    :param send: callable(key, hold) that presses the key, e.g. Application.press
+    """
+
+    def __init__(self, send):
+        self._send = send
+
+    def handle(self, window):
+        return window._hWnd
+
+    def prepare(self, window):
+        import win32con
+        import win32gui
+
+        hwnd = window._hWnd
+        if not win32gui.IsWindow(hwnd):
+            return False
+        if win32gui.IsIconic(hwnd):
+            # restaura sem ativar, para não roubar o foco da janela atual
+            win32gui.ShowWindow(hwnd, win32con.SW_SHOWNOACTIVATE)
+        return True
+
+    def activate(self, window):
+        window.activate()
+
+    def send(self, key, hold=0):
+        self._send(key, hold=hold)
+
+    def get_foreground(self):
+        import win32gui
+
+        return win32gui.GetForegroundWindow()
+
+    def set_foreground(self, handle):
+        import win32gui
+
+        if handle and win32gui.IsWindow(handle):
+            win32gui.SetForegroundWindow(handle)
+
+
+class SimulatedKeepAliveBackend(KeepAliveBackend):
+    """
+    Fake backend for tests and benchmarks; every call just sleeps for its cost.
+
+    Costs are in seconds. `events` records (action, window/key) in call order.
+    """
+
+    def __init__(self, prepare_cost=0.0, activate_cost=0.0, send_cost=0.0):
+        self.prepare_cost = prepare_cost
+        self.activate_cost = activate_cost
+        self.send_cost = send_cost
+        self.foreground = None
+        self.events = []
+        self.invalid = set()
+
+    def prepare(self, window):
+        time.sleep(self.prepare_cost)
+        return window not in self.invalid
+
+    def activate(self, window):
+        time.sleep(self.activate_cost)
+        self.foreground = window
+        self.events.append(("activate", window))
+
+    def send(self, key, hold=0):
+        time.sleep(self.send_cost + hold / 1000)
+        self.events.append(("send", self.foreground))
+
+    def get_foreground(self):
+        return self.foreground
+
+    def set_foreground(self, handle):
+        self.foreground = handle
+        self.events.append(("restore", handle))
+
+
+class FixedSettle:
+    """Legacy settle: always sleeps `settle_ms` after activating."""
+
+    def __init__(self, settle_ms=100, sleep=time.sleep):
+        self.settle_ms = settle_ms
+        self.sleep = sleep
+
+    def wait(self, is_ready):
+        self.sleep(self.settle_ms / 1000)
+        return True
+
+
+class AdaptiveSettle:
+    """
+    Waits until the activated window really is the foreground window.
+
+    Polls `is_ready()` with a doubling backoff (min_poll_ms .. max_poll_ms) up to
+    `ceiling_ms`. Observed settle latencies are kept, and after one immediate
+    check the next one is delayed to 3/4 of a low percentile of the recent ones,
+    so a machine that always needs ~40 ms doesn't spin through a dozen early
+    polls.
+
+    A window that is already ready when that delayed check runs only tells us
+    the latency was somewhere below the delay, so the sample is recorded as half
+    of it: the delay never feeds itself, and when the latency drops it follows
+    it down within a few dozen windows.
+
+    :param clock/sleep: injectable for tests
+    """
+
+    def __init__(
+        self,
+        ceiling_ms=500,
+        min_poll_ms=2,
+        max_poll_ms=25,
+        history=32,
+        clock=time.perf_counter,
+        sleep=time.sleep,
+    ):
+        self.ceiling_ms = ceiling_ms
+        self.min_poll_ms = min_poll_ms
+        self.max_poll_ms = max_poll_ms
+        self.clock = clock
+        self.sleep = sleep
+        self.samples = deque(maxlen=history)  # latências observadas, em segundos
+        self.timeouts = 0
+
+    def initial_delay(self):
+        """Seconds to wait before polling (3/4 of the 25th percentile of the history)."""
+        if len(self.samples) < 4:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[len(ordered) // 4] * 0.75
+
+    def wait(self, is_ready):
+        """Returns True once is_ready() holds, False if the ceiling is reached."""
+        clock, sleep = self.clock, self.sleep
+        ceiling = self.ceiling_ms / 1000
+        start = clock()
+
+        if is_ready():
+            self.samples.append(0.0)
+            return True
+
+        delay = min(self.initial_delay(), ceiling)
+        if delay:
+            sleep(delay)
+            if is_ready():
+                # pronta em algum ponto antes do delay; usa a estimativa do meio
+                self.samples.append(delay / 2)
+                return True
+        poll = self.min_poll_ms / 1000
+        while True:
+            elapsed = clock() - start
+            if elapsed >= ceiling:
+                self.timeouts += 1
+                return False
+            sleep(min(poll, ceiling - elapsed))
+            poll = min(poll * 2, self.max_poll_ms / 1000)
+            if is_ready():
+                self.samples.append(clock() - start)
+                return True
+
+
+class KeepAliveScheduler:
+    """
+    Sends the action key to every window, pipelining the work around the focus lock.
+
+    Only activate -> settle -> keypress runs while holding FOCUS_LOCK; preparing the
+    next window (restore, validity checks) happens on a helper thread while the
+    current one is being serviced and during the delay between windows.
+
+    In MESSAGE mode the key is first fanned out to every window through
+    `message_sender` (a MessageInputSender), without touching the focus; only
+    the windows that refuse it go through the focus path. A posted message
+    only proves the window queued it, not that the client acted on it (one that
+    reads raw input ignores it), so those windows are reported as `posted`,
+    not ok. Windows that refused once stay on the focus path (`focus_only`),
+    and `focus_only_pids` opts windows out of the message path up front.
+    """
+
+    def __init__(
+        self,
+        backend,
+        focus_lock=None,
+        settle_ms=None,
+        message_sender=None,
+        settle=None,
+        logger=None,
+    ):
+        """
+        :param settle_ms: fixed wait after activating (FixedSettle); when neither it
+            nor `settle` is given, an AdaptiveSettle polls for the foreground change
+        :param settle: object with wait(is_ready) -> bool
+        """
+        self.backend = backend
+        self.focus_lock = focus_lock or FOCUS_LOCK
+        if settle is None:
+            if settle_ms is not None:
+                settle = FixedSettle(settle_ms, sleep=backend.sleep)
+            else:
+                settle = AdaptiveSettle(sleep=backend.sleep)
+        self.settle = settle
+        self.message_sender = message_sender
+        self.focus_only = set()  # handles que recusaram mensagens: sempre foco
+        self.logger = logger or logging.getLogger(__name__ + ".KeepAliveScheduler")
+
+    def _prepare(self, window):
+        start = time.perf_counter()
+        try:
+            ok = self.backend.prepare(window)
+        except Exception as e:
+            self.logger.warning(f"Erro ao preparar janela {window}: {e}")
+            ok = False
+        return ok, time.perf_counter() - start
+
+    def _send_messages(self, windows, key, hold, report, focus_only_pids=()):
+        """Message fan-out; returns the (window, pid) pairs left for the focus path."""
+        fallback = []
+        prepared = []
+        for window, pid in windows:
+            if pid in focus_only_pids or self.backend.handle(window) in self.focus_only:
+                fallback.append((window, pid))
+                continue
+            ok, prepare_time = self._prepare(window)
+            if ok:
+                prepared.append((window, pid, prepare_time))
+            else:
+                self.logger.debug("Janela PID %s inválida, ignorando", pid)
+                report.timings.append(
+                    WindowTiming(pid, prepare_time, 0.0, 0.0, 0.0, 0.0, 0.0, False)
+                )
+
+        handles = [self.backend.handle(window) for window, _, _ in prepared]
+        start = time.perf_counter()
+        delivered = self.message_sender.send(handles, key, hold=hold)
+        action_time = time.perf_counter() - start
+
+        for handle, (window, pid, prepare_time) in zip(handles, prepared):
+            if handle in delivered:
+                report.timings.append(
+                    WindowTiming(
+                        pid,
+                        prepare_time,
+                        0.0,
+                        0.0,
+                        0.0,
+                        0.0,
+                        action_time,
+                        False,
+                        posted=True,
+                    )
+                )
+            else:
+                self.logger.debug(
+                    "Mensagem recusada pela janela PID %s, usando foco", pid
+                )
+                self.focus_only.add(handle)
+                fallback.append((window, pid))
+        return fallback
+
+    def run(
+        self,
+        windows,
+        key,
+        hold=0,
+        delay=0,
+        preserve_focus=False,
+        cancel=None,
+        mode=FOCUS,
+        focus_only_pids=frozenset(),
+    ):
+        """
+        :param windows: list of (window, pid) tuples
+        :param key: action key name
+        :param hold: key hold duration in ms
+        :param delay: delay between windows in ms (focus path only)
+        :param preserve_focus: restore the previous foreground window at the end
+        :param cancel: optional threading.Event checked between windows
+        :param mode: FOCUS, or MESSAGE to try the focus-free path first
+        :param focus_only_pids: PIDs that always use the focus path in MESSAGE mode
+        """
+        logger = self.logger
+        backend = self.backend
+        report = KeepAliveReport()
+
+        if mode == MESSAGE and self.message_sender is not None and windows:
+            if cancel is not None and cancel.is_set():
+                report.cancelled = True
+                windows = []
+            else:
+                windows = self._send_messages(
+                    windows, key, hold, report, focus_only_pids
+                )
+            if not windows:
+                report.elapsed = time.perf_counter() - report.started
+                return report
+
+        original_foreground = None
+        if preserve_focus:
+            try:
+                original_foreground = backend.get_foreground()
+            except Exception as e:
+                logger.warning(f"Não foi possível obter janela em foreground: {e}")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._prepare, windows[0][0]) if windows else None
+
+            for i, (window, pid) in enumerate(windows):
+                if cancel is not None and cancel.is_set():
+                    logger.info(f"Keep-alive cancelado antes da janela PID {pid}")
+                    report.cancelled = True
+                    pending.cancel()
+                    break
+
+                t0 = time.perf_counter()
+                prepared, prepare_time = pending.result()
+                t1 = time.perf_counter()
+
+                # já prepara a próxima enquanto esta segura o foco
+                if i + 1 < len(windows):
+                    pending = executor.submit(self._prepare, windows[i + 1][0])
+
+                activate_time = settle_time = action_time = lock_time = 0.0
+                ok = False
+                if prepared:
+                    try:
+                        logger.debug("Ativando janela PID %s", pid)
+                        with self.focus_lock:
+                            t2 = time.perf_counter()
+                            lock_time = t2 - t1
+                            backend.activate(window)
+                            t3 = time.perf_counter()
+                            settled = self.settle.wait(
+                                lambda: backend.is_foreground(window)
+                            )
+                            t4 = time.perf_counter()
+                            if settled:
+                                backend.send(key, hold=hold)
+                            t5 = time.perf_counter()
+                        activate_time, settle_time, action_time = (
+                            t3 - t2,
+                            t4 - t3,
+                            t5 - t4,
+                        )
+                        if settled:
+                            ok = True
+                        else:
+                            # a tecla cairia em outra janela
+                            report.settle_timeouts += 1
+                            logger.warning(
+                                "Janela PID %s não ficou em foreground após %.0f ms",
+                                pid,
+                                settle_time * 1000,
+                            )
+                    except Exception as e:
+                        logger.warning(f"Erro ao manter janela PID {pid} ativa: {e}")
+                else:
+                    logger.debug("Janela PID %s inválida, ignorando", pid)
+
+                timing = WindowTiming(
+                    pid,
+                    prepare_time,
+                    t1 - t0,
+                    lock_time,
+                    activate_time,
+                    settle_time,
+                    action_time,
+                    ok,
+                )
+                report.timings.append(timing)
+                if logger.isEnabledFor(logging.DEBUG):
+                    durations = {
+                        name: round(value * 1000, 3)
+                        for name, value in timing._asdict().items()
+                        if isinstance(value, float)
+                    }
+                    logger.debug(
+                        "Janela PID %s: %s",
+                        pid,
+                        timing,
+                        extra={
+                            "pid": pid,
+                            "hwnd": getattr(window, "_hWnd", None),
+                            "durations": durations,
+                        },
+                    )
+
+                if delay and i < len(windows) - 1:
+                    if cancel is not None:
+                        # espera interrompível: um stop não precisa aguardar o delay
+                        cancel.wait(delay / 1000)
+                    else:
+                        backend.sleep(delay / 1000)
+
+        if original_foreground:
+            try:
+                with self.focus_lock:
+                    backend.set_foreground(original_foreground)
+            except Exception as e:
+                logger.warning(
+                    f"Não foi possível restaurar o foco para a janela original: {e}"
+                )
+
+        report.elapsed = time.perf_counter() - report.started
+        return report
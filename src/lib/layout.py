@@ -0,0 +1,243 @@
+import logging
+import math
+from typing import NamedTuple
+
+
+class Rect(NamedTuple):
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+def split_count(count, areas):
+    """Splits `count` windows across work areas proportionally to their size."""
+    if not areas:
+        return []
+    sizes = [a.width * a.height for a in areas]
+    total = sum(sizes) or 1
+    exact = [count * size / total for size in sizes]
+    shares = [int(e) for e in exact]
+    # maior resto primeiro, para a soma bater com count
+    leftovers = sorted(
+        range(len(areas)), key=lambda i: exact[i] - shares[i], reverse=True
+    )
+    for i in leftovers[: count - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def grid_shape(count, area, cell, gap):
+    """
+    Returns (cols, rows, step_x, step_y) for `count` cells inside `area`.
+
+    Cells never overlap while they fit; past that the steps shrink so the whole
+    grid still stays inside the area (cells cascade over each other).
+    """
+    cell_w, cell_h = cell
+    gap_x, gap_y = gap
+    fit_cols = max(1, (area.width + gap_x) // (cell_w + gap_x))
+    fit_rows = max(1, (area.height + gap_y) // (cell_h + gap_y))
+
+    if count <= fit_cols * fit_rows:
+        cols = min(count, fit_cols)
+    else:
+        # mantém a proporção da área ao distribuir as colunas
+        ratio = (area.width / cell_w) / (area.height / cell_h)
+        cols = min(count, max(1, math.ceil(math.sqrt(count * ratio))))
+    rows = math.ceil(count / cols) if cols else 0
+
+    step_x = cell_w + gap_x
+    if cols > 1:
+        step_x = min(step_x, (area.width - cell_w) / (cols - 1))
+    step_y = cell_h + gap_y
+    if rows > 1:
+        step_y = min(step_y, (area.height - cell_h) / (rows - 1))
+    return cols, rows, step_x, step_y
+
+
+def compute_grid(count, work_areas, cell=(800, 600), gap=(10, 10)):
+    """
+    Computes the target rect of every window up front.
+
+    :param count: number of windows
+    :param work_areas: list of Rect, one per monitor (primary first)
+    :param cell: (width, height) of each window, clamped to the monitor
+    :param gap: (x, y) spacing between neighbouring windows
+    :return: list of Rect, in window order
+    """
+    layout = []
+    for area, share in zip(work_areas, split_count(count, work_areas)):
+        if not share:
+            continue
+        size = (min(cell[0], area.width), min(cell[1], area.height))
+        cols, _, step_x, step_y = grid_shape(share, area, size, gap)
+        layout += [
+            Rect(
+                area.x + round((i % cols) * step_x),
+                area.y + round((i // cols) * step_y),
+                size[0],
+                size[1],
+            )
+            for i in range(share)
+        ]
+    return layout
+
+
+class LayoutBackend:
+    """
+    Window geometry access used by WindowTiler.
+
+    Subclasses must implement:
+        - work_areas(): list of Rect, one per monitor (primary first)
+        - get_rects(hwnds): dict hwnd -> current Rect (None if minimized/gone)
+        - apply(moves): moves every (hwnd, Rect) in one transaction
+    """
+
+    def work_areas(self):
+        raise NotImplementedError
+
+    def get_rects(self, hwnds):
+        raise NotImplementedError
+
+    def apply(self, moves):
+        raise NotImplementedError
+
+
+class Win32LayoutBackend(LayoutBackend):
+    """Batched moves through BeginDeferWindowPos/EndDeferWindowPos (Windows only)."""
+
+    SWP_NOZORDER = 0x0004
+    SWP_NOACTIVATE = 0x0010
+    SWP_NOOWNERZORDER = 0x0200
+    SW_SHOWNOACTIVATE = 4
+    MONITORINFOF_PRIMARY = 1
+
+    def __init__(self):
+        self._user32 = None
+
+    def _load_user32(self):
+        # WinDLL própria: os protótipos não vazam para ctypes.windll.user32, que
+        # é compartilhado com o resto do processo
+        if self._user32 is None:
+            import ctypes
+            from ctypes import wintypes
+
+            user32 = ctypes.WinDLL("user32")
+            handle, c_int = ctypes.c_void_p, ctypes.c_int
+            pos_args = [handle, handle, c_int, c_int, c_int, c_int, ctypes.c_uint]
+            user32.BeginDeferWindowPos.argtypes = [c_int]
+            user32.BeginDeferWindowPos.restype = handle
+            user32.DeferWindowPos.argtypes = [handle] + pos_args
+            user32.DeferWindowPos.restype = handle
+            user32.EndDeferWindowPos.argtypes = [handle]
+            user32.EndDeferWindowPos.restype = wintypes.BOOL
+            user32.SetWindowPos.argtypes = pos_args
+            user32.SetWindowPos.restype = wintypes.BOOL
+            self._user32 = user32
+        return self._user32
+
+    def work_areas(self):
+        import win32api
+
+        areas = []
+        for hmonitor, _, _ in win32api.EnumDisplayMonitors():
+            info = win32api.GetMonitorInfo(hmonitor)
+            left, top, right, bottom = info["Work"]
+            primary = bool(info["Flags"] & self.MONITORINFOF_PRIMARY)
+            areas.append((not primary, Rect(left, top, right - left, bottom - top)))
+        return [area for _, area in sorted(areas)]
+
+    def get_rects(self, hwnds):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = self._load_user32()
+        rect = wintypes.RECT()
+        rects = {}
+        for hwnd in hwnds:
+            if user32.IsIconic(hwnd) or not user32.GetWindowRect(
+                hwnd, ctypes.byref(rect)
+            ):
+                rects[hwnd] = None
+                continue
+            rects[hwnd] = Rect(
+                rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top
+            )
+        return rects
+
+    def apply(self, moves):
+        user32 = self._load_user32()
+        flags = self.SWP_NOZORDER | self.SWP_NOACTIVATE | self.SWP_NOOWNERZORDER
+
+        for hwnd, _ in moves:
+            if user32.IsIconic(hwnd):
+                # minimizada não aceita posição; restaura sem ativar
+                user32.ShowWindow(hwnd, self.SW_SHOWNOACTIVATE)
+
+        hdwp = user32.BeginDeferWindowPos(len(moves))
+        for hwnd, r in moves:
+            if hdwp:
+                hdwp = user32.DeferWindowPos(
+                    hdwp, hwnd, None, r.x, r.y, r.width, r.height, flags
+                )
+        if hdwp and user32.EndDeferWindowPos(hdwp):
+            return
+
+        # alguma janela recusou o lote (ex: processo elevado); move uma a uma
+        for hwnd, r in moves:
+            user32.SetWindowPos(hwnd, None, r.x, r.y, r.width, r.height, flags)
+
+
+class TileResult(NamedTuple):
+    moves: list  # (hwnd, Rect) realmente aplicados
+    skipped: int  # janelas que já estavam no lugar
+
+
+class WindowTiler:
+    """
+    Lays out windows in a grid and moves them all in one batch.
+
+    The last applied layout is kept by hwnd. Windows whose target did not change
+    have their current rect read back in bulk and are only moved if they drifted
+    away from it, so steady-state ticks issue no moves at all.
+    """
+
+    def __init__(self, backend, tolerance=0, logger=None):
+        self.backend = backend
+        self.tolerance = tolerance
+        self.logger = logger or logging.getLogger(__name__ + ".WindowTiler")
+        self._last_layout = {}  # hwnd: Rect aplicado no último tile()
+
+    def _deviates(self, current, target):
+        if current is None:
+            return True
+        tolerance = self.tolerance
+        return any(abs(a - b) > tolerance for a, b in zip(current, target))
+
+    def tile(self, hwnds, cell=(800, 600), gap=(10, 10)):
+        layout = compute_grid(len(hwnds), self.backend.work_areas(), cell, gap)
+        targets = dict(zip(hwnds, layout))
+        last = self._last_layout
+
+        # só vale conferir a posição atual de quem não mudou de alvo
+        unchanged = [hwnd for hwnd, rect in targets.items() if last.get(hwnd) == rect]
+        current = self.backend.get_rects(unchanged) if unchanged else {}
+
+        moves = [
+            (hwnd, rect)
+            for hwnd, rect in targets.items()
+            if hwnd not in current or self._deviates(current[hwnd], rect)
+        ]
+        if moves:
+            self.backend.apply(moves)
+        self._last_layout = targets
+
+        result = TileResult(moves, len(targets) - len(moves))
+        self.logger.debug(
+            "%d janelas movidas, %d já estavam no lugar", len(moves), result.skipped
+        )
+        return result
+
+    def reset(self):
+        self._last_layout = {}
@@ -0,0 +1,275 @@
+import time
+from functools import lru_cache
+from typing import NamedTuple
+
+from src.lib.messages import virtual_key
+
+KEY_DOWN = "down"
+KEY_UP = "up"
+MOUSE_MOVE = "move"
+
+
+class MacroError(ValueError):
+    pass
+
+
+class InputEvent(NamedTuple):
+    kind: str  # KEY_DOWN, KEY_UP ou MOUSE_MOVE
+    a: int  # virtual-key, ou dx
+    b: int = 0  # dy
+
+
+class Macro(NamedTuple):
+    """
+    Compiled action: batches of input events with their offset from the start.
+
+    steps: tuple of (offset_seconds, batch), batch being a tuple of InputEvent
+    sent in one call.
+    """
+
+    source: str
+    steps: tuple
+    duration: float  # segundos, do início ao último lote
+
+    @property
+    def event_count(self):
+        return sum(len(batch) for _, batch in self.steps)
+
+
+def _number(token, text):
+    try:
+        return int(text)
+    except ValueError:
+        raise MacroError(f"Número inválido em {token!r}") from None
+
+
+def compile_macro(source):
+    """
+    Parses and validates an action macro once into a Macro.
+
+    Space separated tokens:
+        space        tap a key (down + up)
+        w:300        hold a key for 300 ms
+        wait:50      pause 50 ms
+        move:40,0    relative mouse move (dx,dy pixels)
+    Camera turns are key holds (left:150 / right:150) or mouse moves. Events
+    with no pause between them end up in the same batch.
+
+    Results are cached per source, invalid ones too (raises MacroError again
+    without re-parsing).
+
+    Raises MacroError on unknown keys, malformed tokens or non-positive holds.
+    """
+    result = _compile(source)
+    if isinstance(result, MacroError):
+        raise MacroError(str(result))
+    return result
+
+
+@lru_cache(maxsize=32)
+def _compile(source):
+    # lru_cache não guarda exceções; o erro volta como valor
+    try:
+        return _parse(source)
+    except MacroError as e:
+        return e
+
+
+def _parse(source):
+    tokens = source.split()
+    if not tokens:
+        raise MacroError("Macro vazia")
+
+    steps = []
+    batch = []
+    offset = 0.0
+
+    def flush():
+        if batch:
+            steps.append((offset, tuple(batch)))
+            batch.clear()
+
+    for token in tokens:
+        name, sep, arg = token.lower().partition(":")
+        if name == "wait":
+            ms = _number(token, arg)
+            if ms < 0:
+                raise MacroError(f"Espera negativa em {token!r}")
+            flush()
+            offset += ms / 1000
+        elif name == "move":
+            dx, sep, dy = arg.partition(",")
+            if not sep:
+                raise MacroError(f"Use move:dx,dy em {token!r}")
+            batch.append(InputEvent(MOUSE_MOVE, _number(token, dx), _number(token, dy)))
+        else:
+            try:
+                vk = virtual_key(name)
+            except KeyError as e:
+                raise MacroError(str(e)) from None
+            hold = 0
+            if sep:
+                hold = _number(token, arg)
+                if hold <= 0:
+                    raise MacroError(f"Duração precisa ser positiva em {token!r}")
+            batch.append(InputEvent(KEY_DOWN, vk))
+            if hold:
+                flush()
+                offset += hold / 1000
+            batch.append(InputEvent(KEY_UP, vk))
+    flush()
+    return Macro(source, tuple(steps), offset)
+
+
+class InputBackend:
+    """
+    Synthesized input.
+
+    Subclasses must implement:
+        - send_batch(batch): inject every InputEvent of the batch in one call
+    """
+
+    def send_batch(self, batch):
+        raise NotImplementedError
+
+
+class Win32InputBackend(InputBackend):
+    """
+    SendInput with hardware scan codes (Windows only).
+
+    The ctypes INPUT array of each batch is built on first use and reused, so a
+    replay is one SendInput call per batch and nothing else.
+    """
+
+    INPUT_MOUSE = 0
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_EXTENDEDKEY = 0x0001
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_SCANCODE = 0x0008
+    MOUSEEVENTF_MOVE = 0x0001
+    # setas, delete etc. precisam do prefixo E0
+    EXTENDED_KEYS = {0x25, 0x26, 0x27, 0x28, 0x2D, 0x2E, 0x21, 0x22, 0x23, 0x24}
+
+    def __init__(self):
+        self._compiled = {}  # batch: (array ctypes, tamanho)
+        self._types = None
+
+    def _ctypes(self):
+        if self._types is None:
+            import ctypes
+            from ctypes import wintypes
+
+            ULONG_PTR = ctypes.c_size_t
+
+            class KEYBDINPUT(ctypes.Structure):
+                _fields_ = [
+                    ("wVk", wintypes.WORD),
+                    ("wScan", wintypes.WORD),
+                    ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", ULONG_PTR),
+                ]
+
+            class MOUSEINPUT(ctypes.Structure):
+                _fields_ = [
+                    ("dx", wintypes.LONG),
+                    ("dy", wintypes.LONG),
+                    ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", ULONG_PTR),
+                ]
+
+            class HARDWAREINPUT(ctypes.Structure):
+                _fields_ = [
+                    ("uMsg", wintypes.DWORD),
+                    ("wParamL", wintypes.WORD),
+                    ("wParamH", wintypes.WORD),
+                ]
+
+            class _INPUTUNION(ctypes.Union):
+                _fields_ = [
+                    ("mi", MOUSEINPUT),
+                    ("ki", KEYBDINPUT),
+                    ("hi", HARDWAREINPUT),
+                ]
+
+            class INPUT(ctypes.Structure):
+                _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+            user32 = ctypes.windll.user32
+            self._types = (ctypes, user32, INPUT)
+        return self._types
+
+    def _compile(self, batch):
+        ctypes, user32, INPUT = self._ctypes()
+        array = (INPUT * len(batch))()
+        for item, event in zip(array, batch):
+            if event.kind == MOUSE_MOVE:
+                item.type = self.INPUT_MOUSE
+                item.u.mi.dx, item.u.mi.dy = event.a, event.b
+                item.u.mi.dwFlags = self.MOUSEEVENTF_MOVE
+                continue
+            flags = self.KEYEVENTF_SCANCODE
+            if event.a in self.EXTENDED_KEYS:
+                flags |= self.KEYEVENTF_EXTENDEDKEY
+            if event.kind == KEY_UP:
+                flags |= self.KEYEVENTF_KEYUP
+            item.type = self.INPUT_KEYBOARD
+            item.u.ki.wScan = user32.MapVirtualKeyW(event.a, 0)  # MAPVK_VK_TO_VSC
+            item.u.ki.dwFlags = flags
+        return array, len(batch)
+
+    def send_batch(self, batch):
+        compiled = self._compiled.get(batch)
+        if compiled is None:
+            compiled = self._compiled[batch] = self._compile(batch)
+        ctypes, user32, INPUT = self._ctypes()
+        array, count = compiled
+        sent = user32.SendInput(count, array, ctypes.sizeof(INPUT))
+        if sent != count:
+            raise OSError(f"SendInput injetou {sent} de {count} eventos")
+
+
+class RecordingInputBackend(InputBackend):
+    """Keeps every batch sent, with its clock time, for tests and benchmarks."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.batches = []  # (clock, batch)
+
+    def send_batch(self, batch):
+        self.batches.append((self.clock(), batch))
+
+
+class MacroPlayer:
+    """
+    Replays a Macro against an InputBackend.
+
+    Each batch is sent at start + offset: waits are measured from the start of
+    the macro, so sleep overshoot doesn't accumulate, and the last `spin`
+    seconds of each wait are busy-waited for precise timing.
+    """
+
+    def __init__(self, backend, clock=time.perf_counter, sleep=time.sleep, spin=0.0015):
+        self.backend = backend
+        self.clock = clock
+        self.sleep = sleep
+        self.spin = spin
+
+    def _wait_until(self, deadline):
+        clock, spin = self.clock, self.spin
+        while True:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                return
+            if remaining > spin:
+                self.sleep(remaining - spin)
+
+    def play(self, macro):
+        send_batch = self.backend.send_batch
+        start = self.clock()
+        for offset, batch in macro.steps:
+            if offset:
+                self._wait_until(start + offset)
+            send_batch(batch)
@@ -0,0 +1,124 @@
+import time
+
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+
+# nomes de tecla (como no config) -> virtual-key code
+VIRTUAL_KEYS = {
+    "space": 0x20,
+    "enter": 0x0D,
+    "tab": 0x09,
+    "esc": 0x1B,
+    "escape": 0x1B,
+    "backspace": 0x08,
+    "delete": 0x2E,
+    "shift": 0x10,
+    "ctrl": 0x11,
+    "alt": 0x12,
+    "left": 0x25,
+    "up": 0x26,
+    "right": 0x27,
+    "down": 0x28,
+    **{f"f{i}": 0x6F + i for i in range(1, 13)},
+}
+
+
+def virtual_key(key):
+    """Virtual-key code for a key name; letters and digits map to themselves."""
+    key = key.lower()
+    if key in VIRTUAL_KEYS:
+        return VIRTUAL_KEYS[key]
+    if len(key) == 1 and key.isalnum():
+        return ord(key.upper())
+    raise KeyError(f"Tecla sem virtual-key conhecido: {key!r}")
+
+
+class MessageSink:
+    """
+    Delivers window messages.
+
+    Subclasses must implement:
+        - post(hwnd, msg, wparam, lparam): queue the message, False if refused
+        - scan_code(vk): hardware scan code for the lParam (0 if unknown)
+    """
+
+    def post(self, hwnd, msg, wparam, lparam):
+        raise NotImplementedError
+
+    def scan_code(self, vk):
+        return 0
+
+
+class Win32MessageSink(MessageSink):
+    """PostMessageW straight into the target's queue (Windows only)."""
+
+    def post(self, hwnd, msg, wparam, lparam):
+        import ctypes
+
+        return bool(ctypes.windll.user32.PostMessageW(hwnd, msg, wparam, lparam))
+
+    def scan_code(self, vk):
+        import ctypes
+
+        return ctypes.windll.user32.MapVirtualKeyW(vk, 0)  # MAPVK_VK_TO_VSC
+
+
+class FakeMessageSink(MessageSink):
+    """
+    Records messages instead of delivering them, for tests.
+
+    `messages` holds (hwnd, msg, wparam, lparam) in post order; hwnds in
+    `refused` make post() return False, like a window that is gone or hung.
+    """
+
+    def __init__(self, refused=()):
+        self.messages = []
+        self.refused = set(refused)
+
+    def post(self, hwnd, msg, wparam, lparam):
+        if hwnd in self.refused:
+            return False
+        self.messages.append((hwnd, msg, wparam, lparam))
+        return True
+
+
+class MessageInputSender:
+    """
+    Presses a key in many windows at once, without activating any of them.
+
+    Key-down is posted to every window, then one shared hold, then key-up to
+    every window: the whole fan-out costs a single hold instead of
+    activate + settle + hold per window. Returns the hwnds that accepted both
+    messages; the caller falls back to the focus path for the others.
+    """
+
+    def __init__(self, sink, sleep=time.sleep):
+        self.sink = sink
+        self.sleep = sleep
+
+    def _post(self, hwnd, msg, vk, lparam):
+        try:
+            return self.sink.post(hwnd, msg, vk, lparam)
+        except Exception:
+            return False
+
+    def send(self, hwnds, key, hold=0):
+        """
+        :param hwnds: target window handles
+        :param key: key name (see VIRTUAL_KEYS)
+        :param hold: key hold duration in ms, shared by all windows
+        :return: set of hwnds that took the keypress
+        """
+        try:
+            vk = virtual_key(key)
+        except KeyError:
+            return set()
+
+        scan = self.sink.scan_code(vk) & 0xFF
+        down = 1 | (scan << 16)  # repeat count 1
+        up = down | 0xC0000000  # previous state + transition (key up)
+
+        pressed = [h for h in hwnds if self._post(h, WM_KEYDOWN, vk, down)]
+        if pressed and hold > 0:
+            self.sleep(hold / 1000)
+        return {h for h in pressed if self._post(h, WM_KEYUP, vk, up)}
@@ -0,0 +1,249 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# limites superiores em segundos; o que passar do último cai no bucket +Inf
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Counter:
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Gauge:
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram.
+
+    count/sum/bucket counts are cumulative since creation (what an exporter
+    wants). Percentiles come from a rolling window of the last `window`
+    observations, so they follow the recent behaviour instead of the whole
+    session; they are interpolated inside the matching bucket.
+    """
+
+    def __init__(self, name, help="", buckets=DEFAULT_BUCKETS, window=1024):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # último = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._recent = deque(maxlen=window)  # (índice do bucket, valor)
+        self._recent_counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+            recent = self._recent
+            if len(recent) == recent.maxlen:
+                self._recent_counts[recent[0][0]] -= 1
+            recent.append((i, value))
+            self._recent_counts[i] += 1
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100) of the recent window, or None."""
+        with self._lock:
+            total = len(self._recent)
+            if not total:
+                return None
+            counts = list(self._recent_counts)
+            top = max(value for _, value in self._recent) if counts[-1] else None
+
+        rank = q / 100 * total
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else top
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return top
+
+    def totals(self):
+        """Consistent (bucket counts, count, sum) snapshot of the cumulative totals."""
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class Metrics:
+    """
+    In-process registry of counters, gauges and histograms.
+
+    Metrics are created on first use by name, e.g.:
+        metrics.counter("cycles_total").inc()
+        with metrics.timer("run_seconds"):
+            ...
+    """
+
+    enabled = True
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self._metrics = {}  # nome: Counter/Gauge/Histogram
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, **kwargs)
+        if not isinstance(metric, cls):
+            raise TypeError(f"Metric '{name}' is a {type(metric).__name__}")
+        return metric
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help=help)
+
+    def gauge(self, name, help=""):
+        return self._get(Gauge, name, help=help)
+
+    def histogram(self, name, help="", buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help=help, buckets=buckets)
+
+    @contextmanager
+    def timer(self, name):
+        """Observes the duration of the block (in seconds) into histogram `name`."""
+        histogram = self.histogram(name)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            histogram.observe(self.clock() - start)
+
+    def collect(self):
+        """Returns every metric, sorted by name."""
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def snapshot(self):
+        """Plain dict view: counters/gauges -> value, histograms -> summary()."""
+        result = {}
+        for metric in self.collect():
+            if isinstance(metric, Histogram):
+                result[metric.name] = metric.summary()
+            else:
+                result[metric.name] = metric.value
+        return result
+
+
+class _NullMetric:
+    value = 0
+    count = 0
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+    def percentile(self, q):
+        return None
+
+
+class NullMetrics:
+    """Same API as Metrics, but every call is a no-op (metrics disabled)."""
+
+    enabled = False
+    _metric = _NullMetric()
+    _timer = nullcontext()
+
+    def counter(self, name, help=""):
+        return self._metric
+
+    def gauge(self, name, help=""):
+        return self._metric
+
+    def histogram(self, name, help="", buckets=DEFAULT_BUCKETS):
+        return self._metric
+
+    def timer(self, name):
+        return self._timer
+
+    def collect(self):
+        return []
+
+    def snapshot(self):
+        return {}
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(metrics, prefix="rowin_"):
+    """Renders every metric in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in metrics.collect():
+        name = prefix + metric.name
+        if metric.help:
+            lines.append(f"# HELP {name} {metric.help}")
+        if isinstance(metric, Histogram):
+            lines.append(f"# TYPE {name} histogram")
+            counts, count, total = metric.totals()
+            # buckets do formato são cumulativos
+            cumulative = 0
+            bounds = metric.buckets + (float("inf"),)
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                lines.append(
+                    f'{name}_bucket{{le="{_format_value(bound)}"}} {cumulative}'
+                )
+            lines.append(f"{name}_sum {_format_value(total)}")
+            lines.append(f"{name}_count {count}")
+        else:
+            kind = "counter" if isinstance(metric, Counter) else "gauge"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_format_value(metric.value)}")
+    return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,378 @@
+import logging
+import sys
+import threading
+from typing import NamedTuple
+
+from src.lib.discovery import WindowInfo
+
+CREATE = "create"
+DESTROY = "destroy"
+FOREGROUND = "foreground"
+NAMECHANGE = "namechange"
+
+
+class WindowEvent(NamedTuple):
+    kind: str
+    hwnd: int
+    title: str = None
+    pid: int = None
+
+
+class WindowRegistry:
+    """
+    Live in-memory index of the visible top-level windows.
+
+    Kept up to date by a window source (WinEventHookSource or PollingWindowSource)
+    through apply(); readers never touch the OS. Windows matching the title and
+    process filters are indexed separately so targets() is just a copy. Process
+    names are memoized per pid while at least one of its windows is alive, and
+    looked up before taking the lock so readers never wait on the OS.
+    """
+
+    def __init__(self, provider, title="Roblox", process="roblox", logger=None):
+        self.provider = provider
+        self.title = title
+        self.process = process.lower()
+        self.logger = logger or logging.getLogger(__name__ + ".WindowRegistry")
+        self._lock = threading.Lock()
+        self._windows = {}  # hwnd: WindowInfo
+        self._targets = {}  # hwnd: WindowInfo (subconjunto de _windows)
+        self._foreground = None
+        self._process_names = {}  # pid: nome do executável
+        self._pid_refs = {}  # pid: quantidade de janelas vivas
+        self.ready = False
+
+    # --- leitura (O(1) em relação ao sistema, nada é consultado no SO)
+
+    def targets(self):
+        with self._lock:
+            return list(self._targets.values())
+
+    def windows(self):
+        with self._lock:
+            return list(self._windows.values())
+
+    def foreground(self):
+        """Returns the WindowInfo of the foreground window, or None."""
+        return self._foreground
+
+    def __len__(self):
+        return len(self._windows)
+
+    # --- escrita
+
+    def reset(self, windows, foreground=None):
+        """Replaces the whole index, e.g. with a fresh enumeration when a source starts."""
+        windows = list(windows)
+        names = self._resolve(windows, cached=False)
+        with self._lock:
+            self._windows = {}
+            self._targets = {}
+            self._pid_refs = {}
+            self._process_names = {}
+            for info in windows:
+                self._add(info, names)
+            self._set_foreground(foreground)
+            self.ready = True
+
+    def apply(self, event):
+        info = names = None
+        if (event.kind == CREATE or event.kind == NAMECHANGE) and event.title:
+            info = WindowInfo(event.hwnd, event.title, event.pid)
+            names = self._resolve([info])
+        with self._lock:
+            if event.kind == CREATE or event.kind == NAMECHANGE:
+                self._remove(event.hwnd)
+                if info is not None:
+                    self._add(info, names)
+            elif event.kind == DESTROY:
+                self._remove(event.hwnd)
+                if self._foreground and self._foreground.hwnd == event.hwnd:
+                    self._foreground = None
+            elif event.kind == FOREGROUND:
+                self._set_foreground(event.hwnd, event.title, event.pid)
+
+    def apply_all(self, events):
+        for event in events:
+            self.apply(event)
+
+    def _set_foreground(self, hwnd, title=None, pid=None):
+        if not hwnd:
+            self._foreground = None
+            return
+        info = self._windows.get(hwnd)
+        if info is None and title is not None:
+            info = WindowInfo(hwnd, title, pid)
+        self._foreground = info
+
+    def _resolve(self, windows, cached=True):
+        # consulta o SO fora de _lock; pids que falharam ficam de fora
+        names = {}
+        for info in windows:
+            if self.title not in info.title or info.pid in names:
+                continue
+            name = self._process_names.get(info.pid) if cached else None
+            if name is None:
+                try:
+                    name = self.provider.process_name(info.pid).lower()
+                except Exception as e:
+                    self.logger.debug("Erro ao obter processo %s: %s", info.pid, e)
+                    continue
+            names[info.pid] = name
+        return names
+
+    def _add(self, info, names):
+        self._windows[info.hwnd] = info
+        self._pid_refs[info.pid] = self._pid_refs.get(info.pid, 0) + 1
+        if self._is_target(info, names):
+            self._targets[info.hwnd] = info
+        if self._foreground and self._foreground.hwnd == info.hwnd:
+            self._foreground = info
+
+    def _remove(self, hwnd):
+        info = self._windows.pop(hwnd, None)
+        if info is None:
+            return
+        self._targets.pop(hwnd, None)
+        refs = self._pid_refs[info.pid] - 1
+        if refs:
+            self._pid_refs[info.pid] = refs
+        else:
+            # última janela do processo: o pid pode ser reciclado
+            del self._pid_refs[info.pid]
+            self._process_names.pop(info.pid, None)
+
+    def _is_target(self, info, names):
+        if self.title not in info.title:
+            return False
+        name = names.get(info.pid)
+        if name is None:
+            return False
+        self._process_names[info.pid] = name
+        return self.process in name
+
+
+class PollingWindowSource:
+    """
+    Fallback source: enumerates windows periodically and feeds the differences
+    to the registry as events.
+    """
+
+    def __init__(self, registry, provider, interval=1.0, logger=None):
+        self.registry = registry
+        self.provider = provider
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__ + ".PollingWindowSource")
+        self._snapshot = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """Runs one diff pass and returns the events applied."""
+        current = {info.hwnd: info for info in self.provider.enum_windows()}
+        foreground = self.provider.foreground_window()
+        previous = self._snapshot
+        events = []
+
+        for hwnd in previous.keys() - current.keys():
+            events.append(WindowEvent(DESTROY, hwnd))
+        for hwnd, info in current.items():
+            old = previous.get(hwnd)
+            if old is None:
+                events.append(WindowEvent(CREATE, hwnd, info.title, info.pid))
+            elif old.title != info.title:
+                events.append(WindowEvent(NAMECHANGE, hwnd, info.title, info.pid))
+
+        old_foreground = self.registry.foreground()
+        if foreground != (old_foreground.hwnd if old_foreground else None):
+            events.append(WindowEvent(FOREGROUND, foreground))
+
+        self._snapshot = current
+        if not self.registry.ready:
+            self.registry.reset(current.values(), foreground)
+        else:
+            self.registry.apply_all(events)
+        return events
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="window-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval * 2)
+            self._thread = None
+
+    def _loop(self):
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.warning(f"Erro ao atualizar janelas: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+
+class WinEventHookSource:
+    """
+    Windows source: SetWinEventHook callbacks (create/destroy/show/hide, foreground
+    and name changes) translated into registry events on a dedicated message-loop
+    thread. The registry is seeded with one full enumeration when it starts. If the
+    hooks can't be installed it falls back to a PollingWindowSource.
+    """
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_HIDE = 0x8003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    GA_ROOT = 2
+    WM_QUIT = 0x0012
+
+    def __init__(self, registry, provider, interval=1.0, logger=None):
+        self.registry = registry
+        self.provider = provider
+        self.interval = interval  # usado só pelo polling de reserva
+        self.logger = logger or logging.getLogger(__name__ + ".WinEventHookSource")
+        self._thread = None
+        self._thread_id = None
+        self._fallback = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._loop, name="window-events", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread_id is not None:
+            import ctypes
+
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        if self._fallback is not None:
+            self._fallback.stop()
+            self._fallback = None
+
+    def _fall_back(self, reason):
+        self.logger.warning(f"{reason}; usando polling de janelas")
+        self._fallback = PollingWindowSource(
+            self.registry, self.provider, interval=self.interval, logger=self.logger
+        )
+        self._fallback.start()
+
+    def _describe(self, hwnd):
+        import win32gui
+        import win32process
+
+        if not win32gui.IsWindowVisible(hwnd):
+            return None
+        title = win32gui.GetWindowText(hwnd)
+        if not title:
+            return None
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        return WindowInfo(hwnd, title, pid)
+
+    def _on_event(self, event, hwnd):
+        if event in (self.EVENT_OBJECT_DESTROY, self.EVENT_OBJECT_HIDE):
+            self.registry.apply(WindowEvent(DESTROY, hwnd))
+            return
+
+        info = self._describe(hwnd)
+        if event == self.EVENT_SYSTEM_FOREGROUND:
+            if info is None:
+                self.registry.apply(WindowEvent(FOREGROUND, hwnd))
+            else:
+                self.registry.apply(WindowEvent(FOREGROUND, hwnd, info.title, info.pid))
+        elif info is None:
+            self.registry.apply(WindowEvent(DESTROY, hwnd))
+        elif event == self.EVENT_OBJECT_NAMECHANGE:
+            self.registry.apply(WindowEvent(NAMECHANGE, hwnd, info.title, info.pid))
+        else:
+            self.registry.apply(WindowEvent(CREATE, hwnd, info.title, info.pid))
+
+    def _loop(self):
+        import ctypes
+        from ctypes import wintypes
+
+        # WinDLL própria: os protótipos não vazam para ctypes.windll.user32
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        kernel32 = ctypes.windll.kernel32
+        user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
+        user32.GetAncestor.restype = wintypes.HWND
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None,
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.HWND,
+            wintypes.LONG,
+            wintypes.LONG,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        )
+
+        def callback(hook, event, hwnd, id_object, id_child, thread, time_ms):
+            # só interessam as próprias janelas top-level, não objetos filhos
+            if not hwnd or id_object != self.OBJID_WINDOW or id_child != 0:
+                return
+            if user32.GetAncestor(hwnd, self.GA_ROOT) != hwnd:
+                if event not in (self.EVENT_OBJECT_DESTROY, self.EVENT_OBJECT_HIDE):
+                    return
+            try:
+                self._on_event(event, hwnd)
+            except Exception as e:
+                self.logger.debug(f"Erro ao processar evento {event:#x}: {e}")
+
+        self._proc = WinEventProc(callback)  # precisa de referência viva
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        ranges = [
+            (self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND),
+            (self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_HIDE),
+            (self.EVENT_OBJECT_NAMECHANGE, self.EVENT_OBJECT_NAMECHANGE),
+        ]
+        hooks = [
+            user32.SetWinEventHook(low, high, 0, self._proc, 0, 0, flags)
+            for low, high in ranges
+        ]
+        if not all(hooks):
+            # sem hooks o registro nunca seria atualizado; não marca como pronto
+            error = ctypes.get_last_error()
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+            self._fall_back(f"SetWinEventHook falhou (erro {error})")
+            return
+
+        self._thread_id = kernel32.GetCurrentThreadId()
+        self.registry.reset(
+            self.provider.enum_windows(), self.provider.foreground_window()
+        )
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        for hook in hooks:
+            if hook:
+                user32.UnhookWinEvent(hook)
+        self._thread_id = None
+
+
+def create_window_source(registry, provider, interval=1.0, logger=None):
+    """WinEvent hooks on Windows, diff-based polling everywhere else."""
+    if sys.platform == "win32":
+        return WinEventHookSource(registry, provider, interval=interval, logger=logger)
+    return PollingWindowSource(registry, provider, interval=interval, logger=logger)
@@ -0,0 +1,100 @@
+import logging
+import queue
+import threading
+from typing import Any, NamedTuple
+
+
+class TaskResult(NamedTuple):
+    task_id: int
+    value: Any = None
+    error: BaseException = None
+    cancelled: bool = False
+
+
+class TaskWorker:
+    """
+    Runs tasks one at a time on a dedicated daemon thread.
+
+    Commands go through a thread-safe queue and results come back through another
+    one, which the UI drains with poll() (e.g. from a root.after loop), so nothing
+    here ever touches Tk. Each task receives a `cancel` keyword argument (a
+    threading.Event) that is set by cancel(); long tasks should check it between
+    units of work and return early.
+    """
+
+    def __init__(self, name="worker", logger=None):
+        self.name = name
+        self.logger = logger or logging.getLogger(__name__ + ".TaskWorker")
+        self._commands = queue.Queue()
+        self._results = queue.Queue()
+        self._outstanding = {}  # task_id: cancel event (na fila ou rodando)
+        self._thread = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Cancels the current task and waits for the thread to exit."""
+        self.cancel()
+        self._commands.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, fn, *args, **kwargs):
+        """Queues fn(*args, cancel=<Event>, **kwargs) and returns its task id."""
+        cancel = threading.Event()
+        with self._lock:
+            self._next_id += 1
+            task_id = self._next_id
+            self._outstanding[task_id] = cancel
+        self._commands.put((task_id, fn, args, kwargs, cancel))
+        return task_id
+
+    def cancel(self):
+        """Asks the running task to stop; tasks still queued are skipped."""
+        with self._lock:
+            for cancel in self._outstanding.values():
+                cancel.set()
+
+    @property
+    def busy(self):
+        return bool(self._outstanding)
+
+    def poll(self):
+        """Returns every result available right now, without blocking."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def _finish(self, result):
+        with self._lock:
+            self._outstanding.pop(result.task_id, None)
+        self._results.put(result)
+
+    def _loop(self):
+        while True:
+            command = self._commands.get()
+            if command is None:
+                return
+
+            task_id, fn, args, kwargs, cancel = command
+            if cancel.is_set():
+                self._finish(TaskResult(task_id, cancelled=True))
+                continue
+
+            try:
+                value = fn(*args, cancel=cancel, **kwargs)
+                result = TaskResult(task_id, value, cancelled=cancel.is_set())
+            except Exception as e:
+                self.logger.debug(f"Task {task_id} falhou: {e}")
+                result = TaskResult(task_id, error=e)
+            self._finish(result)
@@ -0,0 +1,125 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+import src.app.Application as app_module
+from src.app.Application import Application
+from src.lib.config import ConfigManager
+from src.lib.discovery import SyntheticWindowProvider
+from src.lib.keepalive import FixedSettle, SimulatedKeepAliveBackend
+from src.lib.layout import LayoutBackend, Rect
+
+
+class FakeClock:
+    """Clock + sleep pair: sleeping just advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeRoot:
+    """Minimal root.after()/after_cancel() stand-in; jobs run on run_pending()."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.delays = []  # ms de cada after(), em ordem
+        self._next = 0
+
+    def after(self, ms, fn):
+        self._next += 1
+        job = f"after#{self._next}"
+        self.jobs[job] = fn
+        self.delays.append(ms)
+        return job
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for fn in jobs.values():
+            fn()
+
+
+class FakeWindow:
+    def __init__(self, hwnd):
+        self._hWnd = hwnd
+
+
+class FakeLayout(LayoutBackend):
+    def __init__(self):
+        self.rects = {}
+
+    def work_areas(self):
+        return [Rect(0, 0, 1920, 1080)]
+
+    def get_rects(self, hwnds):
+        return {hwnd: self.rects.get(hwnd) for hwnd in hwnds}
+
+    def apply(self, moves):
+        self.rects.update(moves)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def make_windows():
+    """(window, pid) pairs as KeepAliveScheduler.run() takes them."""
+
+    def make(count):
+        return [(f"win{i}", 100 + i) for i in range(count)]
+
+    return make
+
+
+@pytest.fixture
+def config(tmp_path):
+    # instância isolada, fora do singleton Config
+    manager = object.__new__(ConfigManager)
+    manager._initialize(config_file=str(tmp_path / "config.ini"))
+    manager._ensure_loaded()
+    return manager
+
+
+@pytest.fixture
+def make_app(monkeypatch, config):
+    """
+    Application.headless() over synthetic windows, reading `config`.
+
+    make_app(windows, **backends): windows are WindowInfo; backends override
+    the simulated ones (see Application._init_core).
+    """
+    monkeypatch.setattr(app_module, "config", config)
+    monkeypatch.setattr(app_module, "gw", SimpleNamespace(Win32Window=FakeWindow))
+
+    def make(windows=(), **backends):
+        provider = SyntheticWindowProvider(
+            list(windows), {w.pid: "RobloxPlayerBeta.exe" for w in windows}
+        )
+        backends = {
+            "provider": provider,
+            "keepalive_backend": SimulatedKeepAliveBackend(),
+            "settle": FixedSettle(0),
+            "layout_backend": FakeLayout(),
+            **backends,
+        }
+        return Application.headless(logging.getLogger("test.app"), **backends)
+
+    return make
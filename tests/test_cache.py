@@ -0,0 +1,170 @@
+import threading
+import time
+
+from src.lib.cache import Cache, ShardedCache, memoize
+
+
+def test_entries_expire_without_being_touched(clock):
+    cache = Cache(ttl=10, clock=clock)
+    cache.set("pid:1", "a")
+    cache.set("pid:2", "b", ttl=30)
+
+    clock.now = 15
+    assert len(cache) == 1
+    assert cache.get("pid:1") is None
+    assert cache.get("pid:2") == "b"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_rewritten_keys_keep_their_new_deadline(clock):
+    cache = Cache(ttl=10, clock=clock)
+    cache.set("k", 1)
+    clock.now = 8
+    cache.set("k", 2)
+    clock.now = 12
+    assert cache.get("k") == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = Cache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_find_uses_the_prefix_index():
+    cache = Cache()
+    for key in ("hwnd:10", "hwnd:11", "hwnd:20", "pid:10", "pidx"):
+        cache.set(key, key.upper())
+    cache.set(42, "not a string key")
+
+    assert cache.find(startswith="hwnd:1") == {
+        "hwnd:10": "HWND:10",
+        "hwnd:11": "HWND:11",
+    }
+    assert cache.find(startswith="pid:") == {"pid:10": "PID:10"}
+    assert cache.find(endswith="10") == {"hwnd:10": "HWND:10", "pid:10": "PID:10"}
+    assert cache.find(contains="x") == {"pidx": "PIDX"}
+
+    cache.delete("hwnd:10")
+    assert list(cache.find(startswith="hwnd:")) == ["hwnd:11", "hwnd:20"]
+    assert cache.find(startswith="hwnd:2") == {"hwnd:20": "HWND:20"}
+    # sem critérios, chaves que não são str também voltam
+    assert cache.find()[42] == "not a string key"
+    assert len(cache.find()) == 5
+
+
+def test_find_with_a_long_shared_prefix():
+    cache = Cache()
+    keys = [f"roblox:window:hwnd:{i:05d}" for i in range(2000)]
+    for key in keys:
+        cache.set(key, key)
+
+    assert list(cache.find(startswith="roblox:window:hwnd:0012")) == keys[120:130]
+    assert cache.find(startswith="roblox:window:hwnd:9") == {}
+    assert len(cache.find(startswith="rob")) == 2000
+
+    for key in keys:
+        cache.delete(key)
+    # a trie não guarda nós órfãos depois das remoções
+    assert cache._trie == {}
+
+
+def test_hit_and_miss_counters():
+    cache = Cache()
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_sharded_cache_single_flight_under_contention():
+    cache = ShardedCache(shards=8, maxsize=1000)
+    calls = []
+    barrier = threading.Barrier(16)
+
+    def expensive(pid):
+        calls.append(pid)
+        time.sleep(0.02)  # simula psutil.Process(pid).name()
+        return f"proc-{pid}"
+
+    def worker(n):
+        barrier.wait()
+        for i in range(200):
+            pid = (n + i) % 10
+            assert cache.get_or_set(pid, lambda: expensive(pid)) == f"proc-{pid}"
+            cache.set(f"hwnd:{n}:{i}", i)
+            cache.get(f"hwnd:{n}:{i // 2}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # cada pid calculado uma única vez, apesar das 16 threads
+    assert sorted(calls) == list(range(10))
+    assert len(cache) <= 1000
+    stats = cache.stats()
+    assert stats["size"] == len(cache) and stats["evictions"] > 0
+
+
+def test_sharded_cache_never_exceeds_maxsize():
+    for maxsize, shards in ((1, 16), (10, 16), (100, 16), (17, 4)):
+        cache = ShardedCache(shards=shards, maxsize=maxsize)
+        for i in range(maxsize * 20):
+            cache.set(f"pid:{i}", i)
+        assert len(cache) <= maxsize
+
+
+def test_single_flight_errors_reach_every_waiter():
+    cache = ShardedCache()
+    started = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise ProcessLookupError(1)
+
+    def follower():
+        started.wait()
+        try:
+            cache.get_or_set("pid:1", lambda: "never called")
+        except ProcessLookupError as e:
+            errors.append(e)
+
+    t = threading.Thread(target=follower)
+    t.start()
+    try:
+        cache.get_or_set("pid:1", failing)
+    except ProcessLookupError as e:
+        errors.append(e)
+    t.join()
+
+    assert len(errors) == 2
+    assert "pid:1" not in cache
+
+
+def test_memoize_caches_by_arguments():
+    calls = []
+
+    @memoize(ShardedCache(), ttl=60)
+    def process_name(pid):
+        calls.append(pid)
+        return f"proc-{pid}"
+
+    assert [process_name(1), process_name(1), process_name(2)] == [
+        "proc-1",
+        "proc-1",
+        "proc-2",
+    ]
+    assert calls == [1, 2]
+    stats = process_name.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)  # um miss por cálculo
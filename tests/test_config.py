@@ -0,0 +1,230 @@
+import os
+import stat
+import time
+
+import pytest
+
+from src.lib.config import ConfigManager, Settings
+
+
+def test_settings_are_typed_and_defaulted(config):
+    config.set("APPLICATION", "action_delay", "150")
+    config.set("APPLICATION", "tiler_enabled", "True")
+    config.set("APPLICATION", "ignored_pids", "12, 34,abc,,56")
+    config.set("APPLICATION", "action_key", " Space ")
+
+    settings = config.settings
+    assert settings.action_delay == 150
+    assert settings.tiler_enabled is True
+    assert settings.ignored_pids == frozenset({12, 34, 56})
+    assert settings.action_key == "space"
+    assert settings.autorun_delay_minutes == Settings.autorun_delay_minutes
+
+
+def test_snapshot_is_only_rebuilt_when_a_value_changes(config):
+    config.set("APPLICATION", "action_delay", "150")
+    first = config.settings
+    version = config.version
+
+    config.set("APPLICATION", "action_delay", 150)
+    assert config.version == version
+    assert config.settings is first
+
+    config.set("APPLICATION", "action_delay", "200")
+    assert config.version > version
+    assert config.settings is not first
+    assert config.settings.action_delay == 200
+
+
+def test_invalid_numbers_fall_back_to_defaults(config):
+    config.set("APPLICATION", "tiler_gapx", "ten")
+    assert config.settings.tiler_gapx == Settings.tiler_gapx
+
+
+def test_save_only_writes_when_something_changed(monkeypatch, config):
+    writes = []
+    original = config._write_atomic
+    monkeypatch.setattr(
+        config, "_write_atomic", lambda text: writes.append(original(text))
+    )
+
+    config.set("APPLICATION", "action_key", "space")
+    config.save()
+    config.set("APPLICATION", "action_key", "space")
+    config.save()
+    config.save()
+    assert len(writes) == 1 and not config.dirty
+
+    config.remove_section("APPLICATION")
+    config.save()
+    assert len(writes) == 2
+
+
+def test_save_replaces_the_file_atomically(tmp_path, monkeypatch, config):
+    config.set("APPLICATION", "action_key", "space")
+    config.save()
+    before = (tmp_path / "config.ini").read_text()
+
+    def broken_write(fp, *args, **kwargs):
+        fp.write("[APPLICATION]\n")
+        raise OSError("disk full")
+
+    config.set("APPLICATION", "action_key", "enter")
+    monkeypatch.setattr(config.config, "write", broken_write)
+    try:
+        config.save()
+    except OSError:
+        pass
+
+    # o arquivo original continua inteiro e nenhum temporário sobra
+    assert (tmp_path / "config.ini").read_text() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["config.ini"]
+    assert config.dirty
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+def test_save_keeps_the_file_permissions(tmp_path, config):
+    path = tmp_path / "config.ini"
+    mask = os.umask(0o022)
+    try:
+        os.remove(path)
+        config.set("APPLICATION", "action_key", "space")
+        config.save()
+        # arquivo novo: modo padrão respeitando o umask, não o 0600 do mkstemp
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+        os.chmod(path, 0o640)
+        config.set("APPLICATION", "action_key", "enter")
+        config.save()
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    finally:
+        os.umask(mask)
+
+
+def test_write_behind_coalesces_bursts_and_flushes_on_close(
+    tmp_path, monkeypatch, config
+):
+    writes = []
+    original = config._write_atomic
+    monkeypatch.setattr(
+        config, "_write_atomic", lambda text: writes.append(original(text))
+    )
+    config.start_write_behind(coalesce_window=0.05)
+    try:
+        for i in range(20):
+            config.set("APPLICATION", "action_delay", str(i))
+            config.save()
+        assert writes == []  # nada escrito na thread que chamou save()
+
+        deadline = time.monotonic() + 2
+        while not writes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(writes) == 1
+
+        config.set("APPLICATION", "action_delay", "999")
+        config.save()
+    finally:
+        config.close()
+
+    assert len(writes) == 2
+    assert "action_delay = 999" in (tmp_path / "config.ini").read_text()
+
+
+def test_flush_writes_immediately(tmp_path, config):
+    config.start_write_behind(coalesce_window=60)
+    try:
+        config.set("APPLICATION", "action_key", "enter")
+        config.save()
+        config.flush()
+        assert "action_key = enter" in (tmp_path / "config.ini").read_text()
+    finally:
+        config.close()
+
+
+def test_external_edits_are_reloaded_and_published(tmp_path, config):
+    config.set("APPLICATION", "action_key", "space")
+    config.set("APPLICATION", "action_delay", "0")
+    config.save()
+    received = []
+    config.subscribe(received.append)
+
+    # escrita do próprio app não conta como mudança externa
+    assert config.reload_if_changed() == []
+
+    path = tmp_path / "config.ini"
+    path.write_text(
+        path.read_text()
+        .replace("action_delay = 0", "action_delay = 300")
+        .replace("action_key = space\n", "")
+        + "[EXTRA]\nfoo = bar\n"
+    )
+    version = config.version
+    changes = config.reload_if_changed()
+
+    assert sorted(changes) == [
+        ("APPLICATION", "action_delay", "0", "300"),
+        ("APPLICATION", "action_key", "space", None),
+        ("EXTRA", "foo", None, "bar"),
+    ]
+    assert received == [changes]
+    assert config.version > version
+    assert config.settings.action_delay == 300
+    assert not config.dirty
+    assert config.reload_if_changed() == []
+
+
+def test_unsaved_local_edits_win_over_the_file(tmp_path, config):
+    config.set("APPLICATION", "action_key", "space")
+    config.save()
+
+    path = tmp_path / "config.ini"
+    path.write_text("[APPLICATION]\naction_key = enter\naction_delay = 5\n")
+    config.set("APPLICATION", "action_key", "tab")
+
+    changes = config.reload_if_changed()
+    assert [c[1] for c in changes if c[0] == "APPLICATION"] == ["action_delay"]
+    assert config.get("APPLICATION", "action_key") == "tab"
+
+
+def test_disk_is_only_touched_on_first_access(tmp_path):
+    manager = object.__new__(ConfigManager)
+    manager._initialize(config_file=str(tmp_path / "config.ini"))
+    assert not (tmp_path / "config.ini").exists()
+
+    assert manager.get("APPLICATION", "action_key", fallback="space") == "space"
+    assert (tmp_path / "config.ini").exists()
+
+
+def test_first_save_takes_the_write_lock_before_the_config_lock(tmp_path):
+    manager = object.__new__(ConfigManager)
+    manager._initialize(config_file=str(tmp_path / "config.ini"))
+    held = []
+    inverted = []
+
+    class Tracked:
+        def __init__(self, lock, name):
+            self.lock, self.name = lock, name
+
+        def __enter__(self):
+            if self.name == "write" and "config" in held:
+                inverted.append(list(held))
+            self.lock.acquire()
+            held.append(self.name)
+
+        def __exit__(self, *exc):
+            held.remove(self.name)
+            self.lock.release()
+
+    # mesma ordem que _writer_loop -> flush() usa: _write_lock, depois _lock
+    manager._lock = Tracked(manager._lock, "config")
+    manager._write_lock = Tracked(manager._write_lock, "write")
+
+    manager.get("General", "url_webhook")
+    assert (tmp_path / "config.ini").exists()
+    assert inverted == []
+
+
+def test_child_loggers_are_created_once(config):
+    first = config._ConfigManager__getLogger("save")
+    assert config._ConfigManager__getLogger("save") is first
+    assert first.name == config.logger.name + ".save"
@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from src.lib.deadlines import DeadlineScheduler
+from src.lib.discovery import WindowInfo
+
+
+@pytest.fixture
+def clock(clock):
+    clock.now = 1000.0
+    return clock
+
+
+def test_windows_are_spread_over_the_interval(clock):
+    scheduler = DeadlineScheduler(60, clock=clock)
+    scheduler.sync(["a", "b", "c", "d"])
+
+    offsets = sorted(scheduler.due_at(k) - clock.now for k in "abcd")
+    assert offsets == [0, 15, 30, 45]
+
+    # só uma janela por vez vence, nunca todas juntas
+    assert scheduler.pop_due() == ["a"]
+    clock.now += 15
+    assert scheduler.pop_due() == ["d"]
+
+
+def test_each_window_is_serviced_once_per_interval(clock):
+    scheduler = DeadlineScheduler(60, clock=clock)
+    scheduler.sync(range(6))
+
+    serviced = []
+    for _ in range(120):  # dois intervalos, de segundo em segundo
+        serviced += scheduler.pop_due()
+        clock.now += 1
+    assert sorted(serviced) == sorted(list(range(6)) * 2)
+
+
+def test_new_window_joins_without_moving_the_others(clock):
+    scheduler = DeadlineScheduler(60, clock=clock)
+    scheduler.sync(["a", "b"])
+    before = {k: scheduler.due_at(k) for k in "ab"}
+
+    clock.now += 10
+    scheduler.sync(["a", "b", "c"])
+
+    assert {k: scheduler.due_at(k) for k in "ab"} == before
+    # entra no meio de um dos maiores buracos (a em 1000, b em 1030)
+    assert scheduler.due_at("c") == 1015
+
+
+def test_closed_windows_are_forgotten(clock):
+    scheduler = DeadlineScheduler(60, clock=clock)
+    scheduler.sync(["a", "b"])
+    scheduler.sync(["b"])
+
+    assert "a" not in scheduler
+    assert scheduler.next_deadline() == scheduler.due_at("b")
+    clock.now += 60
+    assert scheduler.pop_due() == ["b"]
+
+
+def test_jitter_does_not_accumulate(clock):
+    scheduler = DeadlineScheduler(60, jitter=0.1, clock=clock, rng=random.Random(1))
+    scheduler.sync(["a"])
+
+    for cycle in range(1, 50):
+        clock.now = scheduler.next_deadline()
+        assert scheduler.pop_due() == ["a"]
+        assert abs(scheduler.due_at("a") - (1000 + cycle * 60)) <= 6
+
+
+def test_late_windows_do_not_burst_to_catch_up(clock):
+    scheduler = DeadlineScheduler(60, clock=clock)
+    scheduler.sync(["a"])
+
+    clock.now += 610  # ex: máquina suspensa
+    assert scheduler.pop_due() == ["a"]
+    assert scheduler.pop_due() == []
+    # um único atendimento, e a fase original (múltiplos de 60) é mantida
+    assert scheduler.due_at("a") == 1000 + 11 * 60
+    assert scheduler.late == 1
+    assert scheduler.missed == 10
+
+
+def test_fixed_rate_does_not_drift_with_cycle_time(clock):
+    scheduler = DeadlineScheduler(60, clock=clock)
+    scheduler.sync(["a"])
+
+    for cycle in range(1, 100):
+        clock.now = scheduler.next_deadline() + 0.3  # acorda um pouco depois
+        assert scheduler.pop_due() == ["a"]
+        clock.now += 5  # o ciclo em si leva 5 s
+        assert scheduler.due_at("a") == 1000 + cycle * 60
+    assert scheduler.late == 0 and scheduler.missed == 0
+
+
+def test_overrun_coalesces_ticks_for_every_window(clock):
+    scheduler = DeadlineScheduler(60, clock=clock)
+    scheduler.sync(["a", "b"])  # a em +0, b em +30
+
+    clock.now += 150  # ciclo anterior levou mais que dois intervalos
+    assert sorted(scheduler.pop_due()) == ["a", "b"]
+    assert scheduler.pop_due() == []
+    assert scheduler.due_at("a") == 1180
+    assert scheduler.due_at("b") == 1210
+    assert scheduler.missed == 4  # a: 1060, 1120; b: 1090, 1150
+
+
+def test_run_only_keeps_due_windows_alive(make_app, config, clock):
+    windows = [WindowInfo(hwnd, "Roblox", 100 + hwnd) for hwnd in (1, 2, 3)]
+    config.set("APPLICATION", "action_key_hold_duration", "0")
+    app = make_app(windows)
+    deadlines = DeadlineScheduler(90, clock=clock)
+
+    assert app.run(deadlines=deadlines).ok == 1
+    assert app.run(deadlines=deadlines) is None  # ninguém vencido ainda
+    clock.now += 45
+    assert app.run(deadlines=deadlines).ok == 1
+    assert len(deadlines) == 3
+
+
+def test_autorun_tick_never_fires_before_the_deadline(make_app, root, monkeypatch):
+    app = make_app()
+    app.root = root
+    monkeypatch.setattr(app, "_start_next_tick_updater", lambda: None)
+
+    app._schedule_autorun(0.0104)
+
+    assert root.delays == [11]
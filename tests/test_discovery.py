@@ -0,0 +1,54 @@
+from src.lib.discovery import SyntheticWindowProvider, WindowDiscovery, WindowInfo
+
+
+def make_provider():
+    windows = [
+        WindowInfo(1, "Roblox", 100),
+        WindowInfo(2, "Roblox", 100),
+        WindowInfo(3, "Roblox - Chrome", 200),
+        WindowInfo(4, "Notepad", 300),
+        WindowInfo(5, "Roblox", 400),
+    ]
+    names = {
+        100: "RobloxPlayerBeta.exe",
+        200: "chrome.exe",
+        400: "RobloxPlayerBeta.exe",
+    }
+    return SyntheticWindowProvider(windows, names)
+
+
+def test_find_filters_title_process_and_ignored_pids():
+    discovery = WindowDiscovery(make_provider())
+    found = discovery.find(ignored_pids={400})
+    assert [w.hwnd for w in found] == [1, 2]
+
+
+def test_process_names_are_memoized_between_calls():
+    provider = make_provider()
+    discovery = WindowDiscovery(provider)
+    discovery.find()
+    lookups = provider.process_name_calls
+    discovery.find()
+    discovery.find()
+    assert provider.enum_calls == 3
+    assert provider.process_name_calls == lookups
+
+
+def test_exited_process_is_looked_up_again_when_pid_is_recycled():
+    provider = make_provider()
+    discovery = WindowDiscovery(provider)
+    assert [w.hwnd for w in discovery.find()] == [1, 2, 5]
+
+    # pid 400 sai e volta como outro executável, com outra janela
+    provider.windows = [w for w in provider.windows if w.pid != 400]
+    discovery.find()
+    provider.windows.append(WindowInfo(6, "Roblox Studio", 400))
+    provider.process_names[400] = "explorer.exe"
+    assert [w.hwnd for w in discovery.find()] == [1, 2]
+
+
+def test_vanished_process_is_skipped():
+    provider = make_provider()
+    del provider.process_names[100]
+    discovery = WindowDiscovery(provider)
+    assert [w.hwnd for w in discovery.find()] == [5]
@@ -0,0 +1,70 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.lib.exporter import MetricsServer
+from src.lib.metrics import Histogram, Metrics, NullMetrics, render_prometheus
+
+
+def fetch(server, path="/metrics"):
+    host, port = server.address[:2]
+    with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5) as resp:
+        return resp.status, resp.headers["Content-Type"], resp.read().decode()
+
+
+def test_render_prometheus_text_format():
+    metrics = Metrics()
+    metrics.counter("cycles_total", "Main task cycles started").inc(3)
+    metrics.gauge("target_windows").set(5)
+    histogram = metrics.histogram("run_seconds", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(2.0)
+
+    text = render_prometheus(metrics)
+
+    assert "# HELP rowin_cycles_total Main task cycles started" in text
+    assert "# TYPE rowin_cycles_total counter\nrowin_cycles_total 3" in text
+    assert "# TYPE rowin_target_windows gauge\nrowin_target_windows 5" in text
+    assert 'rowin_run_seconds_bucket{le="0.1"} 1' in text
+    assert 'rowin_run_seconds_bucket{le="1.0"} 2' in text
+    assert 'rowin_run_seconds_bucket{le="+Inf"} 3' in text
+    assert "rowin_run_seconds_sum 2.55" in text
+    assert "rowin_run_seconds_count 3" in text
+    assert text.endswith("\n")
+
+
+def test_histogram_totals_are_consistent():
+    histogram = Histogram("x", buckets=(1.0,))
+    histogram.observe(0.5)
+    counts, count, total = histogram.totals()
+    assert sum(counts) == count == 1
+    assert total == 0.5
+
+
+def test_server_exposes_current_metrics():
+    metrics = Metrics()
+    current = {"metrics": metrics}
+    server = MetricsServer(lambda: current["metrics"], port=0)
+    server.start()
+    try:
+        assert server.address[0] == "127.0.0.1"
+
+        metrics.counter("cycles_total").inc()
+        status, content_type, body = fetch(server)
+        assert status == 200
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert "rowin_cycles_total 1" in body
+
+        # instância trocada (métricas desligadas): resposta vazia, sem erro
+        current["metrics"] = NullMetrics()
+        assert fetch(server)[2] == ""
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetch(server, "/other")
+        assert error.value.code == 404
+    finally:
+        server.stop()
+
+    assert not server.running
@@ -0,0 +1,115 @@
+import time
+
+from src.lib.keepalive import (
+    AdaptiveSettle,
+    KeepAliveScheduler,
+    SimulatedKeepAliveBackend,
+)
+
+
+def test_every_window_is_activated_then_pressed_in_order(make_windows):
+    backend = SimulatedKeepAliveBackend()
+    scheduler = KeepAliveScheduler(backend, settle_ms=0)
+    windows = make_windows(4)
+
+    report = scheduler.run(windows, key="space")
+
+    expected = []
+    for window, _ in windows:
+        expected += [("activate", window), ("send", window)]
+    assert backend.events == expected
+    assert report.ok == 4 and report.failed == 0
+    assert [t.pid for t in report.timings] == [pid for _, pid in windows]
+
+
+def test_invalid_windows_are_skipped_and_focus_is_restored(make_windows):
+    backend = SimulatedKeepAliveBackend()
+    backend.foreground = "operator"
+    backend.invalid.add("win1")
+    scheduler = KeepAliveScheduler(backend, settle_ms=0)
+
+    report = scheduler.run(make_windows(3), key="space", preserve_focus=True)
+
+    assert ("activate", "win1") not in backend.events
+    assert backend.events[-1] == ("restore", "operator")
+    assert report.ok == 2 and report.failed == 1
+
+
+def test_preparation_overlaps_with_the_previous_window(make_windows):
+    prepare, settle, send, delay, count = 0.03, 0.01, 0.005, 0.02, 6
+    backend = SimulatedKeepAliveBackend(prepare_cost=prepare, send_cost=send)
+    scheduler = KeepAliveScheduler(backend, settle_ms=settle * 1000)
+
+    start = time.perf_counter()
+    report = scheduler.run(make_windows(count), key="space", delay=delay * 1000)
+    elapsed = time.perf_counter() - start
+
+    serial = count * (prepare + settle + send) + (count - 1) * delay
+    assert elapsed < serial * 0.8
+    # só a primeira janela espera o preparo por inteiro
+    assert all(t.wait < prepare / 2 for t in report.timings[1:])
+
+
+def ready_after(clock, seconds):
+    return lambda: clock.now >= seconds
+
+
+def test_adaptive_settle_returns_as_soon_as_the_window_is_foreground(clock):
+    settle = AdaptiveSettle(ceiling_ms=500, clock=clock, sleep=clock.sleep)
+
+    assert settle.wait(lambda: True)
+    assert clock.sleeps == []
+
+    clock.now = 0.0
+    assert settle.wait(ready_after(clock, 0.02))
+    # backoff dobrando: 2, 4, 8, 16 ms
+    assert clock.sleeps == [0.002, 0.004, 0.008, 0.016]
+    assert clock.now < 0.1  # bem antes dos 100 ms fixos
+
+
+def test_adaptive_settle_gives_up_at_the_ceiling(clock):
+    settle = AdaptiveSettle(ceiling_ms=100, clock=clock, sleep=clock.sleep)
+
+    assert not settle.wait(lambda: False)
+    assert abs(clock.now - 0.1) < 1e-9
+    assert settle.timeouts == 1
+    assert not settle.samples
+
+
+def test_adaptive_settle_starts_polling_from_recent_history(clock):
+    settle = AdaptiveSettle(ceiling_ms=500, clock=clock, sleep=clock.sleep)
+    for _ in range(8):
+        start = clock.now
+        assert settle.wait(ready_after(clock, start + 0.04))
+
+    clock.sleeps.clear()
+    start = clock.now
+    assert settle.wait(ready_after(clock, start + 0.04))
+    # primeira espera já pula a maior parte da latência típica
+    assert clock.sleeps[0] >= 0.025
+    assert len(clock.sleeps) <= 4
+
+
+def test_adaptive_settle_follows_latency_down(clock):
+    settle = AdaptiveSettle(ceiling_ms=500, clock=clock, sleep=clock.sleep)
+    for _ in range(32):
+        start = clock.now
+        assert settle.wait(ready_after(clock, start + 0.3))
+    assert settle.initial_delay() > 0.2
+
+    for _ in range(48):
+        start = clock.now
+        assert settle.wait(ready_after(clock, start + 0.005))
+    assert settle.initial_delay() < 0.01
+
+
+def test_key_is_not_sent_when_focus_never_arrives(make_windows, clock):
+    backend = SimulatedKeepAliveBackend()
+    backend.get_foreground = lambda: "operator"  # outra janela segura o foco
+    settle = AdaptiveSettle(ceiling_ms=50, clock=clock, sleep=clock.sleep)
+    scheduler = KeepAliveScheduler(backend, settle=settle)
+
+    report = scheduler.run(make_windows(2), key="space")
+
+    assert ("send", "win0") not in backend.events
+    assert report.ok == 0 and report.settle_timeouts == 2
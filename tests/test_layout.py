@@ -0,0 +1,134 @@
+import sys
+
+import pytest
+
+from src.lib.layout import (
+    LayoutBackend,
+    Rect,
+    Win32LayoutBackend,
+    WindowTiler,
+    compute_grid,
+    split_count,
+)
+
+SCREEN = Rect(0, 0, 1920, 1040)
+
+
+def inside(rect, area):
+    return (
+        area.x <= rect.x
+        and area.y <= rect.y
+        and rect.x + rect.width <= area.x + area.width
+        and rect.y + rect.height <= area.y + area.height
+    )
+
+
+def overlaps(a, b):
+    return (
+        a.x < b.x + b.width
+        and b.x < a.x + a.width
+        and a.y < b.y + b.height
+        and b.y < a.y + a.height
+    )
+
+
+def test_windows_that_fit_do_not_overlap():
+    layout = compute_grid(4, [SCREEN], cell=(900, 500), gap=(10, 10))
+    assert layout == [
+        Rect(0, 0, 900, 500),
+        Rect(910, 0, 900, 500),
+        Rect(0, 510, 900, 500),
+        Rect(910, 510, 900, 500),
+    ]
+    assert not any(overlaps(a, b) for i, a in enumerate(layout) for b in layout[:i])
+
+
+def test_crowded_grid_never_leaves_the_work_area():
+    for count in (1, 2, 7, 30, 200):
+        layout = compute_grid(count, [SCREEN], cell=(800, 600), gap=(10, 10))
+        assert len(layout) == count
+        assert all(inside(rect, SCREEN) for rect in layout)
+        assert len(set(layout)) == count
+
+
+def test_cells_are_clamped_to_small_monitors():
+    small = Rect(0, 0, 640, 480)
+    (rect,) = compute_grid(1, [small], cell=(800, 600))
+    assert rect == Rect(0, 0, 640, 480)
+
+
+def test_windows_are_spread_across_monitors():
+    left = Rect(-1280, 0, 1280, 1024)
+    assert split_count(10, [SCREEN, left]) == [6, 4]
+
+    layout = compute_grid(10, [SCREEN, left], cell=(400, 300))
+    assert all(inside(r, SCREEN) for r in layout[:6])
+    assert all(inside(r, left) for r in layout[6:])
+
+
+class FakeBackend(LayoutBackend):
+    def __init__(self):
+        self.rects = {}
+        self.batches = []
+        self.reads = []
+
+    def work_areas(self):
+        return [SCREEN]
+
+    def get_rects(self, hwnds):
+        self.reads.append(list(hwnds))
+        return {hwnd: self.rects.get(hwnd) for hwnd in hwnds}
+
+    def apply(self, moves):
+        self.batches.append(moves)
+        self.rects.update(moves)
+
+
+def test_tiler_applies_every_move_in_one_batch():
+    backend = FakeBackend()
+    result = WindowTiler(backend).tile([11, 12, 13])
+    assert backend.batches == [result.moves]
+    assert [hwnd for hwnd, _ in result.moves] == [11, 12, 13]
+    assert result.skipped == 0
+    # nada aplicado antes: não há o que conferir
+    assert backend.reads == []
+
+
+def test_steady_state_ticks_only_move_windows_that_drifted():
+    backend = FakeBackend()
+    tiler = WindowTiler(backend)
+    tiler.tile([11, 12, 13])
+
+    result = tiler.tile([11, 12, 13])
+    assert result.moves == [] and result.skipped == 3
+    assert len(backend.batches) == 1
+
+    # usuário arrastou uma janela e minimizou outra
+    backend.rects[12] = Rect(5, 5, 800, 600)
+    backend.rects[13] = None
+    result = tiler.tile([11, 12, 13])
+    assert [hwnd for hwnd, _ in result.moves] == [12, 13]
+    assert result.skipped == 1
+
+
+def test_windows_with_a_new_target_are_moved_without_reading_them():
+    backend = FakeBackend()
+    tiler = WindowTiler(backend)
+    tiler.tile([11, 12])
+    backend.reads.clear()
+
+    # 12 sai: 13 herda a célula de 12, que é alvo novo para ela
+    result = tiler.tile([11, 13])
+    assert backend.reads == [[11]]
+    assert [hwnd for hwnd, _ in result.moves] == [13]
+
+
+@pytest.mark.skipif(sys.platform != "win32", reason="user32 only exists on Windows")
+def test_win32_backend_keeps_its_prototypes_private():
+    import ctypes
+
+    backend = Win32LayoutBackend()
+    assert backend._load_user32() is backend._load_user32()
+    # ctypes.windll.user32 é do processo todo; não pode ter argtypes nossos
+    assert ctypes.windll.user32.DeferWindowPos.argtypes is None
+    assert ctypes.windll.user32.SetWindowPos.argtypes is None
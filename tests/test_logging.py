@@ -0,0 +1,131 @@
+import gzip
+import json
+import logging
+import sys
+import threading
+
+from src.app.utils.logging import (
+    GzipRotatingFileHandler,
+    JsonFormatter,
+    create_file_handler,
+    log_cycle,
+    setup_queue_logging,
+    stop_queue_logging,
+)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append((self.format(record), threading.current_thread().name))
+
+
+def test_records_are_formatted_on_the_listener_thread():
+    logger = logging.getLogger("test.queue_logging")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = RecordingHandler()
+
+    setup_queue_logging(logger, handler)
+    try:
+        logger.debug("Janela PID %s: %s", 123, "ok")
+    finally:
+        stop_queue_logging()  # esvazia a fila antes de parar
+
+    assert handler.lines
+    message, thread = handler.lines[0]
+    assert message == "Janela PID 123: ok"
+    assert thread != threading.current_thread().name
+    assert logger.handlers == []
+
+
+def test_file_handler_directory_is_created(tmp_path):
+    logger = logging.getLogger("test.queue_logging.file")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    path = tmp_path / "logs" / "debug.log"
+    handler = logging.handlers.RotatingFileHandler(path, delay=True)
+
+    setup_queue_logging(logger, handler)
+    try:
+        logger.info("hello")
+    finally:
+        stop_queue_logging()
+        handler.close()
+
+    assert path.read_text().strip() == "hello"
+
+
+def test_json_lines_carry_structured_fields(tmp_path):
+    logger = logging.getLogger("test.queue_logging.json")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    path = tmp_path / "debug.log"
+    handler = create_file_handler(path, structured=True)
+
+    setup_queue_logging(logger, handler)
+    try:
+        with log_cycle() as cycle_id:
+            logger.debug(
+                "Janela PID %s", 42, extra={"pid": 42, "hwnd": 7, "durations": {"a": 1}}
+            )
+        logger.info("fora do ciclo")
+    finally:
+        stop_queue_logging()
+        handler.close()
+
+    first, second = [json.loads(line) for line in path.read_text().splitlines()]
+    assert first["msg"] == "Janela PID 42"
+    assert first["level"] == "DEBUG"
+    assert (first["pid"], first["hwnd"], first["cycle_id"]) == (42, 7, cycle_id)
+    assert first["durations"] == {"a": 1}
+    assert "cycle_id" not in second
+
+
+def test_json_formatter_includes_exceptions():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "x", logging.ERROR, __file__, 1, "falhou", None, sys.exc_info()
+        )
+    entry = json.loads(JsonFormatter().format(record))
+    assert "ValueError: boom" in entry["exc"]
+
+
+def test_rotated_segments_are_gzipped(tmp_path):
+    path = tmp_path / "debug.log"
+    handler = GzipRotatingFileHandler(path, maxBytes=200, backupCount=2, delay=True)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("test.queue_logging.gzip")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(30):
+            logger.info("linha %03d %s", i, "x" * 40)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert not (tmp_path / "debug.log.1").exists()
+    assert not (tmp_path / "debug.log.3.gz").exists()
+    rotated = gzip.decompress((tmp_path / "debug.log.1.gz").read_bytes()).decode()
+    assert rotated.startswith("linha")
+    assert (tmp_path / "debug.log.2.gz").exists()
+
+
+def test_each_cycle_logs_its_duration(make_app, caplog):
+    app = make_app()
+
+    with caplog.at_level(logging.INFO, logger="test.app"):
+        app.run()
+        app.run()
+
+    records = [r for r in caplog.records if hasattr(r, "duration_ms")]
+    assert len(records) == 2
+    assert records[0].cycle_id != records[1].cycle_id
+    assert all(r.duration_ms >= 0 for r in records)
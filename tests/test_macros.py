@@ -0,0 +1,110 @@
+import logging
+
+import pytest
+
+import src.app.Application as app_module
+from src.lib.macros import (
+    KEY_DOWN,
+    KEY_UP,
+    MOUSE_MOVE,
+    InputEvent,
+    MacroError,
+    MacroPlayer,
+    RecordingInputBackend,
+    compile_macro,
+)
+
+
+def test_taps_without_pauses_share_one_batch():
+    macro = compile_macro("space w move:40,-5")
+
+    assert macro.steps == (
+        (
+            0.0,
+            (
+                InputEvent(KEY_DOWN, 0x20),
+                InputEvent(KEY_UP, 0x20),
+                InputEvent(KEY_DOWN, ord("W")),
+                InputEvent(KEY_UP, ord("W")),
+                InputEvent(MOUSE_MOVE, 40, -5),
+            ),
+        ),
+    )
+    assert macro.duration == 0.0
+    assert macro.event_count == 5
+
+
+def test_holds_and_waits_split_batches_at_offsets():
+    macro = compile_macro("w:300 space wait:50 left:100")
+
+    offsets = [offset for offset, _ in macro.steps]
+    assert offsets == pytest.approx([0.0, 0.3, 0.35, 0.45])
+    assert [len(batch) for _, batch in macro.steps] == [1, 3, 1, 1]
+    assert macro.duration == pytest.approx(0.45)
+
+
+def test_compile_is_cached_per_source():
+    assert compile_macro("space wait:10 space") is compile_macro("space wait:10 space")
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "",
+        "nope",
+        "w:abc",
+        "w:-300",
+        "space:0",
+        "space:",
+        "wait:-1",
+        "move:10",
+        "move:a,b",
+    ],
+)
+def test_invalid_macros_are_rejected(source):
+    with pytest.raises(MacroError):
+        compile_macro(source)
+
+
+def test_invalid_sources_are_not_parsed_again(monkeypatch):
+    import src.lib.macros as macros
+
+    calls = []
+    parse = macros._parse
+    monkeypatch.setattr(macros, "_parse", lambda s: calls.append(s) or parse(s))
+
+    for _ in range(3):
+        with pytest.raises(MacroError):
+            compile_macro("space bogus-key")
+    assert calls == ["space bogus-key"]
+
+
+def test_player_sends_batches_at_absolute_offsets(clock):
+    backend = RecordingInputBackend(clock=clock)
+    player = MacroPlayer(backend, clock=clock, sleep=clock.sleep, spin=0)
+    macro = compile_macro("space:250 wait:50 space")
+
+    clock.now = 10.0
+    player.play(macro)
+
+    times = [t for t, _ in backend.batches]
+    assert times == pytest.approx([10.0, 10.25, 10.3])
+
+
+def test_action_uses_configured_macro(monkeypatch, make_app, config, caplog):
+    backend = RecordingInputBackend()
+    app = make_app(input_backend=backend)
+    pressed = []
+    monkeypatch.setattr(app_module, "press", lambda key, hold: pressed.append(key))
+
+    app._send_action("space", 0)
+    config.set("APPLICATION", "action_macro", "w space")
+    app._send_action("space", 0)
+    config.set("APPLICATION", "action_macro", "bogus")
+    with caplog.at_level(logging.WARNING, logger="test.app"):
+        app._send_action("space", 0)
+        app._send_action("space", 0)
+
+    assert pressed == ["space", "space", "space"]  # sem macro, e macro inválida
+    assert len(caplog.records) == 1  # avisa uma vez, não por janela
+    assert len(backend.batches) == 1
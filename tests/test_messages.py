@@ -0,0 +1,108 @@
+import pytest
+
+from src.lib.keepalive import MESSAGE, KeepAliveScheduler, SimulatedKeepAliveBackend
+from src.lib.messages import (
+    WM_KEYDOWN,
+    WM_KEYUP,
+    FakeMessageSink,
+    MessageInputSender,
+    virtual_key,
+)
+
+
+def test_virtual_keys():
+    assert virtual_key("space") == 0x20
+    assert virtual_key("F1") == 0x70
+    assert virtual_key("a") == ord("A")
+    assert virtual_key("7") == ord("7")
+    with pytest.raises(KeyError):
+        virtual_key("nope")
+
+
+def test_fan_out_holds_once_for_all_windows():
+    sink = FakeMessageSink()
+    sleeps = []
+    sender = MessageInputSender(sink, sleep=sleeps.append)
+
+    delivered = sender.send([1, 2, 3], "space", hold=250)
+
+    assert delivered == {1, 2, 3}
+    assert sleeps == [0.25]
+    kinds = [(hwnd, msg) for hwnd, msg, _, _ in sink.messages]
+    assert kinds == [(h, WM_KEYDOWN) for h in (1, 2, 3)] + [
+        (h, WM_KEYUP) for h in (1, 2, 3)
+    ]
+    down, up = sink.messages[0][3], sink.messages[3][3]
+    assert down & 0xFFFF == 1
+    assert up & 0xC0000000 == 0xC0000000
+
+
+def test_refused_and_unknown_keys_are_not_delivered():
+    sender = MessageInputSender(FakeMessageSink(refused={2}), sleep=lambda s: None)
+    assert sender.send([1, 2], "space") == {1}
+    assert sender.send([1, 2], "not-a-key") == set()
+
+
+def test_message_mode_never_takes_focus(make_windows):
+    backend = SimulatedKeepAliveBackend()
+    backend.foreground = "operator"
+    sink = FakeMessageSink()
+    scheduler = KeepAliveScheduler(
+        backend,
+        settle_ms=0,
+        message_sender=MessageInputSender(sink, sleep=lambda s: None),
+    )
+    windows = make_windows(5)
+
+    report = scheduler.run(windows, key="space", hold=100, mode=MESSAGE)
+
+    # aceitas pela fila, sem confirmação do cliente: posted, não ok
+    assert report.posted == 5 and report.ok == 0 and report.failed == 0
+    assert backend.events == []
+    assert backend.foreground == "operator"
+    assert {hwnd for hwnd, *_ in sink.messages} == {w for w, _ in windows}
+
+
+def test_refused_windows_fall_back_to_focus(make_windows):
+    backend = SimulatedKeepAliveBackend()
+    backend.invalid.add("win4")
+    sink = FakeMessageSink(refused={"win1", "win3"})
+    scheduler = KeepAliveScheduler(
+        backend,
+        settle_ms=0,
+        message_sender=MessageInputSender(sink, sleep=lambda s: None),
+    )
+
+    report = scheduler.run(make_windows(5), key="space", mode=MESSAGE)
+
+    assert backend.events == [
+        ("activate", "win1"),
+        ("send", "win1"),
+        ("activate", "win3"),
+        ("send", "win3"),
+    ]
+    assert report.ok == 2 and report.posted == 2 and report.failed == 1
+
+    # quem recusou uma vez fica no caminho do foco
+    backend.events.clear()
+    sink.refused.clear()
+    scheduler.run(make_windows(4), key="space", mode=MESSAGE)
+    assert [w for kind, w in backend.events if kind == "send"] == ["win1", "win3"]
+
+
+def test_focus_only_pids_skip_the_message_path(make_windows):
+    backend = SimulatedKeepAliveBackend()
+    sink = FakeMessageSink()
+    scheduler = KeepAliveScheduler(
+        backend,
+        settle_ms=0,
+        message_sender=MessageInputSender(sink, sleep=lambda s: None),
+    )
+
+    report = scheduler.run(
+        make_windows(3), key="space", mode=MESSAGE, focus_only_pids={101}
+    )
+
+    assert backend.events == [("activate", "win1"), ("send", "win1")]
+    assert {hwnd for hwnd, *_ in sink.messages} == {"win0", "win2"}
+    assert report.ok == 1 and report.posted == 2
@@ -0,0 +1,100 @@
+import pytest
+
+from src.app.Application import format_metrics
+from src.lib.discovery import WindowInfo
+from src.lib.metrics import Histogram, Metrics, NullMetrics
+
+
+def test_histogram_percentiles_interpolate_inside_buckets():
+    histogram = Histogram("latency", buckets=(0.01, 0.1, 1.0))
+    for _ in range(50):
+        histogram.observe(0.005)
+    for _ in range(50):
+        histogram.observe(0.05)
+
+    assert histogram.count == 100
+    assert histogram.counts == [50, 50, 0, 0]
+    assert histogram.percentile(50) == pytest.approx(0.01)
+    assert 0.01 < histogram.percentile(95) <= 0.1
+    assert histogram.percentile(99) <= 0.1
+
+
+def test_histogram_percentiles_use_a_rolling_window():
+    histogram = Histogram("latency", buckets=(0.01, 0.1, 1.0), window=10)
+    for _ in range(10):
+        histogram.observe(0.5)
+    for _ in range(10):
+        histogram.observe(0.005)
+
+    # totais acumulam, percentis só olham as 10 últimas observações
+    assert histogram.count == 20
+    assert histogram.percentile(99) <= 0.01
+
+
+def test_overflow_bucket_is_bounded_by_the_largest_value():
+    histogram = Histogram("latency", buckets=(0.01,))
+    histogram.observe(3.0)
+    assert histogram.percentile(99) <= 3.0
+
+
+def test_metrics_registry_reuses_metrics_by_name():
+    clock = iter([0.0, 0.2]).__next__
+    metrics = Metrics(clock=clock)
+    metrics.counter("cycles_total").inc()
+    metrics.counter("cycles_total").inc(2)
+    metrics.gauge("windows").set(4)
+    with metrics.timer("run_seconds"):
+        pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot["cycles_total"] == 3
+    assert snapshot["windows"] == 4
+    assert snapshot["run_seconds"]["count"] == 1
+    assert snapshot["run_seconds"]["sum"] == pytest.approx(0.2)
+    with pytest.raises(TypeError):
+        metrics.gauge("cycles_total")
+
+
+def test_null_metrics_accept_everything_and_record_nothing():
+    metrics = NullMetrics()
+    metrics.counter("a").inc()
+    metrics.gauge("b").set(1)
+    metrics.histogram("c").observe(1)
+    with metrics.timer("d"):
+        pass
+    assert metrics.snapshot() == {}
+    assert format_metrics(metrics) == "Metrics disabled."
+
+
+# --- run() sem Tk nem Win32
+
+
+def test_run_records_cycle_metrics(make_app, config):
+    windows = [WindowInfo(hwnd, "Roblox", 100 + hwnd) for hwnd in (1, 2, 3)]
+    config.set("APPLICATION", "tiler_enabled", "True")
+    config.set("APPLICATION", "action_key_hold_duration", "0")
+    app = make_app(windows)
+
+    report = app.run()
+    app.run()
+
+    assert report.ok == 3
+    snapshot = app.metrics.snapshot()
+    assert snapshot["cycles_total"] == 2
+    assert snapshot["target_windows"] == 3
+    assert snapshot["keepalive_ok_total"] == 6
+    assert snapshot["tile_moves_total"] == 3  # segundo ciclo não move nada
+    assert snapshot["keepalive_window_seconds"]["count"] == 6
+    for name in ("run_seconds", "get_target_windows_seconds", "tile_windows_seconds"):
+        assert snapshot[name]["count"] == 2
+    assert "run: " in format_metrics(app.metrics)
+
+
+def test_run_with_metrics_disabled(make_app, config):
+    config.set("APPLICATION", "metrics_enabled", "False")
+    config.set("APPLICATION", "action_key_hold_duration", "0")
+    app = make_app([WindowInfo(1, "Roblox", 101)])
+
+    assert isinstance(app.metrics, NullMetrics)
+    assert app.run().ok == 1
+    assert app.metrics.snapshot() == {}
@@ -0,0 +1,60 @@
+import logging
+
+import pytest
+
+from src.app.utils.profiling import PhaseTimer
+
+
+def test_phases_are_recorded_in_order(clock):
+    timer = PhaseTimer(clock=clock)
+
+    with timer.phase("tk_init"):
+        clock.now += 0.25
+    with timer.phase("page_main"):
+        clock.now += 0.5
+
+    assert timer.phases == [("tk_init", 0.25), ("page_main", 0.5)]
+    assert timer.elapsed == 0.75
+    assert timer.summary() == "750.0ms total (tk_init=250.0ms, page_main=500.0ms)"
+
+
+def test_repeated_phase_adds_to_its_entry(clock):
+    timer = PhaseTimer(clock=clock)
+
+    # main.py lê o config antes, o Application acha ele já carregado
+    with timer.phase("config_load"):
+        clock.now += 0.04
+    with timer.phase("tk_init"):
+        clock.now += 0.1
+    with timer.phase("config_load"):
+        clock.now += 0.001
+
+    assert [name for name, _ in timer.phases] == ["config_load", "tk_init"]
+    assert timer.phases[0][1] == pytest.approx(0.041)
+
+
+def test_phase_is_recorded_when_it_raises(clock):
+    timer = PhaseTimer(clock=clock)
+
+    try:
+        with timer.phase("config_load"):
+            clock.now += 0.1
+            raise OSError("disk")
+    except OSError:
+        pass
+
+    assert timer.phases == [("config_load", 0.1)]
+
+
+def test_log_emits_summary(caplog, clock):
+    timer = PhaseTimer(clock=clock)
+    with timer.phase("notebook"):
+        clock.now += 0.01
+
+    logger = logging.getLogger("test.profiling")
+    with caplog.at_level(1, logger="test.profiling"):
+        timer.log(logger)
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages[-1] == "Startup: 10.0ms total (notebook=10.0ms)"
+    assert any("'notebook'" in m for m in messages[:-1])
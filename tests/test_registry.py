@@ -0,0 +1,117 @@
+import logging
+import time
+
+from src.lib.discovery import SyntheticWindowProvider, WindowInfo
+from src.lib.registry import (
+    CREATE,
+    DESTROY,
+    FOREGROUND,
+    NAMECHANGE,
+    PollingWindowSource,
+    WindowEvent,
+    WindowRegistry,
+    WinEventHookSource,
+)
+
+NAMES = {100: "RobloxPlayerBeta.exe", 200: "chrome.exe"}
+
+
+def test_scripted_event_stream_updates_targets_and_foreground():
+    provider = SyntheticWindowProvider(process_names=NAMES)
+    registry = WindowRegistry(provider)
+    registry.reset([])
+
+    registry.apply_all(
+        [
+            WindowEvent(CREATE, 1, "Roblox", 100),
+            WindowEvent(CREATE, 2, "Roblox", 100),
+            WindowEvent(CREATE, 3, "Roblox - Chrome", 200),
+            WindowEvent(FOREGROUND, 3),
+            WindowEvent(NAMECHANGE, 2, "Loading", 100),
+            WindowEvent(DESTROY, 1),
+        ]
+    )
+
+    assert [w.hwnd for w in registry.targets()] == []
+    assert registry.foreground() == WindowInfo(3, "Roblox - Chrome", 200)
+
+    registry.apply(WindowEvent(NAMECHANGE, 2, "Roblox", 100))
+    assert [w.hwnd for w in registry.targets()] == [2]
+
+    registry.apply(WindowEvent(DESTROY, 3))
+    assert registry.foreground() is None
+    assert len(registry) == 1
+
+
+def test_process_names_are_looked_up_once_per_live_pid():
+    provider = SyntheticWindowProvider(process_names=NAMES)
+    registry = WindowRegistry(provider)
+    registry.reset([])
+
+    registry.apply_all([WindowEvent(CREATE, hwnd, "Roblox", 100) for hwnd in range(5)])
+    assert provider.process_name_calls == 1
+
+    # todas as janelas do pid somem: o próximo processo com esse pid é consultado
+    registry.apply_all([WindowEvent(DESTROY, hwnd) for hwnd in range(5)])
+    provider.process_names[100] = "notepad.exe"
+    registry.apply(WindowEvent(CREATE, 9, "Roblox", 100))
+    assert provider.process_name_calls == 2
+    assert registry.targets() == []
+
+
+def test_process_names_are_resolved_outside_the_lock():
+    registry = None
+    locked = []
+
+    class Provider(SyntheticWindowProvider):
+        def process_name(self, pid):
+            locked.append(registry._lock.locked())
+            return super().process_name(pid)
+
+    provider = Provider(process_names=NAMES)
+    registry = WindowRegistry(provider)
+    registry.reset([WindowInfo(1, "Roblox", 100), WindowInfo(2, "Roblox", 200)])
+    registry.apply(WindowEvent(CREATE, 3, "Roblox", 300))
+    registry.apply(WindowEvent(NAMECHANGE, 1, "Roblox!", 100))
+
+    assert locked == [False, False, False]
+    assert [w.hwnd for w in registry.targets()] == [1]
+
+
+def test_polling_source_emits_diffs():
+    provider = SyntheticWindowProvider(
+        [WindowInfo(1, "Roblox", 100), WindowInfo(2, "Roblox", 100)], NAMES
+    )
+    registry = WindowRegistry(provider)
+    source = PollingWindowSource(registry, provider)
+
+    source.poll()
+    assert registry.ready and [w.hwnd for w in registry.targets()] == [1, 2]
+
+    provider.windows = [WindowInfo(2, "Roblox!", 100), WindowInfo(4, "Roblox", 100)]
+    provider.foreground = 4
+    events = source.poll()
+
+    assert sorted(e.kind for e in events) == [CREATE, DESTROY, FOREGROUND, NAMECHANGE]
+    assert [w.hwnd for w in registry.targets()] == [2, 4]
+    assert registry.foreground().hwnd == 4
+    assert source.poll() == []
+
+
+def test_hook_source_falls_back_to_polling(caplog):
+    provider = SyntheticWindowProvider([WindowInfo(1, "Roblox", 100)], NAMES)
+    registry = WindowRegistry(provider)
+    source = WinEventHookSource(registry, provider, interval=0.01)
+
+    # o que _loop faz quando SetWinEventHook devolve NULL
+    with caplog.at_level(logging.WARNING):
+        source._fall_back("SetWinEventHook falhou (erro 5)")
+    try:
+        deadline = time.monotonic() + 2
+        while not registry.ready and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [w.hwnd for w in registry.targets()] == [1]
+        assert "usando polling" in caplog.text
+    finally:
+        source.stop()
+    assert source._fallback is None
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# módulos que não podem ser importados junto com a UI (carregam depois da 1ª pintura)
+HEAVY_MODULES = {
+    "autoit",
+    "http.server",  # exporter de métricas, só com o endpoint ligado
+    "keyboard",
+    "psutil",
+    "pyautogui",
+    "pygetwindow",
+    "win32api",
+    "win32con",
+    "win32gui",
+    "win32process",
+}
+
+# orçamento do import de src.app.Application, em microssegundos (-X importtime)
+IMPORT_BUDGET_US = 400_000
+
+
+def import_times(statement):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <module>"
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times, result.stdout
+
+
+def test_application_import_is_lazy_and_within_budget():
+    times, stdout = import_times(
+        "import src.app.Application; from src.lib.config import Config;"
+        "print(Config._loaded)"
+    )
+
+    assert not HEAVY_MODULES & set(times)
+    assert stdout.strip() == "False"  # config.ini não é lido no import
+    assert times["src.app.Application"] < IMPORT_BUDGET_US, times["src.app.Application"]
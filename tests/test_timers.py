@@ -0,0 +1,45 @@
+from src.app.utils.timers import PageTimer
+
+
+def test_runs_immediately_then_every_interval(root):
+    calls = []
+    timer = PageTimer(root, 1000, lambda: calls.append(1))
+
+    timer.start()
+    assert calls == [1]
+    assert timer.running
+
+    root.run_pending()
+    root.run_pending()
+    assert len(calls) == 3
+    assert len(root.jobs) == 1
+
+
+def test_stop_pauses_and_start_resumes(root):
+    calls = []
+    timer = PageTimer(root, 1000, lambda: calls.append(1))
+
+    timer.start()
+    timer.stop()
+    assert not timer.running
+    assert root.jobs == {}
+    root.run_pending()
+    assert calls == [1]
+
+    timer.start()
+    timer.start()  # já rodando: não duplica o agendamento
+    assert len(calls) == 2
+    assert len(root.jobs) == 1
+
+
+def test_callback_error_keeps_timer_scheduled(root):
+
+    def boom():
+        raise RuntimeError("tk")
+
+    timer = PageTimer(root, 1000, boom)
+    try:
+        timer.start()
+    except RuntimeError:
+        pass
+    assert timer.running
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from src.lib.keepalive import KeepAliveScheduler, SimulatedKeepAliveBackend
+from src.lib.worker import TaskWorker
+
+
+def wait_results(worker, count, timeout=5):
+    # faz o papel do loop do Tk: drena a fila de resultados periodicamente
+    results = []
+    deadline = time.monotonic() + timeout
+    while len(results) < count and time.monotonic() < deadline:
+        results += worker.poll()
+        time.sleep(0.005)
+    return results
+
+
+def test_tasks_run_off_the_calling_thread():
+    worker = TaskWorker()
+    worker.start()
+    try:
+        task_id = worker.submit(lambda cancel: threading.current_thread().name)
+        (result,) = wait_results(worker, 1)
+    finally:
+        worker.stop(timeout=1)
+
+    assert result.task_id == task_id
+    assert result.value == "worker"
+    assert not result.cancelled and result.error is None
+    assert not worker.busy
+
+
+def test_errors_are_reported_as_results():
+    def boom(cancel):
+        raise RuntimeError("boom")
+
+    worker = TaskWorker()
+    worker.start()
+    try:
+        worker.submit(boom)
+        (result,) = wait_results(worker, 1)
+    finally:
+        worker.stop(timeout=1)
+
+    assert isinstance(result.error, RuntimeError)
+
+
+def test_cancel_stops_keep_alive_between_windows():
+    backend = SimulatedKeepAliveBackend(send_cost=0.01)
+    scheduler = KeepAliveScheduler(backend, settle_ms=10)
+    windows = [(f"win{i}", i) for i in range(50)]
+
+    worker = TaskWorker()
+    worker.start()
+    try:
+        worker.submit(scheduler.run, windows, "space", delay=10)
+        queued = worker.submit(scheduler.run, windows, "space")
+        time.sleep(0.1)
+        worker.cancel()
+        first, second = wait_results(worker, 2)
+    finally:
+        worker.stop(timeout=1)
+
+    assert first.cancelled and first.value.cancelled
+    assert 0 < len(first.value.timings) < len(windows)
+    assert second.task_id == queued and second.cancelled and second.value is None
+
+
+def test_run_once_waits_for_the_previous_cycle(make_app, root, monkeypatch):
+    app = make_app()
+    app.root = root  # headless: sem Tk, o after() é o do FakeRoot
+    stopped = []
+    monkeypatch.setattr(app, "_stop_application", lambda: stopped.append(True))
+
+    # ciclo anterior, cancelado, ainda ocupando o worker
+    release = threading.Event()
+    app.worker.submit(lambda cancel: release.wait(5))
+    app.worker.start()
+    try:
+        app._running = app._run_once = True
+        app._submit_run_once()
+        assert app._run_once_pending and root.jobs
+
+        release.set()
+        for result in wait_results(app.worker, 1):
+            app._on_task_result(result)
+        assert not stopped  # resultado velho não para a aplicação
+
+        root.run_pending()  # tenta de novo, agora com o worker livre
+        assert not app._run_once_pending
+        for result in wait_results(app.worker, 1):
+            app._on_task_result(result)
+        assert stopped == [True]
+    finally:
+        app.worker.stop(timeout=1)